@@ -0,0 +1,163 @@
+# Admission control: bounded concurrency, per-client rate limits and a memory budget
+#
+# Every gate either admits a request or raises Rejected right away (or after
+# a bounded wait), so an overloaded worker answers 503/429 quickly instead
+# of piling up renders until it runs out of memory.
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Rejected(Exception):
+    """A request turned away by admission control.
+
+    :param status: HTTP status to answer with (429, 503 or 413).
+    :param reason: short machine-readable reason, used as a metric label.
+    :param retry_after: seconds the client should wait before retrying, if any.
+    """
+
+    def __init__(self, status, reason, retry_after=None) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """At most max_active holders at once, with a bounded FIFO wait queue.
+
+    :param max_active: concurrent holders.
+    :param max_queue: requests allowed to wait for a slot; more are rejected at once.
+    :param timeout: longest wait in seconds before a queued request is rejected.
+    :param retry_after: Retry-After seconds sent with rejections.
+    """
+
+    def __init__(self, max_active, max_queue=0, timeout=10.0, retry_after=1) -> None:
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            # Newcomers don't overtake queued requests
+            if self.active < self.max_active and not self.waiting:
+                self.active += 1
+                return
+            if self.waiting >= self.max_queue:
+                raise Rejected(503, 'queue_full', self.retry_after)
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.timeout
+                while self.active >= self.max_active:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Rejected(503, 'queue_timeout', self.retry_after)
+                    self._cond.wait(remaining)
+                self.active += 1
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block."""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class RateLimiter:
+    """Token bucket per client: rate requests a second, bursts of up to burst.
+
+    Only the most recently seen max_clients buckets are kept; a client that
+    was dropped starts again with a full bucket.
+
+    :param rate: tokens added per second, 0 disables the limit.
+    :param burst: bucket size.
+    """
+
+    def __init__(self, rate, burst, max_clients=10000) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()  # client -> [tokens, last refill time]
+        self._lock = threading.Lock()
+
+    def take(self, client) -> float:
+        """Take a token for client; returns 0 if it had one, else seconds until it will."""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(client, None)
+            if bucket is None:
+                bucket = [float(self.burst), now]
+            tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            bucket[0], bucket[1] = (tokens - 1 if tokens >= 1 else tokens), now
+            self._buckets[client] = bucket
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def check(self, client):
+        """Take a token or raise Rejected(429) with the time until the next one."""
+        wait = self.take(client)
+        if wait:
+            raise Rejected(429, 'rate_limited', max(1, math.ceil(wait)))
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class MemoryBudget:
+    """Caps the estimated bytes held by renders running at the same time.
+
+    A render that doesn't fit waits (up to timeout) for others to finish;
+    one bigger than the whole budget is rejected outright with 413.
+
+    :param max_bytes: budget in bytes, 0 disables it.
+    :param timeout: longest wait in seconds for room in the budget.
+    """
+
+    def __init__(self, max_bytes, timeout=10.0, retry_after=1) -> None:
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.in_use = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def reserve(self, nbytes):
+        """Hold nbytes of the budget for the duration of the block."""
+        if self.max_bytes <= 0:
+            yield
+            return
+        if nbytes > self.max_bytes:
+            raise Rejected(413, 'too_large')
+        with self._cond:
+            deadline = time.monotonic() + self.timeout
+            while self.in_use + nbytes > self.max_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Rejected(503, 'memory', self.retry_after)
+                self._cond.wait(remaining)
+            self.in_use += nbytes
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= nbytes
+                self._cond.notify_all()
@@ -0,0 +1,67 @@
+# Coalesces concurrent calls for the same key into one
+#
+# The first caller for a key runs the call; everyone arriving while it's in
+# flight waits for it and gets the same result, or the same exception. Once
+# the call finishes the key is forgotten, so this is not a cache: the next
+# caller starts a new call.
+import threading
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """One in-flight call per key, shared by all concurrent callers.
+
+    :param timeout: default seconds a waiter waits for the call in flight
+                    before giving up with TimeoutError (None waits forever).
+    """
+
+    def __init__(self, timeout=None) -> None:
+        self.timeout = timeout
+        self.calls = 0    # calls actually run
+        self.shared = 0   # callers served by someone else's call
+        self.timeouts = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout=None):
+        """Return fn(), or the result of the call for key already in flight.
+
+        :param timeout: overrides the default waiter timeout. The caller that
+                        runs fn isn't limited, fn needs its own timeouts.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            if not call.done.wait(self.timeout if timeout is None else timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise TimeoutError(f'Timed out waiting for the call in flight for {key!r}')
+            with self._lock:
+                self.shared += 1
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
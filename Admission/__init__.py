@@ -0,0 +1,3 @@
+"""Export Admission."""
+from .Limits import Rejected, ConcurrencyLimiter, RateLimiter, MemoryBudget
+from .SingleFlight import SingleFlight
@@ -0,0 +1,159 @@
+# Fingerprinted, precompressed copies of the page scripts and stylesheets
+#
+# Sources live in web/ (js/ and css/); build() writes
+# <name>.<hash>.<ext> for each into the build directory along with .gz (and
+# .br when the brotli module is installed) variants and a manifest.json
+# mapping source names to built files. The hash is of the content, so a
+# built file never changes and can be cached for a year; editing a source
+# gives it a new name.
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import uuid
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+
+# Content-Encoding -> file suffix, in server preference order
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}
+
+# Don't bother compressing files smaller than this
+MIN_COMPRESS_BYTES = 256
+
+
+def _compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=11) if brotli is not None else None
+    # mtime=0 keeps the output identical from build to build
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _write(path, data):
+    tmp_path = f'{path}.{uuid.uuid4().hex[:8]}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class AssetBundles:
+    """Builds the asset manifest and resolves names for templates and requests.
+
+    :param source_dir: directory of the source files (any depth).
+    :param build_dir: where the fingerprinted files and manifest go.
+    """
+
+    def __init__(self, source_dir='./web', build_dir='./build/assets') -> None:
+        self.source_dir = source_dir
+        self.build_dir = build_dir
+        self.manifest = {}
+        self._built = {}  # built file name -> manifest entry
+
+    def sources(self):
+        """Source names ('js/page.js') relative to source_dir."""
+        names = []
+        for directory, _, files in os.walk(self.source_dir):
+            for name in files:
+                if not name.startswith('.'):
+                    path = os.path.join(directory, name)
+                    names.append(os.path.relpath(path, self.source_dir).replace(os.sep, '/'))
+        return sorted(names)
+
+    def stale(self) -> bool:
+        """Whether a source is newer than the manifest, or there's no manifest."""
+        try:
+            built = os.path.getmtime(os.path.join(self.build_dir, MANIFEST_NAME))
+        except OSError:
+            return True
+        return any(os.path.getmtime(os.path.join(self.source_dir, *name.split('/'))) > built
+                   for name in self.sources())
+
+    def build(self) -> dict:
+        """Fingerprint and precompress every source, write the manifest and load it."""
+        manifest = {}
+        for name in self.sources():
+            with open(os.path.join(self.source_dir, *name.split('/')), 'rb') as f:
+                data = f.read()
+            stem, extension = os.path.splitext(name)
+            built = f'{stem}.{hashlib.sha1(data).hexdigest()[:12]}{extension}'
+            path = os.path.join(self.build_dir, *built.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            entry = {'file': built, 'size': len(data), 'encodings': {}}
+            if not os.path.exists(path):
+                _write(path, data)
+            if len(data) >= MIN_COMPRESS_BYTES:
+                for encoding, suffix in ENCODINGS.items():
+                    if os.path.exists(path + suffix):
+                        # Same name, same content: built before
+                        entry['encodings'][encoding] = os.path.getsize(path + suffix)
+                        continue
+                    compressed = _compress(data, encoding)
+                    # Only worth keeping when it's smaller
+                    if compressed is not None and len(compressed) < len(data):
+                        _write(path + suffix, compressed)
+                        entry['encodings'][encoding] = len(compressed)
+            manifest[name] = entry
+
+        os.makedirs(self.build_dir, exist_ok=True)
+        _write(os.path.join(self.build_dir, MANIFEST_NAME),
+               json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+        self._use(manifest)
+        self._remove_outdated()
+        return manifest
+
+    def _remove_outdated(self):
+        # Built files of earlier versions of the sources
+        keep = {MANIFEST_NAME}
+        for entry in self.manifest.values():
+            keep.add(entry['file'])
+            keep.update(entry['file'] + ENCODINGS[encoding] for encoding in entry['encodings'])
+        for directory, _, files in os.walk(self.build_dir):
+            for name in files:
+                path = os.path.join(directory, name)
+                if os.path.relpath(path, self.build_dir).replace(os.sep, '/') not in keep:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+    def load(self):
+        """Load the manifest, building first when it's missing or stale."""
+        if self.stale():
+            return self.build()
+        with open(os.path.join(self.build_dir, MANIFEST_NAME)) as f:
+            self._use(json.load(f))
+        return self.manifest
+
+    def _use(self, manifest):
+        self.manifest = manifest
+        self._built = {entry['file']: entry for entry in manifest.values()}
+
+    def url(self, name, prefix='/assets/') -> str:
+        """URL of the built file for a source name.
+
+        :raises KeyError: for a name that isn't in the manifest.
+        """
+        return prefix + self.manifest[name]['file']
+
+    def variant(self, built_name, accept_encoding):
+        """Pick the file to send for a request.
+
+        :param built_name: fingerprinted name from the URL.
+        :param accept_encoding: werkzeug Accept of the request's Accept-Encoding.
+        :return: (path, content type, Content-Encoding or None), or None for an
+                 unknown name.
+        """
+        entry = self._built.get(built_name)
+        if entry is None:
+            return None
+        path = os.path.join(self.build_dir, *built_name.split('/'))
+        content_type = mimetypes.guess_type(built_name)[0] or 'application/octet-stream'
+        for encoding, suffix in ENCODINGS.items():
+            if encoding in entry['encodings'] and accept_encoding.quality(encoding) > 0:
+                return path + suffix, content_type, encoding
+        return path, content_type, None
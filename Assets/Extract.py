@@ -0,0 +1,60 @@
+# Moves inline <script> and <style> blocks out of templates into asset files
+#
+# Each block big enough to be worth its own request becomes web/js/<page>.js
+# or web/css/<page>.css (numbered when a page has several), and the block
+# is replaced in place by a tag loading it, so execution and cascade order
+# don't change. Blocks with Jinja in them stay inline, they need rendering.
+import os
+import re
+import textwrap
+
+# Smaller blocks (e.g. the tailwind.config snippets) cost less inline than a request
+MIN_EXTRACT_BYTES = 1024
+
+BLOCK = re.compile(r'^([ \t]*)<(script|style)>\n(.*?)\n[ \t]*</\2>[ \t]*$',
+                   re.MULTILINE | re.DOTALL)
+
+TAGS = {
+    'script': ('js', '<script src="{{{{ asset_url(\'{name}\') }}}}"></script>'),
+    'style': ('css', '<link rel="stylesheet" href="{{{{ asset_url(\'{name}\') }}}}">'),
+}
+
+
+def extract_template(template_path, asset_dir='./web', min_bytes=MIN_EXTRACT_BYTES) -> list:
+    """Extract the blocks of one template, rewriting it in place.
+
+    :return: the asset names written ('js/page.js', ...).
+    """
+    with open(template_path, encoding='utf-8') as f:
+        html = f.read()
+    page = os.path.splitext(os.path.basename(template_path))[0]
+    blocks = [match for match in BLOCK.finditer(html)
+              if len(textwrap.dedent(match.group(3)).encode('utf-8')) >= min_bytes
+              and '{{' not in match.group(3) and '{%' not in match.group(3)]
+    counts = {}
+    for match in blocks:
+        counts[match.group(2)] = counts.get(match.group(2), 0) + 1
+
+    written, numbers, pieces, last = [], {}, [], 0
+    for match in blocks:
+        indent, kind, body = match.groups()
+        kind_dir, tag = TAGS[kind]
+        numbers[kind] = numbers.get(kind, 0) + 1
+        suffix = f'-{numbers[kind]}' if counts[kind] > 1 else ''
+        name = f'{kind_dir}/{page}{suffix}.{kind_dir}'
+
+        path = os.path.join(asset_dir, kind_dir, f'{page}{suffix}.{kind_dir}')
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(textwrap.dedent(body).strip('\n') + '\n')
+        written.append(name)
+
+        pieces.append(html[last:match.start()])
+        pieces.append(indent + tag.format(name=name))
+        last = match.end()
+
+    if written:
+        pieces.append(html[last:])
+        with open(template_path, 'w', encoding='utf-8') as f:
+            f.write(''.join(pieces))
+    return written
@@ -0,0 +1,3 @@
+"""Export Assets."""
+from .Bundles import AssetBundles
+from .Extract import extract_template
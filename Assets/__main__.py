@@ -0,0 +1,35 @@
+# Asset build CLI
+#
+#   python -m Assets build                  fingerprint and precompress web/
+#   python -m Assets extract templates/x.html ...   move inline JS/CSS into web/
+import argparse
+
+from .Bundles import AssetBundles
+from .Extract import extract_template, MIN_EXTRACT_BYTES
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m Assets', description='Static asset build.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Fingerprint and precompress the assets.')
+    build.add_argument('--source', default='./web')
+    build.add_argument('--out', default='./build/assets')
+    extract = commands.add_parser('extract', help='Move inline blocks of templates into web/.')
+    extract.add_argument('templates', nargs='+')
+    extract.add_argument('--source', default='./web')
+    extract.add_argument('--min-bytes', type=int, default=MIN_EXTRACT_BYTES)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        manifest = AssetBundles(args.source, args.out).build()
+        for name, entry in manifest.items():
+            sizes = ', '.join(f'{encoding} {size}' for encoding, size in entry['encodings'].items())
+            print(f"{entry['file']}: {entry['size']} bytes" + (f' ({sizes})' if sizes else ''))
+    else:
+        for template in args.templates:
+            for name in extract_template(template, args.source, args.min_bytes):
+                print(f'{template} -> {name}')
+
+
+if __name__ == '__main__':
+    main()
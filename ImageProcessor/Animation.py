@@ -0,0 +1,70 @@
+# Frame handling for animated (GIF/WebP) overlays
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageSequence
+
+DEFAULT_FRAME_DURATION = 100  # ms, used when a frame doesn't say
+
+
+class Animation:
+    """Rendered animation frames plus their timing."""
+
+    def __init__(self, frames, durations, loop=0) -> None:
+        self.frames = frames
+        self.durations = durations
+        self.loop = loop
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    def __repr__(self) -> str:
+        return f'Animation(frames={len(self.frames)}, loop={self.loop})'
+
+
+def is_animated(img_path) -> bool:
+    """Return True if the file holds more than one frame."""
+    try:
+        with Image.open(img_path) as img:
+            return getattr(img, 'is_animated', False) and img.n_frames > 1
+    except (FileNotFoundError, OSError):
+        return False
+
+
+def _composite_frame(frame, size, overlay, resample_filter, quantize):
+    frame = frame.convert('RGBA')
+    if frame.size != size:
+        frame = frame.resize(size, resample_filter)
+    frame = overlay(frame)
+    if quantize:
+        # GIF needs a palette per frame, quantizing here keeps it off the
+        # (single threaded) encoder
+        return frame.convert('RGB').quantize(256, method=Image.Quantize.FASTOCTREE)
+    return frame
+
+
+def render_frames(source, size, overlay, resample_filter, quantize=False, workers=None) -> Animation:
+    """Scale every frame of source and apply overlay to it.
+
+    :param source: opened multi-frame PIL image.
+    :param size: output frame size.
+    :param overlay: callable taking and returning an RGBA frame, normally
+                    compositing one pre-rendered text layer.
+    :param resample_filter: Pillow filter used to scale frames.
+    :param quantize: palettize frames for GIF output.
+    :param workers: thread count for per-frame work, None/1 runs inline.
+    """
+    frames, durations = [], []
+    # Seeking has to happen in order, so frames are decoded up front
+    for frame in ImageSequence.Iterator(source):
+        durations.append(frame.info.get('duration') or DEFAULT_FRAME_DURATION)
+        frames.append(frame.copy())
+    loop = source.info.get('loop', 0)
+
+    work = lambda frame: _composite_frame(frame, size, overlay, resample_filter, quantize)
+    if workers and workers > 1 and len(frames) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rendered = list(pool.map(work, frames))
+    else:
+        rendered = [work(frame) for frame in frames]
+
+    return Animation(rendered, durations, loop)
@@ -0,0 +1,41 @@
+# Font loading with a process-wide cache
+from functools import lru_cache
+
+from PIL import ImageFont
+
+FONT_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def load_font(font_family='Impact', font_size=30):
+    """Load a font by family name, falling back to bundled/system fonts.
+
+    Fonts are cached per (family, size) since opening a TrueType file and
+    trying missing candidates costs more than drawing a caption.
+    """
+    # Try to load custom font with selected family, fallback to system fonts
+    font_candidates = [
+        f'{font_family}',  # System font
+        './fonts/LilitaOne-Regular.ttf',  # Custom font
+        'arial.ttf',  # Windows system font
+        'Arial.ttf',  # Alternative Arial
+        'helvetica.ttf',  # macOS/Linux
+    ]
+
+    for font_candidate in font_candidates:
+        try:
+            return ImageFont.truetype(font_candidate, size=font_size)
+        except (OSError, ValueError):
+            continue
+
+    # Final fallback to default font
+    try:
+        # Scale default font size (it's quite small)
+        return ImageFont.load_default().font_variant(size=font_size//2)
+    except (AttributeError, OSError, ValueError):
+        return ImageFont.load_default()
+
+
+def font_cache_info():
+    """Hit/miss counters of the font cache."""
+    return load_font.cache_info()
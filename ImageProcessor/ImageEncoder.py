@@ -0,0 +1,223 @@
+# Encodes rendered images into the output formats we serve
+import io
+import time
+
+from PIL import Image
+
+# Output formats we can produce, in server preference order
+FORMATS = {
+    'webp': {'pil_format': 'WEBP', 'extension': 'webp', 'mimetype': 'image/webp'},
+    'jpeg': {'pil_format': 'JPEG', 'extension': 'jpg', 'mimetype': 'image/jpeg'},
+    'png': {'pil_format': 'PNG', 'extension': 'png', 'mimetype': 'image/png'},
+    'gif': {'pil_format': 'GIF', 'extension': 'gif', 'mimetype': 'image/gif'},
+}
+
+# Formats negotiated for still and animated output
+STILL_FORMATS = ['webp', 'jpeg', 'png']
+ANIMATED_FORMATS = ['webp', 'gif']
+
+FORMAT_ALIASES = {'jpg': 'jpeg', 'jpe': 'jpeg'}
+
+DEFAULT_FORMAT = 'jpeg'
+DEFAULT_PRESET = 'balanced'
+
+# Encoder settings per format and preset.
+# JPEG subsampling: 0 = 4:4:4 (crisp colored text), 2 = 4:2:0 (smaller files)
+PRESETS = {
+    'jpeg': {
+        'fast': {'quality': 80, 'subsampling': 2, 'progressive': False, 'optimize': False},
+        'balanced': {'quality': 85, 'subsampling': 2, 'progressive': True, 'optimize': True},
+        'small': {'quality': 72, 'subsampling': 2, 'progressive': True, 'optimize': True},
+        'high': {'quality': 92, 'subsampling': 0, 'progressive': True, 'optimize': True},
+    },
+    'webp': {
+        'fast': {'quality': 80, 'method': 0},
+        'balanced': {'quality': 80, 'method': 4},
+        'small': {'quality': 65, 'method': 6},
+        'high': {'quality': 90, 'method': 5},
+    },
+    'png': {
+        'fast': {'compress_level': 1},
+        'balanced': {'compress_level': 6},
+        'small': {'compress_level': 9, 'optimize': True},
+        'high': {'compress_level': 6},
+    },
+    'gif': {
+        'fast': {'optimize': False},
+        'balanced': {'optimize': False},
+        'small': {'optimize': True},
+        'high': {'optimize': False},
+    },
+}
+
+
+class EncodedImage:
+    """An encoded image plus what it cost to produce it."""
+
+    def __init__(self, data: bytes, output_format: str, encode_ms: float) -> None:
+        self.data = data
+        self.format = output_format
+        self.encode_ms = encode_ms
+        self.path = None
+
+    @property
+    def extension(self) -> str:
+        return FORMATS[self.format]['extension']
+
+    @property
+    def mimetype(self) -> str:
+        return FORMATS[self.format]['mimetype']
+
+    @property
+    def size(self) -> int:
+        """Number of encoded bytes."""
+        return len(self.data)
+
+    def __repr__(self) -> str:
+        return (f'EncodedImage(format="{self.format}", bytes={self.size}, '
+                f'encode_ms={self.encode_ms:.2f})')
+
+
+def normalize_format(output_format) -> str:
+    """Return the canonical name for an output format, or raise ValueError."""
+    name = (output_format or DEFAULT_FORMAT).lower().strip()
+    name = FORMAT_ALIASES.get(name, name)
+    if name not in FORMATS:
+        raise ValueError(f'Unsupported output format: {output_format}')
+    return name
+
+
+def _parse_accept(accept_header):
+    # Map media type -> q value from an Accept header
+    accepted = {}
+    for item in (accept_header or '').split(','):
+        parts = [part.strip() for part in item.split(';')]
+        media_type = parts[0].lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for param in parts[1:]:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        accepted[media_type] = quality
+    return accepted
+
+
+def negotiate_format(accept_header=None, requested=None, default=None, animated=False) -> str:
+    """Pick the output format for a request.
+
+    An explicit requested format wins. Otherwise WebP is used when the client
+    lists image/webp explicitly (wildcards don't count, old browsers send
+    */* too), and the remaining formats are ranked by the Accept q-values.
+
+    :param accept_header: value of the HTTP Accept header.
+    :param requested: format asked for by a request parameter, if any.
+    :param default: format to fall back to.
+    :param animated: negotiate between animated formats (WebP/GIF).
+    """
+    candidates = ANIMATED_FORMATS if animated else STILL_FORMATS
+    if default is None:
+        default = 'gif' if animated else DEFAULT_FORMAT
+    if requested:
+        name = normalize_format(requested)
+        if name not in candidates:
+            kind = 'animated' if animated else 'still'
+            raise ValueError(f'Unsupported output format for {kind} images: {requested}')
+        return name
+
+    accepted = _parse_accept(accept_header)
+    if not accepted:
+        return default
+
+    wildcard = max(accepted.get('image/*', 0.0), accepted.get('*/*', 0.0))
+    best, best_quality = default, 0.0
+    for name in candidates:
+        mimetype = FORMATS[name]['mimetype']
+        if name == 'webp':
+            quality = accepted.get(mimetype, 0.0)
+        else:
+            quality = accepted.get(mimetype, wildcard)
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def get_preset(output_format, preset=DEFAULT_PRESET) -> dict:
+    """Return a copy of the encoder settings for a format and preset name."""
+    output_format = normalize_format(output_format)
+    try:
+        return dict(PRESETS[output_format][preset or DEFAULT_PRESET])
+    except KeyError:
+        raise ValueError(f'Unknown quality preset: {preset}')
+
+
+def prepare_mode(img, output_format):
+    """Convert an image to a mode the output format can store."""
+    if output_format == 'jpeg':
+        if img.mode in ('RGB', 'L'):
+            return img
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Flatten any transparency onto white, JPEG has no alpha
+            rgba = img.convert('RGBA')
+            background = Image.new('RGB', rgba.size, (255, 255, 255))
+            background.paste(rgba, mask=rgba.getchannel('A'))
+            return background
+        return img.convert('RGB')
+    if output_format == 'gif':
+        return img if img.mode in ('P', 'L') else img.convert('RGB')
+    if output_format == 'webp' and img.mode not in ('RGB', 'RGBA'):
+        has_alpha = img.mode in ('LA', 'PA') or 'transparency' in img.info
+        return img.convert('RGBA' if has_alpha else 'RGB')
+    return img
+
+
+def encode_image(img, output_format=DEFAULT_FORMAT, preset=DEFAULT_PRESET,
+                 **overrides) -> EncodedImage:
+    """Encode an image with a quality preset.
+
+    :param img: PIL image to encode.
+    :param output_format: 'jpeg', 'webp' or 'png'.
+    :param preset: one of 'fast', 'balanced', 'small' or 'high'.
+    :param overrides: encoder settings that replace the preset's values
+                      (e.g. quality=70, progressive=False).
+    :return: EncodedImage with the bytes and encode time.
+    """
+    output_format = normalize_format(output_format)
+    params = get_preset(output_format, preset)
+    params.update({key: value for key, value in overrides.items() if value is not None})
+
+    start = time.perf_counter()
+    buffer = io.BytesIO()
+    prepare_mode(img, output_format).save(buffer, FORMATS[output_format]['pil_format'], **params)
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    return EncodedImage(buffer.getvalue(), output_format, encode_ms)
+
+
+def encode_animation(frames, durations, loop=0, output_format='gif', preset=DEFAULT_PRESET,
+                     **overrides) -> EncodedImage:
+    """Encode a list of frames as an animated GIF or WebP.
+
+    :param frames: PIL images, all the same size.
+    :param durations: per-frame display time in milliseconds.
+    :param loop: loop count, 0 loops forever.
+    :param output_format: 'gif' or 'webp'.
+    :param preset: quality preset name, see PRESETS.
+    """
+    output_format = normalize_format(output_format)
+    if output_format not in ANIMATED_FORMATS:
+        raise ValueError(f'Unsupported output format for animated images: {output_format}')
+    params = get_preset(output_format, preset)
+    params.update({key: value for key, value in overrides.items() if value is not None})
+
+    start = time.perf_counter()
+    frames = [prepare_mode(frame, output_format) for frame in frames]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, FORMATS[output_format]['pil_format'], save_all=True,
+                   append_images=frames[1:], duration=durations, loop=loop, **params)
+    encode_ms = (time.perf_counter() - start) * 1000
+
+    return EncodedImage(buffer.getvalue(), output_format, encode_ms)
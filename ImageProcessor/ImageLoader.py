@@ -0,0 +1,124 @@
+# Loads source images at (roughly) the size we actually need
+from PIL import Image
+
+# Resampling filters that can be picked by name
+RESAMPLERS = {
+    'nearest': Image.Resampling.NEAREST,
+    'box': Image.Resampling.BOX,
+    'bilinear': Image.Resampling.BILINEAR,
+    'hamming': Image.Resampling.HAMMING,
+    'bicubic': Image.Resampling.BICUBIC,
+    'lanczos': Image.Resampling.LANCZOS,
+}
+
+DEFAULT_RESAMPLE = 'lanczos'
+
+# Reduce by whole factors first when the source is at least this many times
+# bigger than the target, then finish with the chosen filter
+REDUCING_GAP = 2.0
+
+
+def get_resampler(name):
+    """Return the Pillow resampling filter for a filter name.
+
+    :param name: one of RESAMPLERS, or None for the default filter.
+    """
+    if name is None:
+        name = DEFAULT_RESAMPLE
+    try:
+        return RESAMPLERS[name.lower()]
+    except (KeyError, AttributeError):
+        raise ValueError(f'Unknown resample filter: {name}')
+
+
+def target_size(size, width):
+    """Return (width, height) for scaling size to width, keeping the aspect ratio."""
+    ratio = width / float(size[0])
+    return width, max(1, int(ratio * float(size[1])))
+
+
+def open_image(img_path, width=None):
+    """Open an image, letting JPEGs decode straight at a reduced scale.
+
+    For JPEG sources Image.draft picks the smallest DCT scale (1/2, 1/4, 1/8)
+    that is still at least as big as the target, so a 6000px photo headed
+    for a 500px overlay never gets decoded at full size.
+
+    :param img_path: path (or file object) of the source image.
+    :param width: final width the image will be scaled to, if known.
+    :return: tuple of (opened image, original (width, height)).
+    """
+    try:
+        img = Image.open(img_path)
+    except FileNotFoundError:
+        raise Exception('Cannot open image file')
+
+    original_size = img.size
+    if width and width < img.size[0]:
+        size = target_size(img.size, width)
+        mode = 'RGB' if img.mode == 'RGB' else None
+        img.draft(mode, size)
+
+    return img, original_size
+
+
+def estimate_memory(img_path, width) -> int:
+    """Rough peak bytes of rendering an image at width, read from its header only.
+
+    Counts the decoded source at the scale open_image will pick (4 bytes a
+    pixel, the worst case after conversion) plus the resized and composited
+    copies, and one more output-sized frame per extra animation frame.
+    Animations also hold a full-size copy of every source frame while they
+    render (see Animation.render_frames).
+    """
+    img, original_size = open_image(img_path, width)
+    with img:
+        decoded = img.size[0] * img.size[1] * 4
+        frames = getattr(img, 'n_frames', 1)
+    if frames > 1:
+        decoded += frames * original_size[0] * original_size[1] * 4
+    out_width, out_height = target_size(original_size, width)
+    return decoded + out_width * out_height * 4 * (1 + frames)
+
+
+def to_drawable(img):
+    """Convert an image to RGB or RGBA so colored text can be drawn on it."""
+    if img.mode in ('RGB', 'RGBA'):
+        return img
+    has_alpha = img.mode in ('LA', 'PA', 'RGBa', 'La') or 'transparency' in img.info
+    return img.convert('RGBA' if has_alpha else 'RGB')
+
+
+def fit_width(img, original_size, width, resample=None):
+    """Resize an opened image to width (height follows the aspect ratio) as RGB/RGBA.
+
+    :param img: image returned by open_image.
+    :param original_size: size before any draft-mode reduction.
+    :param resample: name of the resampling filter (see RESAMPLERS).
+    """
+    resample_filter = get_resampler(resample)
+
+    # Compute the height from the original dimensions so draft-mode decoding
+    # can't change the output size through rounding
+    size = target_size(original_size, width)
+
+    # Palette images can only be resized with NEAREST, so expand them first
+    if img.mode in ('P', '1'):
+        img = to_drawable(img)
+
+    if img.size != size:
+        img = img.resize(size, resample_filter, reducing_gap=REDUCING_GAP)
+    return to_drawable(img)
+
+
+def load_image(img_path, width, resample=None):
+    """Load an RGB/RGBA image scaled to the given width.
+
+    :param img_path: path (or file object) of the source image.
+    :param width: width of the returned image, height follows the aspect ratio.
+    :param resample: name of the resampling filter (see RESAMPLERS).
+    :return: the decoded and resized image.
+    """
+    get_resampler(resample)  # fail on a bad filter name before decoding anything
+    img, original_size = open_image(img_path, width)
+    return fit_width(img, original_size, width, resample)
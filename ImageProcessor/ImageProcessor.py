@@ -1,133 +1,285 @@
 # Image processing for text overlays
-import textwrap
+import time
+from contextlib import contextmanager
 from random import randrange, randint
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image
+
+from .ImageLoader import open_image, fit_width, get_resampler, target_size, DEFAULT_RESAMPLE
+from .ImageEncoder import (encode_image, encode_animation, normalize_format, EncodedImage,
+                           DEFAULT_FORMAT, DEFAULT_PRESET)
+from .Animation import Animation, render_frames
+from .Fonts import load_font
+from .Placement import PlacementMap, AUTO_COLOR, recolor_effects
+from .TextEffects import Outline
+from .TextFit import fit_text
+from .TextLayer import TextLayer, TextLayerCache, composite_at, render_text_block, EDGE_MARGIN
+from .TextWrap import wrap_caption
+
+# Define color mapping
+COLOR_MAP = {
+    'white': 'white',
+    'black': 'black',
+    'red': '#FF0000',
+    'blue': '#0000FF',
+    'green': '#00FF00',
+    'yellow': '#FFFF00',
+    'purple': '#800080',
+    'orange': '#FFA500'
+}
+
+
+# Share of the image auto-fitted text may cover (width, height)
+AUTO_FIT_BOX = (0.9, 0.5)
+
+
+def outline_color_for(text_color):
+    # Outline contrasts with the text - black around white text, white otherwise
+    return 'black' if text_color == 'white' else 'white'
+
+
+def fit_box(size):
+    # Box auto-fitted text has to fit into on an image of the given size
+    width, height = size
+    return (int(width * AUTO_FIT_BOX[0]) - 2 * EDGE_MARGIN,
+            int(height * AUTO_FIT_BOX[1]) - 2 * EDGE_MARGIN)
 
 class ImageProcessor:
     # Handles putting text on images
     
-    def __init__(self, output_dir='./out_img'):
+    def __init__(self, output_dir='./out_img', resample=DEFAULT_RESAMPLE,
+                 output_format=DEFAULT_FORMAT, quality_preset=DEFAULT_PRESET,
+                 layer_cache_size=256, blend='pillow', wrap='balanced', on_stage=None,
+                 store=None):
         self.output_dir = output_dir
+        # Optional Storage.OutputStore; when set, outputs are written through it
+        # (hashed subdirectories, quota) instead of straight into output_dir
+        self.store = store
+        self.resample = resample
+        self.output_format = output_format
+        self.quality_preset = quality_preset
+        self.layer_cache = TextLayerCache(layer_cache_size)
+        self.blend = blend
+        self.wrap = wrap  # line breaking, 'balanced' or 'greedy' (see TextWrap)
+        # Optional timing hook, called as on_stage(stage name, seconds) for decode,
+        # resize, font, layout, draw, composite, frames, encode and save
+        self.on_stage = on_stage
+
+    @contextmanager
+    def _stage(self, name):
+        # Time a render stage for the on_stage hook, free when there's no hook
+        if self.on_stage is None:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.on_stage(name, time.perf_counter() - start)
 
     
     def make_meme(self, img_path, text: str, author: str, width=500, 
                   font_size=30, font_family='Impact', text_color='white', position_x=50, position_y=50, 
-                  add_outline=True) -> str:
-        # Main function - adds text to an image
+                  add_outline=True, resample=None, output_format=None, quality_preset=None,
+                  effects=None, auto_fit=False, auto_place=False) -> str:
+        # Main function - adds text to an image and saves it, returns the file path
+        img = self.render_meme(img_path, text, author, width=width,
+                               font_size=font_size, font_family=font_family,
+                               text_color=text_color, position_x=position_x,
+                               position_y=position_y, add_outline=add_outline,
+                               resample=resample, effects=effects, auto_fit=auto_fit,
+                               auto_place=auto_place)
+        return self.save_image(img, output_format, quality_preset).path
+
+    def render_meme(self, img_path, text: str, author: str, width=500,
+                    font_size=30, font_family='Impact', text_color='white', position_x=50, position_y=50,
+                    add_outline=True, resample=None, effects=None,
+                    auto_fit=False, auto_place=False) -> Image.Image:
+        # Adds text to an image and returns the rendered image without saving it.
+        # With auto_fit the font size is picked to fill AUTO_FIT_BOX of the image
+        # and font_size is ignored. With auto_place the text goes to the calmest,
+        # best-contrast spot and position_x/position_y are ignored; text_color
+        # 'auto' picks white or black text (and the outline) for the spot.
         
         self.img_path = img_path
         self.text = text
         self.author = author
         self.width = width
 
-        try:
-            img = Image.open(img_path)
-        except(FileNotFoundError):
-            raise Exception('Cannot open image file')
-        
-        # Resize image while maintaining aspect ratio
-        ratio = width / float(img.size[0])
-        height = int(ratio * float(img.size[1]))
-        img = img.resize((width, height), Image.NEAREST)
+        # Decode (at a reduced JPEG scale when possible) and resize while
+        # maintaining aspect ratio
+        with self._stage('decode'):
+            img, original_size = open_image(img_path, width)
+            img.load()
+        with self._stage('resize'):
+            img = fit_width(img, original_size, width, resample or self.resample)
 
-        draw = ImageDraw.Draw(img)
-        
-        # Try to load custom font with selected family, fallback to system fonts
-        font_candidates = [
-            f'{font_family}',  # System font
-            './fonts/LilitaOne-Regular.ttf',  # Custom font
-            'arial.ttf',  # Windows system font
-            'Arial.ttf',  # Alternative Arial
-            'helvetica.ttf',  # macOS/Linux
-        ]
-        
-        font = None
-        for font_candidate in font_candidates:
-            try:
-                if font_candidate.endswith('.ttf'):
-                    font = ImageFont.truetype(font_candidate, size=font_size)
-                else:
-                    # Try to use system font
-                    font = ImageFont.truetype(font_candidate, size=font_size)
-                break
-            except:
-                continue
-        
-        # Final fallback to default font
-        if font is None:
-            try:
-                font = ImageFont.load_default()
-                # Scale default font size (it's quite small)
-                font = ImageFont.load_default().font_variant(size=font_size//2)
-            except:
-                font = ImageFont.load_default()
-        
-        # Convert position percentages to actual coordinates
-        text_x_position = int((position_x / 100) * width)
-        text_y_position = int((position_y / 100) * height)
-        
-        # Define color mapping
-        color_map = {
-            'white': 'white',
-            'black': 'black',
-            'red': '#FF0000',
-            'blue': '#0000FF',
-            'green': '#00FF00',
-            'yellow': '#FFFF00',
-            'purple': '#800080',
-            'orange': '#FFA500'
-        }
-        
-        text_fill_color = color_map.get(text_color, 'white')
-        outline_color = 'black' if text_color == 'white' else 'white'
-        
-        # Wrap text and calculate total text height
-        wrapped_lines = textwrap.wrap(text, width=40)  # Adjust wrap width based on font size
-        
-        # Add author line only if author is provided and not empty
-        if author and author.strip():
-            author_line = f"- {author.strip()}"
-            wrapped_lines.append(author_line)
-        
-        # Calculate line height and total text block height
+        layer, dest, _ = self.place_text_layer(img.size, text, author, width, font_size=font_size,
+                                               font_family=font_family, text_color=text_color,
+                                               position_x=position_x, position_y=position_y,
+                                               add_outline=add_outline, effects=effects,
+                                               fit_to=fit_box(img.size) if auto_fit else None,
+                                               auto_place=auto_place, background=lambda: img)
+        with self._stage('composite'):
+            return composite_at(img, layer.image, dest, self.blend)
+
+    def make_memes(self, img_paths, text: str, author: str, width=500,
+                   font_size=30, font_family='Impact', text_color='white', position_x=50,
+                   position_y=50, add_outline=True, resample=None, output_format=None,
+                   quality_preset=None, effects=None, auto_fit=False, auto_place=False) -> list:
+        # Same caption on many backgrounds - the text layer is rendered once and
+        # each image only costs a decode, a composite and an encode
+        paths = []
+        for img_path in img_paths:
+            img = self.render_meme(img_path, text, author, width=width, font_size=font_size,
+                                   font_family=font_family, text_color=text_color,
+                                   position_x=position_x, position_y=position_y,
+                                   add_outline=add_outline, resample=resample,
+                                   effects=effects, auto_fit=auto_fit,
+                                   auto_place=auto_place)
+            paths.append(self.save_image(img, output_format, quality_preset).path)
+        return paths
+
+    def render_text_layer(self, text: str, author: str, width=500, font_size=30,
+                          font_family='Impact', text_color='white', add_outline=True,
+                          effects=None, fit_to=None) -> TextLayer:
+        # Returns the text block as an RGBA layer, cached by (text, author, style, width).
+        # effects (see TextEffects) replaces the default outline when given.
+        # fit_to=(box width, box height) auto-fits the font size instead of using font_size.
+        text_fill_color = COLOR_MAP.get(text_color, 'white')
+        if effects is None:
+            effects = (Outline(2, outline_color_for(text_color)),) if add_outline else ()
+        effects = tuple(effects)
+
+        if fit_to:
+            font_size = None
+        key = (text, author, width, font_size, font_family, text_fill_color, effects, fit_to,
+               self.wrap)
+        return self.layer_cache.get_or_render(key, lambda: self._render_text_layer(
+            text, author, width, font_size, font_family, text_fill_color, effects, fit_to))
+
+    def place_text_layer(self, base_size, text: str, author: str, width=500, font_size=30,
+                         font_family='Impact', text_color='white', position_x=50, position_y=50,
+                         add_outline=True, effects=None, fit_to=None, auto_place=False,
+                         background=None) -> tuple:
+        # Renders the text layer for a base of base_size and works out where it
+        # goes. Returns (layer, top-left corner, Placement or None). background
+        # is a callable returning the base image, only called when auto_place
+        # or an 'auto' text_color needs it analysed (see Placement).
+        auto_color = text_color == AUTO_COLOR
+        style = dict(font_size=font_size, font_family=font_family, add_outline=add_outline,
+                     fit_to=fit_to)
+        # Colors don't change the layer size, so the first render can be white
+        layer = self.render_text_layer(text, author, width, text_color='white' if auto_color
+                                       else text_color, effects=effects, **style)
+        if not (auto_place or auto_color):
+            return layer, layer.position(base_size, position_x, position_y), None
+
+        with self._stage('place'):
+            placement = PlacementMap(background()).place(
+                layer.size, AUTO_COLOR if auto_color else COLOR_MAP.get(text_color, 'white'),
+                None if auto_place else (position_x, position_y), layer.padding)
+        if effects is None:
+            effects = (Outline(2, placement.outline),) if add_outline else ()
+        layer = self.render_text_layer(text, author, width,
+                                       text_color=placement.fill if auto_color else text_color,
+                                       effects=recolor_effects(effects, placement.outline),
+                                       **style)
+        return layer, placement.dest, placement
+
+    def _render_text_layer(self, text, author, width, font_size, font_family, fill_color,
+                           effects, fit_to=None) -> TextLayer:
+        if fit_to:
+            # Largest size whose pixel-wrapped lines fit the box
+            with self._stage('layout'):
+                fitted = fit_text(text, author, font_family, *fit_to, wrap=self.wrap)
+            with self._stage('font'):
+                font = load_font(font_family, fitted.font_size)
+            with self._stage('draw'):
+                return render_text_block(fitted.lines, font, fitted.line_height, fill_color,
+                                         effects)
+
+        with self._stage('font'):
+            font = load_font(font_family, font_size)
+        with self._stage('layout'):
+            lines = self._wrap_lines(font, text, author, width)
+
+        # Calculate line height for the text block
         line_height = font_size + 5
-        total_text_height = len(wrapped_lines) * line_height
-        
-        # Adjust starting Y position to center the text block
-        start_y = text_y_position - (total_text_height // 2)
-        
-        # Draw each line of text
-        for i, line in enumerate(wrapped_lines):
-            # Calculate text width for centering if needed
-            bbox = draw.textbbox((0, 0), line, font=font)
-            text_width = bbox[2] - bbox[0]
-            
-            # Adjust x position based on text width (center horizontally around the chosen position)
-            line_x = text_x_position - (text_width // 2)
-            line_y = start_y + (i * line_height)
-            
-            # Ensure text doesn't go outside image bounds
-            line_x = max(5, min(line_x, width - text_width - 5))
-            line_y = max(5, min(line_y, height - font_size - 5))
-            
-            if add_outline:
-                # Draw text outline by drawing text in outline color at offset positions
-                for dx in [-2, -1, 0, 1, 2]:
-                    for dy in [-2, -1, 0, 1, 2]:
-                        if dx != 0 or dy != 0:  # Don't draw on the center position
-                            draw.text((line_x + dx, line_y + dy), line, font=font, fill=outline_color)
-            
-            # Draw the main text
-            draw.text((line_x, line_y), line, font=font, fill=text_fill_color)
-
-        # Save the image
+        with self._stage('draw'):
+            return render_text_block(lines, font, line_height, fill_color, effects)
+
+    def _wrap_lines(self, font, text, author, width):
+        # Wrap text to the image width in pixels and add the author line (if any)
+        return wrap_caption(font, text, author, width - 2 * EDGE_MARGIN, self.wrap)
+
+    def make_animated_meme(self, img_path, text: str, author: str, width=500,
+                           font_size=30, font_family='Impact', text_color='white', position_x=50,
+                           position_y=50, add_outline=True, resample=None, output_format='gif',
+                           quality_preset=None, workers=None, effects=None,
+                           auto_fit=False, auto_place=False) -> str:
+        # Animated version of make_meme - overlays the text on every frame, returns the file path
+        animation = self.render_animated_meme(img_path, text, author, width=width,
+                                              font_size=font_size, font_family=font_family,
+                                              text_color=text_color, position_x=position_x,
+                                              position_y=position_y, add_outline=add_outline,
+                                              resample=resample, output_format=output_format,
+                                              workers=workers, effects=effects,
+                                              auto_fit=auto_fit, auto_place=auto_place)
+        return self.save_animation(animation, output_format, quality_preset).path
+
+    def render_animated_meme(self, img_path, text: str, author: str, width=500,
+                             font_size=30, font_family='Impact', text_color='white', position_x=50,
+                             position_y=50, add_outline=True, resample=None, output_format='gif',
+                             workers=None, effects=None, auto_fit=False,
+                             auto_place=False) -> Animation:
+        # Lays the text out once and composites the same layer onto every frame.
+        # With workers > 1 the per-frame resize/composite/quantize runs in a thread
+        # pool (Pillow releases the GIL for those), decoding stays sequential.
+        # auto_place and an 'auto' text_color go by the first frame.
+        with Image.open(img_path) as source:
+            size = target_size(source.size, width)
+            layer, dest, _ = self.place_text_layer(size, text, author, width, font_size=font_size,
+                                                   font_family=font_family, text_color=text_color,
+                                                   position_x=position_x, position_y=position_y,
+                                                   add_outline=add_outline, effects=effects,
+                                                   fit_to=fit_box(size) if auto_fit else None,
+                                                   auto_place=auto_place,
+                                                   background=lambda: (
+                                                       source.convert('RGB').resize(size)))
+            overlay = lambda frame: composite_at(frame, layer.image, dest, self.blend)
+            with self._stage('frames'):
+                return render_frames(source, size, overlay,
+                                     get_resampler(resample or self.resample),
+                                     quantize=normalize_format(output_format) == 'gif',
+                                     workers=workers)
+
+    def save_image(self, img, output_format=None, quality_preset=None) -> EncodedImage:
+        # Encode the image and write it to the output dir with a matching extension
+        with self._stage('encode'):
+            encoded = encode_image(img, output_format or self.output_format,
+                                   quality_preset or self.quality_preset)
+        return self.save_encoded(encoded)
+
+    def save_encoded(self, encoded) -> EncodedImage:
+        # Write already encoded image bytes to the output dir
         try:
-            extension = img_path.split('.')[-1]
-            filename = f'{randint(0,1000000)}'
-            destination = self.output_dir + '/' + filename + '.' + extension
-            img.save(destination, format='JPEG')
+            if self.store is not None:
+                with self._stage('save'):
+                    destination = self.store.put(encoded.data, encoded.extension)
+            else:
+                filename = f'{randint(0,1000000)}'
+                destination = self.output_dir + '/' + filename + '.' + encoded.extension
+                with self._stage('save'), open(destination, 'wb') as f:
+                    f.write(encoded.data)
         except:
             raise Exception('cannot save image into file')
 
-        return destination
-    
+        encoded.path = destination
+        return encoded
+
+    def save_animation(self, animation, output_format='gif', quality_preset=None) -> EncodedImage:
+        # Encode an animation as GIF or animated WebP and write it to the output dir
+        with self._stage('encode'):
+            encoded = encode_animation(animation.frames, animation.durations, animation.loop,
+                                       output_format, quality_preset or self.quality_preset)
+        return self.save_encoded(encoded)
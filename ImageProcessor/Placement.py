@@ -0,0 +1,165 @@
+# Automatic text placement from summed-area tables
+#
+# The image is analysed once: a grayscale copy (reduced to about
+# ANALYSIS_WIDTH) gives a luminance map and an edge-energy map (absolute
+# horizontal plus vertical gradient), and each map is turned into a
+# summed-area table. The sum over any box is then four lookups, so every
+# candidate position for the text block costs the same however large the
+# block is, and the whole grid of candidates is scored in a few array
+# operations. A good spot is calm (little edge energy, even luminance) and
+# leaves room for contrast with the text color.
+from typing import NamedTuple, Tuple
+
+import numpy
+from PIL import ImageColor
+
+from .TextEffects import Outline, Glow
+from .TextLayer import EDGE_MARGIN, LAYER_PADDING
+
+# text_color value that lets the placement pick fill and outline
+AUTO_COLOR = 'auto'
+
+# Width the image is reduced to before analysis
+ANALYSIS_WIDTH = 256
+
+# Candidate positions per axis
+GRID_STEPS = 24
+
+# Score weights (lower score wins): edge energy and luminance spread under
+# the box count against it, contrast with the fill for it, and drifting off
+# the horizontal center costs a little so ties go to the usual layout
+CLUTTER_WEIGHT = 4.0
+SPREAD_WEIGHT = 1.0
+CONTRAST_WEIGHT = 1.0
+CENTER_WEIGHT = 0.1
+
+
+class Placement(NamedTuple):
+    """Where a text layer goes and in which colors."""
+    dest: Tuple[int, int]  # top-left corner of the layer
+    position_x: float  # center of the layer, percent of the image width
+    position_y: float  # center of the layer, percent of the image height
+    fill: str
+    outline: str
+    score: float
+
+
+def luminance_of(color) -> float:
+    """Relative luminance (0-1) of a PIL color string."""
+    red, green, blue = ImageColor.getrgb(color)[:3]
+    return (0.299 * red + 0.587 * green + 0.114 * blue) / 255
+
+
+def contrasting_outline(fill) -> str:
+    """'black' or 'white', whichever stands out more against fill."""
+    return 'black' if luminance_of(fill) > 0.5 else 'white'
+
+
+def recolor_effects(effects, color) -> tuple:
+    """Effects with their outline and glow drawn in color."""
+    return tuple(effect._replace(color=color) if isinstance(effect, (Outline, Glow))
+                 else effect for effect in effects)
+
+
+def summed_area(values):
+    """Summed-area table of a 2D array, with a leading row and column of zeros."""
+    table = numpy.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=numpy.float64)
+    table[1:, 1:] = values
+    table.cumsum(axis=0, out=table)
+    table.cumsum(axis=1, out=table)
+    return table
+
+
+def box_sums(table, top, left, height, width):
+    """Sums over boxes of one size at every (top, left) pair; top and left broadcast."""
+    bottom, right = top + height, left + width
+    return table[bottom, right] - table[top, right] - table[bottom, left] + table[top, left]
+
+
+class PlacementMap:
+    """Luminance and clutter of one image, ready to score text positions.
+
+    :param image: the image the text will be composited on (any mode).
+    :param analysis_width: width the analysis runs at.
+    """
+
+    def __init__(self, image, analysis_width=ANALYSIS_WIDTH) -> None:
+        self.size = image.size
+        self.factor = max(1, round(image.width / analysis_width))
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGB')  # e.g. palette images, which reduce() can't take
+        if self.factor > 1:
+            image = image.reduce(self.factor)  # box average, before the conversion: cheaper
+        luminance = numpy.asarray(image.convert('L'), dtype=numpy.float32) / 255
+
+        edges = numpy.zeros_like(luminance)
+        horizontal = numpy.abs(numpy.diff(luminance, axis=1))
+        vertical = numpy.abs(numpy.diff(luminance, axis=0))
+        edges[:, 1:] += horizontal
+        edges[:, :-1] += horizontal
+        edges[1:, :] += vertical
+        edges[:-1, :] += vertical
+
+        self.luminance = summed_area(luminance)
+        self.squares = summed_area(luminance * luminance)
+        self.edges = summed_area(edges / 2)
+
+    def place(self, layer_size, fill=AUTO_COLOR, position=None, padding=LAYER_PADDING) -> Placement:
+        """Best position and colors for a layer of layer_size.
+
+        :param layer_size: (width, height) of the text layer in image pixels.
+        :param fill: text color, or AUTO_COLOR to pick white or black per spot.
+        :param position: (position_x, position_y) percentages to keep the
+                         layer at instead of searching, e.g. to only pick colors.
+        :param padding: transparent border of the layer, left out of the scores.
+        """
+        width, height = self.size
+        layer_width, layer_height = layer_size
+        fixed_x = fixed_y = None
+        if position is not None:
+            fixed_x = int(position[0] / 100 * width) - layer_width // 2
+            fixed_y = int(position[1] / 100 * height) - layer_height // 2
+        xs = self._offsets(width, layer_width, padding, fixed_x)
+        ys = self._offsets(height, layer_height, padding, fixed_y)
+
+        # Glyph boxes at analysis scale, clipped to the image
+        rows, columns = self.luminance.shape[0] - 1, self.luminance.shape[1] - 1
+        box_width = max(1, min(columns, (layer_width - 2 * padding) // self.factor))
+        box_height = max(1, min(rows, (layer_height - 2 * padding) // self.factor))
+        left = numpy.clip((xs + padding) // self.factor, 0, columns - box_width)[None, :]
+        top = numpy.clip((ys + padding) // self.factor, 0, rows - box_height)[:, None]
+
+        area = box_width * box_height
+        mean = box_sums(self.luminance, top, left, box_height, box_width) / area
+        spread = numpy.sqrt(numpy.maximum(
+            box_sums(self.squares, top, left, box_height, box_width) / area - mean * mean, 0))
+        clutter = box_sums(self.edges, top, left, box_height, box_width) / area
+        if fill == AUTO_COLOR:
+            contrast = numpy.maximum(mean, 1 - mean)  # black or white, whichever is better
+        else:
+            contrast = numpy.abs(mean - luminance_of(fill))
+        center = numpy.abs((xs + layer_width / 2) / width - 0.5)[None, :]
+        scores = (CLUTTER_WEIGHT * clutter + SPREAD_WEIGHT * spread
+                  - CONTRAST_WEIGHT * contrast + CENTER_WEIGHT * center)
+
+        row, column = numpy.unravel_index(numpy.argmin(scores), scores.shape)
+        x, y = int(xs[column]), int(ys[row])
+        if fill == AUTO_COLOR:
+            fill = 'black' if mean[row, column] > 0.5 else 'white'
+        return Placement(dest=(x, y),
+                         position_x=(x + layer_width / 2) / width * 100,
+                         position_y=(y + layer_height / 2) / height * 100,
+                         fill=fill, outline=contrasting_outline(fill),
+                         score=float(scores[row, column]))
+
+    def _offsets(self, full, layer, pad, fixed=None):
+        # Candidate top-left offsets along one axis, within the bounds
+        # TextLayer.position clamps to
+        low = EDGE_MARGIN - pad
+        high = max(low, full - layer + pad - EDGE_MARGIN)
+        if fixed is not None:
+            return numpy.array([max(low, min(fixed, high))])
+        # The grid plus the centered offset, which the grid may step over
+        centered = max(low, min((full - layer) // 2, high))
+        return numpy.unique(numpy.append(
+            numpy.linspace(low, high, GRID_STEPS).round().astype(int), centered))
@@ -0,0 +1,173 @@
+# Low-resolution previews for the live editors
+import hashlib
+import io
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+
+from .ImageEncoder import encode_image
+from .ImageLoader import load_image
+from .ImageProcessor import fit_box
+from .SceneRenderer import LRUCache
+from .TextLayer import composite_at
+
+PREVIEW_WIDTH = 320
+MIN_PREVIEW_WIDTH = 64
+MAX_PREVIEW_WIDTH = 800
+
+# Width the final render uses, font sizes are scaled down from it
+FULL_WIDTH = 500
+
+
+def source_key(url=None, data=None) -> str:
+    """Cache key of a preview source: the image URL, or a hash of uploaded bytes."""
+    if data is not None:
+        return 'sha1:' + hashlib.sha1(data).hexdigest()
+    return 'url:' + url
+
+
+class RenderedPreview:
+    """Encoded preview plus where the time went."""
+
+    def __init__(self, encoded, render_ms, base_cached, layer_cached) -> None:
+        self.encoded = encoded
+        self.render_ms = render_ms
+        self.base_cached = base_cached
+        self.layer_cached = layer_cached
+
+    def __repr__(self) -> str:
+        return (f'RenderedPreview(bytes={self.encoded.size}, render_ms={self.render_ms:.1f}, '
+                f'base_cached={self.base_cached}, layer_cached={self.layer_cached})')
+
+
+class PreviewRenderer:
+    """Renders editor previews at a reduced width from cached decoded bases.
+
+    The base image is decoded and scaled once per (source, width) and the
+    text layer comes from the ImageProcessor's layer cache, so a warm
+    preview is a composite plus a fast JPEG encode. Nothing is written to
+    disk, the caller gets the encoded bytes.
+
+    :param processor: ImageProcessor whose text layer cache and blend mode are used.
+    :param base_cache_size: decoded bases to keep.
+    :param output_format: format of the previews (see ImageEncoder.FORMATS).
+    :param quality_preset: encoder preset, 'fast' by default.
+    :param admit: optional callable taking (source bytes, width) and returning
+                  a context manager held while a base is decoded, e.g. a
+                  reservation in a memory budget sized from the image header.
+    """
+
+    def __init__(self, processor, base_cache_size=32, output_format='jpeg',
+                 quality_preset='fast', resample='bilinear', admit=None) -> None:
+        self.processor = processor
+        self.admit = admit
+        self.base_cache = LRUCache(base_cache_size)
+        self.output_format = output_format
+        self.quality_preset = quality_preset
+        self.resample = resample
+
+    def base(self, key, load, width=PREVIEW_WIDTH):
+        """Return the decoded base scaled to width and whether it was cached.
+
+        :param key: source key (see source_key).
+        :param load: callable returning the source bytes, only called on a miss.
+        """
+        image = self.base_cache.get((key, width))
+        if image is not None:
+            return image, True
+        data = load()
+        with self.admit(data, width) if self.admit else nullcontext():
+            image = load_image(io.BytesIO(data), width, self.resample)
+        self.base_cache.put((key, width), image)
+        return image, False
+
+    def render(self, key, load, text: str, author: str, width=PREVIEW_WIDTH,
+               full_width=FULL_WIDTH, font_size=30, font_family='Impact', text_color='white',
+               position_x=50, position_y=50, add_outline=True, effects=None,
+               auto_fit=False, auto_place=False) -> RenderedPreview:
+        """Render a preview of what make_meme would produce at full_width.
+
+        The font is scaled by width / full_width so the caption covers the
+        same share of the image as in the final render (auto_fit sizes it
+        to the preview directly).
+        """
+        start = time.perf_counter()
+        width = max(MIN_PREVIEW_WIDTH, min(MAX_PREVIEW_WIDTH, int(width)))
+        base, base_cached = self.base(key, load, width)
+
+        font_size = max(1, round(font_size * width / full_width))
+        layer_cache = self.processor.layer_cache
+        hits = layer_cache.hits
+        layer, dest, _ = self.processor.place_text_layer(
+            base.size, text, author, width, font_size=font_size, font_family=font_family,
+            text_color=text_color, position_x=position_x, position_y=position_y,
+            add_outline=add_outline, effects=effects,
+            fit_to=fit_box(base.size) if auto_fit else None, auto_place=auto_place,
+            background=lambda: base)
+        layer_cached = layer_cache.hits > hits
+
+        img = composite_at(base, layer.image, dest, self.processor.blend)
+        encoded = encode_image(img, self.output_format, self.quality_preset)
+        render_ms = (time.perf_counter() - start) * 1000
+        return RenderedPreview(encoded, render_ms, base_cached, layer_cached)
+
+
+class LatestOnly:
+    """Per-session request coalescing: only the newest request gets rendered.
+
+    Every request bumps its session's generation counter, then waits its
+    turn on the session's lock. A request that finds a newer generation
+    once it gets the lock (or after the debounce delay) has been
+    superseded and should be dropped without rendering, so a burst of
+    slider events costs one render instead of one per event.
+
+    :param debounce_ms: delay before rendering, to let a burst settle.
+    :param max_sessions: idle sessions kept before the oldest are forgotten.
+    """
+
+    def __init__(self, debounce_ms=0, max_sessions=1024) -> None:
+        self.debounce_ms = debounce_ms
+        self.max_sessions = max_sessions
+        self.superseded = 0
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _enter(self, session_id):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                self._evict()
+                state = self._sessions[session_id] = [0, threading.Lock()]
+            self._sessions.move_to_end(session_id)
+            state[0] += 1
+            return state, state[0]
+
+    def _evict(self):
+        # Forget the oldest idle sessions, never one that's rendering
+        for session_id in list(self._sessions):
+            if len(self._sessions) < self.max_sessions:
+                break
+            if not self._sessions[session_id][1].locked():
+                del self._sessions[session_id]
+
+    def _drop(self):
+        with self._lock:
+            self.superseded += 1
+        return None
+
+    def run(self, session_id, render):
+        """Call render() unless a newer request for session_id arrived first.
+
+        :return: render()'s result, or None when the request was superseded.
+        """
+        state, generation = self._enter(session_id)
+        if self.debounce_ms:
+            time.sleep(self.debounce_ms / 1000)
+            if state[0] != generation:
+                return self._drop()
+
+        with state[1]:
+            if state[0] != generation:
+                return self._drop()
+            return render()
@@ -0,0 +1,202 @@
+# Random quote/image renders made ahead of time
+#
+# A producer thread keeps `size` renders of random quote/image pairs on disk.
+# Taking one is a dictionary lookup; the render happened earlier, off the
+# request path. Each render is served `max_serves` times and then retired,
+# and the producer replaces it with a fresh pair. Callers pass the keys
+# their session has already seen, so a session doesn't get the same pair
+# twice while the pool has anything else to offer.
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+
+
+def pair_key(quote, image_path) -> str:
+    """Short stable key of a quote/image pair, unaffected by reloading the lists."""
+    text = f'{quote.body}\0{quote.author}\0{image_path}'
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+class PooledRender:
+    """A rendered pair waiting in the pool."""
+
+    def __init__(self, key, path, quote, image_path) -> None:
+        self.key = key
+        self.path = path
+        self.quote = quote
+        self.image_path = image_path
+        self.serves = 0
+
+    def __repr__(self) -> str:
+        return f'PooledRender({self.key}, serves={self.serves})'
+
+
+class RandomPool:
+    """Pre-rendered random memes, refilled in the background.
+
+    :param processor: ImageProcessor used for the renders (its store, if
+                      any, decides where the files go).
+    :param quotes: Quote objects to choose from.
+    :param images: image paths to choose from.
+    :param size: renders to keep ready.
+    :param max_serves: times a render is served before it's replaced.
+    :param busy: optional callable; while it returns True the producer
+                 waits, so refills don't compete with user renders.
+    :param on_render: optional hook called with (seconds) after each refill render.
+    :param render_options: keyword arguments for processor.make_meme.
+    """
+
+    def __init__(self, processor, quotes, images, size=16, max_serves=8, busy=None,
+                 on_render=None, **render_options) -> None:
+        self.processor = processor
+        self.quotes = list(quotes)
+        self.images = list(images)
+        self.size = size
+        self.max_serves = max_serves
+        self.busy = busy
+        self.on_render = on_render
+        self.render_options = render_options or {'auto_fit': True}
+        self.produced = 0
+        self.retired = 0
+        self.served = 0
+        self.repeats = 0     # served a pair the session had seen, nothing else left
+        self.empty = 0       # takes that found the pool empty
+        self.failures = 0
+        self._items = OrderedDict()  # pair key -> PooledRender, oldest first
+        self._init_threading()
+        if hasattr(os, 'register_at_fork'):
+            # Each worker process runs its own producer (see start)
+            os.register_at_fork(after_in_child=self._init_threading)
+
+    def _init_threading(self):
+        self._lock = threading.Lock()
+        self._wanted = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __len__(self):
+        return len(self._items)
+
+    def set_sources(self, quotes, images):
+        """Replace the quotes and images new renders are made from."""
+        with self._lock:
+            self.quotes = list(quotes)
+            self.images = list(images)
+            self._wanted.notify()
+
+    def take(self, seen=(), where=None):
+        """A render the caller hasn't seen, or the one it saw longest ago.
+
+        :param seen: pair keys already served to this session, oldest first.
+        :param where: optional predicate on PooledRender limiting the choice.
+        :return: PooledRender, or None when the pool has nothing (matching).
+        """
+        self.start()
+        with self._lock:
+            seen_order = {key: index for index, key in enumerate(seen)}
+            items = [item for item in self._items.values() if where is None or where(item)]
+            choices = [item for item in items if item.key not in seen_order]
+            if choices:
+                item = random.choice(choices)
+            elif items:
+                self.repeats += 1
+                item = min(items, key=lambda item: seen_order[item.key])
+            else:
+                self.empty += 1
+                return None
+            item.serves += 1
+            self.served += 1
+            # A repeat means the pool is stale for this session, make room for a new pair
+            if item.serves >= self.max_serves or not choices:
+                self._retire(item)
+            return item
+
+    def discard(self, item):
+        """Drop an item whose file has gone missing."""
+        with self._lock:
+            if self._items.get(item.key) is item:
+                self._retire(item)
+
+    def _retire(self, item):
+        del self._items[item.key]
+        self.retired += 1
+        self._wanted.notify()
+        store = self.processor.store
+        if store is not None:
+            # Still served to whoever got the URL; the sweeper can have it once it's unused
+            store.release(item.path)
+
+    def fill(self):
+        """Render until the pool is full, on the calling thread."""
+        while len(self._items) < self.size and self._produce():
+            pass
+
+    def _pick(self):
+        # A random pair not in the pool, None when there's nothing to render
+        with self._lock:
+            if not self.quotes or not self.images:
+                return None
+            for _ in range(8):
+                quote, image_path = random.choice(self.quotes), random.choice(self.images)
+                key = pair_key(quote, image_path)
+                if key not in self._items:
+                    return key, quote, image_path
+        return None
+
+    def _produce(self) -> bool:
+        picked = self._pick()
+        if picked is None:
+            return False
+        key, quote, image_path = picked
+        start = time.perf_counter()
+        try:
+            path = self.processor.make_meme(image_path, quote.body, quote.author,
+                                            **self.render_options)
+        except Exception as e:
+            self.failures += 1
+            print(f"Warning: Random render of {image_path} failed: {e}")
+            return False
+        if self.on_render is not None:
+            self.on_render(time.perf_counter() - start)
+        store = self.processor.store
+        if store is not None:
+            # Held in memory, not pinned: a pin would outlive the pool on restart
+            store.hold(path)
+        with self._lock:
+            self._items[key] = PooledRender(key, path, quote, image_path)
+            self.produced += 1
+        return True
+
+    def start(self):
+        """Start the producer thread if it isn't running in this process."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='random-pool',
+                                                    daemon=True)
+                    self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            self._wanted.notify()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._lock:
+                while len(self._items) >= self.size and not self._stop.is_set():
+                    self._wanted.wait()
+            if self._stop.is_set():
+                break
+            if self.busy is not None and self.busy():
+                self._stop.wait(0.25)
+                continue
+            if not self._produce():
+                # No sources or a failed render, don't spin
+                self._stop.wait(5)
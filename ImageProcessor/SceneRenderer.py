@@ -0,0 +1,428 @@
+# Server-side renderer for multi-layer scene documents (Canvas Creator exports)
+import base64
+import binascii
+import hashlib
+import io
+import math
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import partial
+
+from PIL import Image, ImageColor
+
+from .Fonts import load_font
+from .ImageLoader import get_resampler, to_drawable
+from .TextEffects import Outline, effect_padding, effects_from_names
+from .TextLayer import LAYER_PADDING, render_text_block
+from .TextMeasure import ink_extent
+from .TextWrap import WRAP_MODES, wrap_text
+
+MAX_SCENE_SIZE = 4096
+MAX_LAYERS = 64
+
+# Text layer bounds: the outline dilation costs stroke_width^2 per pixel,
+# and font_size x characters is checked before anything is measured
+MAX_STROKE_WIDTH = 32
+MAX_TEXT_EXTENT = 64 * MAX_SCENE_SIZE
+LINE_HEIGHT_RANGE = (0.5, 3.0)
+
+# Byte budgets of the caches (decoded or rendered RGBA pixels)
+LAYER_CACHE_BYTES = 256 * 1024 * 1024
+IMAGE_CACHE_BYTES = 256 * 1024 * 1024
+BASE_CACHE_BYTES = 128 * 1024 * 1024
+
+# Layer fields that only move a layer; everything else changes its pixels
+PLACEMENT_FIELDS = ('id', 'x', 'y')
+
+LAYER_TYPES = ('text', 'image')
+
+BASE_FITS = ('cover', 'contain', 'stretch')
+
+
+class SceneError(ValueError):
+    """Raised when a scene document is malformed."""
+
+
+def value_bytes(value) -> int:
+    """Approximate memory held by a cached value: image pixels or encoded bytes."""
+    if isinstance(value, Image.Image):
+        return value.size[0] * value.size[1] * len(value.getbands())
+    data = getattr(value, 'data', None)
+    return len(data) if isinstance(data, (bytes, bytearray)) else 0
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters.
+
+    :param max_entries: entries kept before the least recently used go.
+    :param max_bytes: optional budget of value_bytes over all entries; a
+                      single value larger than the budget isn't cached.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()  # key -> (value, bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key, value):
+        size = value_bytes(value)
+        with self._lock:
+            previous = self._items.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._items[key] = (value, size)
+            self.bytes += size
+            while len(self._items) > self.max_entries or (
+                    self.max_bytes is not None and self.bytes > self.max_bytes):
+                _, (_, evicted) = self._items.popitem(last=False)
+                self.bytes -= evicted
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RenderedScene:
+    """Result of rendering a scene: the image plus cache statistics."""
+
+    def __init__(self, image, render_ms, layers_rendered, layers_cached) -> None:
+        self.image = image
+        self.render_ms = render_ms
+        self.layers_rendered = layers_rendered
+        self.layers_cached = layers_cached
+
+    def __repr__(self) -> str:
+        return (f'RenderedScene(size={self.image.size}, render_ms={self.render_ms:.1f}, '
+                f'rendered={self.layers_rendered}, cached={self.layers_cached})')
+
+
+class SceneRenderer:
+    """Renders scene documents: a base image/color plus text and image layers.
+
+    A scene looks like::
+
+        {"width": 800, "height": 600, "background": "#ffffff",
+         "base": {"url": "https://...", "fit": "cover"},
+         "layers": [
+            {"type": "text", "text": "Hello", "x": 400, "y": 80,
+             "font_family": "Impact", "font_size": 48, "color": "#ffffff",
+             "stroke_color": "#000000", "stroke_width": 2,
+             "rotation": 10, "opacity": 0.9},
+            {"type": "image", "url": "https://...", "x": 600, "y": 450,
+             "width": 200, "height": 150, "rotation": 0, "opacity": 1}]}
+
+    x/y are the layer's center. Text keeps its line breaks; give a text
+    layer "max_width" (and optionally "wrap": "greedy") to also wrap it to
+    that many pixels. Rendered layers (after scaling, rotation and
+    opacity) are cached by everything except their position, so moving a
+    layer or editing one of many only re-renders what actually changed.
+    Fetched images are cached by URL (data: URLs by content hash) and fonts
+    by (family, size); the layer, image and base caches each have a byte
+    budget. Text layers that would come out larger than MAX_SCENE_SIZE, or
+    with an outline wider than MAX_STROKE_WIDTH, are rejected.
+
+    :param fetch_image: callable taking a URL and returning the image bytes.
+    :param admit: optional callable taking the bytes a source image will
+                  need once decoded (read from its header) and returning a
+                  context manager held while it is decoded and converted,
+                  e.g. a reservation in a memory budget.
+    """
+
+    def __init__(self, fetch_image=None, layer_cache_size=256, image_cache_size=64,
+                 resample='lanczos', layer_cache_bytes=LAYER_CACHE_BYTES,
+                 image_cache_bytes=IMAGE_CACHE_BYTES, admit=None) -> None:
+        self.fetch_image = fetch_image
+        self.admit = admit
+        self.layer_cache = LRUCache(layer_cache_size, layer_cache_bytes)
+        self.image_cache = LRUCache(image_cache_size, image_cache_bytes)
+        self.base_cache = LRUCache(16, BASE_CACHE_BYTES)
+        self.resample = resample
+
+    def render(self, scene) -> RenderedScene:
+        """Render a scene document (dict or JSON string) into an RGBA image."""
+        start = time.perf_counter()
+        scene = self._validate(scene)
+
+        canvas = self._render_base(scene).copy()
+        rendered = cached = 0
+        for layer in scene['layers']:
+            key = layer_key(layer)
+            image = self.layer_cache.get(key)
+            if image is None:
+                image = self._render_layer(layer)
+                self.layer_cache.put(key, image)
+                rendered += 1
+            else:
+                cached += 1
+
+            # Center the layer on its (x, y)
+            dest = (int(round(layer['x'] - image.size[0] / 2)),
+                    int(round(layer['y'] - image.size[1] / 2)))
+            _paste(canvas, image, dest)
+
+        render_ms = (time.perf_counter() - start) * 1000
+        return RenderedScene(canvas, render_ms, rendered, cached)
+
+    def _validate(self, scene):
+        if isinstance(scene, (str, bytes)):
+            try:
+                scene = json.loads(scene)
+            except ValueError:
+                raise SceneError('Scene is not valid JSON')
+        if not isinstance(scene, dict):
+            raise SceneError('Scene must be a JSON object')
+
+        try:
+            width, height = int(scene.get('width', 0)), int(scene.get('height', 0))
+        except (TypeError, ValueError):
+            raise SceneError('Scene width and height must be integers')
+        if not (0 < width <= MAX_SCENE_SIZE and 0 < height <= MAX_SCENE_SIZE):
+            raise SceneError(f'Scene size must be between 1 and {MAX_SCENE_SIZE} pixels')
+
+        layers = scene.get('layers') or []
+        if not isinstance(layers, list) or len(layers) > MAX_LAYERS:
+            raise SceneError(f'Scene layers must be a list of at most {MAX_LAYERS} layers')
+
+        checked = []
+        for index, layer in enumerate(layers):
+            if not isinstance(layer, dict) or layer.get('type') not in LAYER_TYPES:
+                raise SceneError(f'Layer {index} needs a type of {", ".join(LAYER_TYPES)}')
+            layer = dict(layer)
+            try:
+                layer['x'] = float(layer.get('x', width / 2))
+                layer['y'] = float(layer.get('y', height / 2))
+                layer['rotation'] = float(layer.get('rotation', 0) or 0)
+                opacity = layer.get('opacity')
+                layer['opacity'] = min(1.0, max(0.0, 1.0 if opacity is None else float(opacity)))
+            except (TypeError, ValueError):
+                raise SceneError(f'Layer {index} has a non-numeric position, rotation or opacity')
+            checked.append(layer)
+
+        return dict(scene, width=width, height=height, layers=checked)
+
+    def _render_base(self, scene):
+        # Background color plus optional base image, cached since it rarely changes
+        base = scene.get('base') or {}
+        if isinstance(base, str):
+            base = {'url': base}
+        key = json.dumps([scene['width'], scene['height'], scene.get('background'),
+                          {name: _url_key(value) for name, value in base.items()}],
+                         sort_keys=True, default=str)
+        canvas = self.base_cache.get(key)
+        if canvas is not None:
+            return canvas
+
+        size = (scene['width'], scene['height'])
+        canvas = Image.new('RGBA', size, _color(scene.get('background') or '#ffffff', 'background'))
+        if base.get('url'):
+            fit = base.get('fit', 'cover')
+            if fit not in BASE_FITS:
+                raise SceneError(f'Base fit must be one of {", ".join(BASE_FITS)}')
+            image = self._load_image(base['url'])
+            image = self._fit(image, size, fit)
+            offset = ((size[0] - image.size[0]) // 2, (size[1] - image.size[1]) // 2)
+            _paste(canvas, image, offset)
+
+        self.base_cache.put(key, canvas)
+        return canvas
+
+    def _fit(self, image, size, fit):
+        resample = get_resampler(self.resample)
+        if fit == 'stretch':
+            return image.resize(size, resample)
+        scale_x, scale_y = size[0] / image.size[0], size[1] / image.size[1]
+        scale = max(scale_x, scale_y) if fit == 'cover' else min(scale_x, scale_y)
+        scaled = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+        return image.resize(scaled, resample)
+
+    def _render_layer(self, layer):
+        if layer['type'] == 'text':
+            image = self._render_text(layer)
+        else:
+            image = self._render_image(layer)
+
+        if layer['rotation']:
+            angle = math.radians(layer['rotation'])
+            cos, sin = abs(math.cos(angle)), abs(math.sin(angle))
+            if max(image.size[0] * cos + image.size[1] * sin,
+                   image.size[0] * sin + image.size[1] * cos) > MAX_SCENE_SIZE + 1:
+                raise SceneError(f'Rotated layer would be larger than {MAX_SCENE_SIZE} pixels')
+            # Scene rotation is clockwise in degrees, PIL rotates counter-clockwise
+            image = image.rotate(-layer['rotation'], resample=Image.Resampling.BICUBIC,
+                                 expand=True)
+        if layer['opacity'] < 1:
+            alpha = image.getchannel('A').point(lambda a: int(a * layer['opacity'] + 0.5))
+            image.putalpha(alpha)
+        return image
+
+    def _render_text(self, layer):
+        text = str(layer.get('text', ''))
+        try:
+            font_size = int(layer.get('font_size', 40))
+        except (TypeError, ValueError):
+            raise SceneError('Text layer font_size must be an integer')
+        if not 1 <= font_size <= 1000:
+            raise SceneError('Text layer font_size must be between 1 and 1000')
+
+        if font_size * len(text) > MAX_TEXT_EXTENT:
+            raise SceneError(f'Text layer is too large: font_size x characters must be at most '
+                             f'{MAX_TEXT_EXTENT}')
+        try:
+            line_height = float(layer.get('line_height', 1.15))
+        except (TypeError, ValueError):
+            raise SceneError('Text layer line_height must be a number')
+        if not LINE_HEIGHT_RANGE[0] <= line_height <= LINE_HEIGHT_RANGE[1]:
+            raise SceneError('Text layer line_height must be between {} and {}'.format(
+                *LINE_HEIGHT_RANGE))
+
+        font = load_font(layer.get('font_family') or 'Impact', font_size)
+        color = _color(layer.get('color') or '#000000', 'text color')
+
+        effects = []
+        if layer.get('stroke_color') and layer.get('stroke_width'):
+            _color(layer['stroke_color'], 'stroke color')
+            try:
+                stroke_width = int(layer['stroke_width'])
+            except (TypeError, ValueError):
+                raise SceneError('Text layer stroke_width must be an integer')
+            max_stroke = min(MAX_STROKE_WIDTH, max(1, font_size // 4))
+            if not 0 < stroke_width <= max_stroke:
+                raise SceneError(f'Text layer stroke_width must be between 1 and {max_stroke} '
+                                 f'(a quarter of the font size, at most {MAX_STROKE_WIDTH})')
+            effects.append(Outline(stroke_width, layer['stroke_color'], shape='round'))
+        try:
+            effects.extend(effects_from_names(layer.get('effects') or [],
+                                              layer.get('stroke_color') or 'black'))
+        except ValueError as e:
+            raise SceneError(str(e))
+
+        lines = text.split('\n')
+        if layer.get('max_width'):
+            wrap = layer.get('wrap', 'balanced')
+            if wrap not in WRAP_MODES:
+                raise SceneError(f'Text layer wrap must be one of {", ".join(WRAP_MODES)}')
+            try:
+                max_width = int(layer['max_width'])
+            except (TypeError, ValueError):
+                raise SceneError('Text layer max_width must be an integer')
+            if not 0 < max_width <= MAX_SCENE_SIZE:
+                raise SceneError(f'Text layer max_width must be between 1 and {MAX_SCENE_SIZE}')
+            lines = wrap_text(font, text, max_width, wrap)
+
+        # Measure before drawing, so an oversized block never gets allocated
+        line_height = max(1, int(font_size * line_height))
+        pad = 2 * (LAYER_PADDING + effect_padding(effects))
+        block_width = max([right - left for left, right in map(partial(ink_extent, font), lines)]
+                          or [0])
+        if block_width + pad > MAX_SCENE_SIZE or len(lines) * line_height + pad > MAX_SCENE_SIZE:
+            raise SceneError(f'Text layer would be larger than {MAX_SCENE_SIZE} pixels')
+        block = render_text_block(lines, font, line_height, _hex(color), tuple(effects))
+        return block.image
+
+    def _render_image(self, layer):
+        if not layer.get('url'):
+            raise SceneError('Image layer needs a url')
+        image = self._load_image(layer['url'])
+        try:
+            width = int(layer.get('width') or image.size[0])
+            height = int(layer.get('height') or image.size[1])
+        except (TypeError, ValueError):
+            raise SceneError('Image layer width and height must be integers')
+        if not (0 < width <= MAX_SCENE_SIZE and 0 < height <= MAX_SCENE_SIZE):
+            raise SceneError(f'Image layer size must be between 1 and {MAX_SCENE_SIZE} pixels')
+        if (width, height) != image.size:
+            image = image.resize((width, height), get_resampler(self.resample))
+        return image
+
+    def _load_image(self, url):
+        # Decoded RGBA images are cached by URL; data: URLs are decoded in place
+        # and cached by a hash of their content instead of the whole URL
+        if url.startswith('data:'):
+            data = _decode_data_url(url)
+            key = 'sha1:' + hashlib.sha1(data).hexdigest()
+        elif url.startswith(('http://', 'https://')) and self.fetch_image:
+            data, key = None, url
+        else:
+            raise SceneError(f'Unsupported image url: {url[:80]}')
+        image = self.image_cache.get(key)
+        if image is not None:
+            return image
+        if data is None:
+            data = self.fetch_image(url)
+
+        try:
+            with Image.open(io.BytesIO(data)) as source:
+                # The decoded source plus its RGBA copy
+                needed = source.size[0] * source.size[1] * 4 * 2
+                with self.admit(needed) if self.admit else nullcontext():
+                    source.load()
+                    image = to_drawable(source).convert('RGBA')
+        except Image.DecompressionBombError:
+            raise SceneError(f'Image is too large to decode: {url[:80]}')
+        except OSError:
+            raise SceneError(f'Could not decode image: {url[:80]}')
+        self.image_cache.put(key, image)
+        return image
+
+
+def _paste(canvas, image, dest):
+    # Alpha-composite image onto canvas in place; dest may be partly (or
+    # entirely) off the canvas, which Image.alpha_composite doesn't allow
+    x, y = dest
+    if x >= canvas.size[0] or y >= canvas.size[1] or x + image.size[0] <= 0 \
+            or y + image.size[1] <= 0:
+        return
+    canvas.alpha_composite(image, (max(0, x), max(0, y)), (max(0, -x), max(0, -y)))
+
+
+def layer_key(layer) -> str:
+    """Cache key of a layer: everything that affects its pixels, not its position."""
+    content = {key: _url_key(value) for key, value in layer.items()
+               if key not in PLACEMENT_FIELDS}
+    return json.dumps(content, sort_keys=True, default=str)
+
+
+def _url_key(value):
+    # data: URLs stand in keys as a hash, not as the (possibly megabytes of) URL
+    if isinstance(value, str) and value.startswith('data:'):
+        return 'data:sha1:' + hashlib.sha1(value.encode('utf-8', 'replace')).hexdigest()
+    return value
+
+
+def _color(value, what):
+    try:
+        return ImageColor.getrgb(str(value))
+    except ValueError:
+        raise SceneError(f'Invalid {what}: {value}')
+
+
+def _hex(rgb):
+    return '#' + ''.join(f'{channel:02x}' for channel in rgb[:3])
+
+
+def _decode_data_url(url):
+    header, _, payload = url.partition(',')
+    if ';base64' not in header:
+        raise SceneError('Only base64 data: URLs are supported')
+    try:
+        return base64.b64decode(payload, validate=False)
+    except (binascii.Error, ValueError):
+        raise SceneError('Invalid base64 data: URL')
@@ -0,0 +1,217 @@
+# Text effects computed on the glyph coverage mask with NumPy
+#
+# Every effect works on the whole mask at once (shifted array views, separable
+# filters), so its cost depends on the effect size and the layer area, not on
+# how many glyphs or draw passes the caption has.
+import math
+from typing import NamedTuple, Tuple
+
+import numpy
+from PIL import Image, ImageColor
+
+
+class Outline(NamedTuple):
+    """Solid outline around the glyphs."""
+    width: int = 2
+    color: str = 'black'
+    opacity: float = 1.0
+    shape: str = 'square'  # 'square' matches the old 5x5 offset loop, 'round' for thick outlines
+
+
+class Shadow(NamedTuple):
+    """Blurred, offset copy of the glyphs behind the text."""
+    offset: Tuple[int, int] = (3, 3)
+    blur: float = 2.0
+    color: str = 'black'
+    opacity: float = 0.7
+
+
+class Glow(NamedTuple):
+    """Soft halo around the glyphs."""
+    radius: int = 6
+    color: str = 'white'
+    opacity: float = 0.8
+
+
+class Box(NamedTuple):
+    """Background rectangle behind the whole text block."""
+    padding: int = 8
+    color: str = 'black'
+    opacity: float = 0.5
+
+
+# Effects are painted back to front in this order, the text itself goes on top
+PAINT_ORDER = (Box, Shadow, Glow, Outline)
+
+
+def effect_padding(effects) -> int:
+    """Pixels an effect list can reach beyond the glyph coverage."""
+    padding = 0
+    for effect in effects:
+        if isinstance(effect, Outline):
+            padding = max(padding, effect.width)
+        elif isinstance(effect, Shadow):
+            reach = max(abs(effect.offset[0]), abs(effect.offset[1]))
+            padding = max(padding, reach + math.ceil(3 * effect.blur))
+        elif isinstance(effect, Glow):
+            padding = max(padding, effect.radius + math.ceil(3 * _glow_sigma(effect)))
+        elif isinstance(effect, Box):
+            padding = max(padding, effect.padding)
+    return padding
+
+
+def max_filter_1d(values, radius, axis):
+    """Sliding-window maximum of width 2 * radius + 1 along one axis."""
+    if radius <= 0:
+        return values
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (radius, radius)
+    padded = numpy.pad(values, pad)
+    length = values.shape[axis]
+    window = [slice(None)] * values.ndim
+    out = values.copy()
+    for offset in range(2 * radius + 1):
+        window[axis] = slice(offset, offset + length)
+        numpy.maximum(out, padded[tuple(window)], out=out)
+    return out
+
+
+def dilate(mask, radius, shape='square'):
+    """Grow a coverage mask by radius pixels.
+
+    'square' is separable (two 1-D max filters), 'round' takes the maximum
+    over the shifted views that fall inside a disk.
+    """
+    if radius <= 0:
+        return mask
+    if shape == 'square':
+        return max_filter_1d(max_filter_1d(mask, radius, 0), radius, 1)
+    if shape != 'round':
+        raise ValueError(f'Unknown dilation shape: {shape}')
+
+    height, width = mask.shape
+    padded = numpy.pad(mask, radius)
+    out = mask.copy()
+    for dy in range(-radius, radius + 1):
+        # Widest horizontal run of the disk at this row, applied as a 1-D max
+        half_width = int(math.floor(math.sqrt(radius * radius - dy * dy)))
+        rows = padded[radius + dy:radius + dy + height]
+        row_max = max_filter_1d(rows, half_width, 1)[:, radius:radius + width]
+        numpy.maximum(out, row_max, out=out)
+    return out
+
+
+def gaussian_kernel(sigma):
+    """Normalized 1-D Gaussian kernel covering +/- 3 sigma."""
+    radius = max(1, int(math.ceil(3 * sigma)))
+    x = numpy.arange(-radius, radius + 1, dtype=numpy.float32)
+    kernel = numpy.exp(-(x * x) / (2 * sigma * sigma))
+    return kernel / kernel.sum()
+
+
+def gaussian_blur(mask, sigma):
+    """Separable Gaussian blur: one weighted sum of shifted views per axis."""
+    if sigma <= 0:
+        return mask
+    kernel = gaussian_kernel(sigma)
+    radius = len(kernel) // 2
+    out = mask.astype(numpy.float32)
+    for axis in (0, 1):
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (radius, radius)
+        padded = numpy.pad(out, pad)
+        length = out.shape[axis]
+        window = [slice(None), slice(None)]
+        blurred = numpy.zeros_like(out)
+        for offset, weight in enumerate(kernel):
+            window[axis] = slice(offset, offset + length)
+            blurred += weight * padded[tuple(window)]
+        out = blurred
+    return out
+
+
+def shift(mask, dx, dy):
+    """Translate a mask by (dx, dy), filling with zeros."""
+    out = numpy.zeros_like(mask)
+    height, width = mask.shape
+    src_y = slice(max(0, -dy), min(height, height - dy))
+    dst_y = slice(max(0, dy), min(height, height + dy))
+    src_x = slice(max(0, -dx), min(width, width - dx))
+    dst_x = slice(max(0, dx), min(width, width + dx))
+    out[dst_y, dst_x] = mask[src_y, src_x]
+    return out
+
+
+def _glow_sigma(glow):
+    return max(0.5, glow.radius / 2.0)
+
+
+def effect_alpha(effect, coverage):
+    """Alpha map (0-1 floats) of one effect for a glyph coverage mask."""
+    if isinstance(effect, Outline):
+        alpha = dilate(coverage, effect.width, effect.shape)
+    elif isinstance(effect, Shadow):
+        alpha = shift(gaussian_blur(coverage, effect.blur), *effect.offset)
+    elif isinstance(effect, Glow):
+        grown = dilate(coverage, effect.radius // 2, 'round')
+        alpha = numpy.clip(gaussian_blur(grown, _glow_sigma(effect)) * 1.5, 0.0, 1.0)
+    elif isinstance(effect, Box):
+        alpha = numpy.zeros_like(coverage)
+        rows = numpy.flatnonzero(coverage.max(axis=1) > 0)
+        cols = numpy.flatnonzero(coverage.max(axis=0) > 0)
+        if len(rows) and len(cols):
+            pad = effect.padding
+            alpha[max(0, rows[0] - pad):rows[-1] + pad + 1,
+                  max(0, cols[0] - pad):cols[-1] + pad + 1] = 1.0
+    else:
+        raise ValueError(f'Unknown text effect: {effect!r}')
+    return alpha * effect.opacity
+
+
+def apply_effects(coverage, fill_color, effects=()):
+    """Build an RGBA layer from glyph coverage, painting effects under the text.
+
+    :param coverage: 2-D uint8 array (or L image) of glyph coverage.
+    :param fill_color: text color (any PIL color string).
+    :param effects: Outline/Shadow/Glow/Box instances.
+    :return: RGBA PIL image the size of the mask.
+    """
+    coverage = numpy.asarray(coverage, dtype=numpy.float32) / 255.0
+    ordered = sorted(effects, key=lambda effect: PAINT_ORDER.index(type(effect)))
+
+    # Porter-Duff "over" in premultiplied alpha, back to front
+    height, width = coverage.shape
+    premultiplied = numpy.zeros((height, width, 3), dtype=numpy.float32)
+    alpha = numpy.zeros((height, width), dtype=numpy.float32)
+    layers = [(effect.color, effect_alpha(effect, coverage)) for effect in ordered]
+    layers.append((fill_color, coverage))
+    for color, layer_alpha in layers:
+        rgb = numpy.array(ImageColor.getrgb(color)[:3], dtype=numpy.float32)
+        keep = 1.0 - layer_alpha
+        premultiplied *= keep[..., None]
+        premultiplied += layer_alpha[..., None] * rgb
+        alpha = layer_alpha + alpha * keep
+
+    rgb = numpy.divide(premultiplied, alpha[..., None], out=numpy.zeros_like(premultiplied),
+                       where=alpha[..., None] > 0)
+    out = numpy.dstack([rgb, alpha * 255.0])
+    return Image.fromarray(numpy.clip(out + 0.5, 0, 255).astype(numpy.uint8), 'RGBA')
+
+
+def effects_from_names(names, outline_color='black'):
+    """Build default effects from names like 'outline', 'shadow', 'glow', 'box'."""
+    factories = {
+        'outline': lambda: Outline(color=outline_color),
+        'shadow': lambda: Shadow(),
+        'glow': lambda: Glow(color=outline_color),
+        'box': lambda: Box(),
+    }
+    effects = []
+    for name in names:
+        name = name.strip().lower()
+        if not name or name == 'none':
+            continue
+        if name not in factories:
+            raise ValueError(f'Unknown text effect: {name}')
+        effects.append(factories[name]())
+    return tuple(effects)
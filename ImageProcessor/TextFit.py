@@ -0,0 +1,71 @@
+# Auto-fit: the largest font size whose wrapped text fits a box
+from functools import lru_cache
+
+from .Fonts import load_font
+from .TextMeasure import text_width
+from .TextWrap import wrap_caption
+
+MIN_FONT_SIZE = 12
+MAX_FONT_SIZE = 120
+
+# Gap between lines, same as the fixed-size layout (line height = size + 5)
+LINE_SPACING = 5
+
+
+class FittedText:
+    """Result of fitting text into a box."""
+
+    def __init__(self, font_size, lines, line_height, width, height) -> None:
+        self.font_size = font_size
+        self.lines = tuple(lines)
+        self.line_height = line_height
+        self.width = width
+        self.height = height
+
+    def __repr__(self) -> str:
+        return (f'FittedText(font_size={self.font_size}, lines={len(self.lines)}, '
+                f'size=({self.width}, {self.height}))')
+
+
+def layout(text, author, font, max_width, font_size, wrap='greedy'):
+    """Wrap text (and the author line) and return (lines, block width, block height)."""
+    lines = wrap_caption(font, text, author, max_width, wrap)
+    width = max([text_width(font, line) for line in lines] or [0])
+    return lines, width, len(lines) * (font_size + LINE_SPACING)
+
+
+@lru_cache(maxsize=512)
+def fit_text(text, author, font_family, box_width, box_height, min_size=MIN_FONT_SIZE,
+             max_size=MAX_FONT_SIZE, wrap='greedy') -> FittedText:
+    """Find the largest font size at which the wrapped text fits the box.
+
+    Wrapped height grows with the font size, so a binary search over sizes
+    needs about log2(max_size - min_size) layouts; each layout measures
+    words with the fonts' advance tables (see TextMeasure) instead of textbbox.
+    If even min_size doesn't fit, the min_size layout is returned.
+
+    :param box_width: usable width in pixels, lines are wrapped to it.
+    :param box_height: usable height in pixels.
+    :param wrap: line breaking mode, see TextWrap.
+    """
+    def attempt(size):
+        font = load_font(font_family, size)
+        lines, width, height = layout(text, author, font, box_width, size, wrap)
+        return lines, width, height, width <= box_width and height <= box_height
+
+    low, high = min_size, max_size
+    best = None
+    while low <= high:
+        size = (low + high) // 2
+        lines, width, height, fits = attempt(size)
+        if fits:
+            best = (size, lines, width, height)
+            low = size + 1
+        else:
+            high = size - 1
+
+    if best is None:
+        lines, width, height, _ = attempt(min_size)
+        best = (min_size, lines, width, height)
+    size, lines, width, height = best
+    return FittedText(size, lines, size + LINE_SPACING, int(round(width)), height)
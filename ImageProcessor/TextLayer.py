@@ -0,0 +1,174 @@
+# Pre-rendered text blocks that can be composited onto any base image
+import threading
+from collections import OrderedDict
+
+import numpy
+from PIL import Image, ImageDraw
+
+from .TextEffects import apply_effects, effect_padding
+from .TextMeasure import ink_extent
+
+# Space around the glyphs so outlines and effects aren't clipped
+LAYER_PADDING = 4
+
+# Margin kept between the text block and the image edge
+EDGE_MARGIN = 5
+
+BLEND_MODES = ('pillow', 'numpy')
+
+
+class TextLayer:
+    """An RGBA image of a rendered text block.
+
+    The layer only covers the text itself, so it doesn't depend on the
+    height of the image it ends up on and one layer can be reused for
+    every background with the same caption, style and width.
+    """
+
+    def __init__(self, image, padding=LAYER_PADDING) -> None:
+        self.image = image
+        self.padding = padding
+
+    @property
+    def size(self):
+        return self.image.size
+
+    def position(self, base_size, position_x=50, position_y=50):
+        """Top-left corner of the layer when centered on a percentage position."""
+        width, height = base_size
+        layer_width, layer_height = self.image.size
+        pad = self.padding
+
+        # Convert position percentages to actual coordinates
+        x = int((position_x / 100) * width) - layer_width // 2
+        y = int((position_y / 100) * height) - layer_height // 2
+
+        # Ensure text doesn't go outside image bounds (the padding may)
+        x = max(EDGE_MARGIN - pad, min(x, width - layer_width + pad - EDGE_MARGIN))
+        y = max(EDGE_MARGIN - pad, min(y, height - layer_height + pad - EDGE_MARGIN))
+        return x, y
+
+    def composite(self, base, position_x=50, position_y=50, blend='pillow'):
+        """Return a copy of base with the layer composited at a percentage position."""
+        return composite_at(base, self.image, self.position(base.size, position_x, position_y),
+                            blend)
+
+    def __repr__(self) -> str:
+        return f'TextLayer(size={self.image.size})'
+
+
+class TextLayerCache:
+    """Thread-safe LRU cache of rendered TextLayers."""
+
+    def __init__(self, max_entries=256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._layers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        """Return the cached layer for key, rendering (and caching) it on a miss."""
+        with self._lock:
+            layer = self._layers.get(key)
+            if layer is not None:
+                self._layers.move_to_end(key)
+                self.hits += 1
+                return layer
+            self.misses += 1
+
+        # Render outside the lock, two threads racing on one key just both render
+        layer = render()
+        with self._lock:
+            self._layers[key] = layer
+            self._layers.move_to_end(key)
+            while len(self._layers) > self.max_entries:
+                self._layers.popitem(last=False)
+        return layer
+
+    def clear(self):
+        with self._lock:
+            self._layers.clear()
+
+    def __len__(self) -> int:
+        return len(self._layers)
+
+
+def render_text_block(lines, font, line_height, fill_color, effects=(),
+                      padding=LAYER_PADDING) -> TextLayer:
+    """Draw centered lines of text into a TextLayer, with effects underneath.
+
+    The glyphs are drawn once into a coverage mask; outline, shadow, glow and
+    box are then derived from that mask (see TextEffects) instead of drawing
+    the text again for every outline offset.
+
+    :param lines: lines of text, top to bottom.
+    :param font: PIL font to draw with.
+    :param line_height: distance between line tops in pixels.
+    :param fill_color: text color (any PIL color string).
+    :param effects: TextEffects instances (Outline, Shadow, Glow, Box).
+    """
+    padding += effect_padding(effects)
+    widths = []
+    for line in lines:
+        left, right = ink_extent(font, line)
+        widths.append((right - left, left))
+    block_width = max([width for width, _ in widths] or [0])
+    size = (block_width + 2 * padding, max(1, len(lines) * line_height) + 2 * padding)
+
+    coverage = Image.new('L', size, 0)
+    draw = ImageDraw.Draw(coverage)
+    for i, line in enumerate(lines):
+        # Center each line within the block
+        text_width, left = widths[i]
+        line_x = padding + (block_width - text_width) // 2 - left
+        line_y = padding + i * line_height
+        draw.text((line_x, line_y), line, font=font, fill=255)
+
+    return TextLayer(apply_effects(coverage, fill_color, effects), padding)
+
+
+def composite_at(base, layer, dest, blend='pillow'):
+    """Alpha-composite an RGBA layer onto a copy of base with its corner at dest.
+
+    Only the region under the layer is touched, and parts of the layer
+    hanging off the image are clipped.
+
+    :param base: RGB or RGBA image.
+    :param layer: RGBA image.
+    :param dest: (x, y) of the layer's top-left corner, may be negative.
+    :param blend: 'pillow' (Image.alpha_composite) or 'numpy'.
+    """
+    if blend not in BLEND_MODES:
+        raise ValueError(f'Unknown blend mode: {blend}')
+
+    # Clip the layer to the base image
+    x, y = dest
+    left, top = max(0, x), max(0, y)
+    right = min(base.size[0], x + layer.size[0])
+    bottom = min(base.size[1], y + layer.size[1])
+    result = base.copy()
+    if right <= left or bottom <= top:
+        return result
+    box = (left, top, right, bottom)
+    layer = layer.crop((left - x, top - y, right - x, bottom - y))
+
+    region = result.crop(box)
+    if blend == 'numpy':
+        blended = _blend_numpy(region, layer)
+    else:
+        blended = Image.alpha_composite(region.convert('RGBA'), layer)
+    result.paste(blended.convert(result.mode), box)
+    return result
+
+
+def _blend_numpy(region, layer):
+    # Straight alpha "over" blend: out = base * (1 - a) + layer * a
+    base = numpy.asarray(region.convert('RGBA'), dtype=numpy.float32)
+    top = numpy.asarray(layer, dtype=numpy.float32)
+    alpha = top[..., 3:4] / 255.0
+    out_alpha = alpha + base[..., 3:4] / 255.0 * (1.0 - alpha)
+    rgb = top[..., :3] * alpha + base[..., :3] * (base[..., 3:4] / 255.0) * (1.0 - alpha)
+    rgb = numpy.divide(rgb, out_alpha, out=numpy.zeros_like(rgb), where=out_alpha > 0)
+    out = numpy.concatenate([rgb, out_alpha * 255.0], axis=-1)
+    return Image.fromarray(numpy.clip(out + 0.5, 0, 255).astype(numpy.uint8), 'RGBA')
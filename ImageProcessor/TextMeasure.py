@@ -0,0 +1,119 @@
+# Fast text measurement from per-font glyph advance tables
+#
+# Measuring a string with textbbox lays it out glyph by glyph in FreeType
+# every time. Wrapping, auto-fit and centering measure the same words over
+# and over, so instead each font keeps a table of glyph advances (and ink
+# overhangs), filled in once per character, and a string's width is a sum
+# of table lookups plus any kerning between neighbouring pairs.
+import unicodedata
+from functools import lru_cache
+
+# Pairs that carry kerning in almost every Latin font that has any
+KERNING_PROBES = ('AV', 'AW', 'AY', 'LT', 'LY', 'P.', 'T,', 'T.', 'Ta', 'To', 'Ty', 'VA',
+                  'Va', 'WA', 'Wa', 'Yo', 'av', 'ov', 'r.', 'y.')
+
+# Unicode categories that need shaping (combining marks, joiners, format characters)
+SHAPED_CATEGORIES = ('Mn', 'Mc', 'Me', 'Cf')
+
+
+def needs_shaping(char) -> bool:
+    """True for characters a sum of advances can't measure (marks, RTL, joiners)."""
+    return (unicodedata.category(char) in SHAPED_CATEGORIES
+            or unicodedata.bidirectional(char) in ('R', 'AL', 'AN'))
+
+
+class GlyphTable(dict):
+    """Per-character table that measures a character the first time it's looked up."""
+
+    def __init__(self, measure) -> None:
+        super().__init__()
+        self.measure = measure
+
+    def __missing__(self, char):
+        value = self[char] = self.measure(char)
+        return value
+
+
+class FontMetrics:
+    """Glyph advance tables for one font object.
+
+    Each character is measured once, the first time it's needed: its
+    advance (for widths) and its ink overhangs (for centering). Strings
+    with characters that need shaping (combining marks, Arabic, Hebrew...)
+    are measured with font.getlength/getbbox instead.
+
+    Kerning is probed once: if none of the usual Latin pairs kern, pairs
+    are never looked at; otherwise each new pair is measured once and cached.
+    """
+
+    def __init__(self, font) -> None:
+        self.font = font
+        self.advances = GlyphTable(self._advance)
+        self.overhangs = GlyphTable(self._overhang)
+        self.kerning = GlyphTable(self._pair_kerning)
+        self.fallbacks = 0
+        self.has_kerning = any(self.kerning[pair] for pair in KERNING_PROBES)
+
+    def _advance(self, char):
+        return None if needs_shaping(char) else self.font.getlength(char)
+
+    def _overhang(self, char):
+        # (ink left of the origin, ink right of the advance) - bbox[0] and bbox[2] - advance
+        if needs_shaping(char):
+            return None
+        if char.isspace() or not char.isprintable():
+            return 0, 0.0
+        bbox = self.font.getbbox(char)
+        if bbox[2] <= bbox[0]:
+            return 0, 0.0
+        return bbox[0], bbox[2] - self.advances[char]
+
+    def _pair_kerning(self, pair):
+        return self.font.getlength(pair) - self.advances[pair[0]] - self.advances[pair[1]]
+
+    def width(self, text) -> float:
+        """Advance width of text in pixels (what font.getlength returns)."""
+        advances = self.advances
+        try:
+            width = sum(advances[char] for char in text)
+        except TypeError:
+            # A character that needs shaping has no advance of its own
+            self.fallbacks += 1
+            return self.font.getlength(text)
+        if self.has_kerning and len(text) > 1:
+            kerning = self.kerning
+            width += sum(kerning[text[i:i + 2]] for i in range(len(text) - 1))
+        return width
+
+    def ink_extent(self, text):
+        """Horizontal ink extent (left, right) of text, like font.getbbox's x values."""
+        if not text:
+            return 0, 0
+        first, last = self.overhangs[text[0]], self.overhangs[text[-1]]
+        if first is None or last is None or text[0].isspace() or text[-1].isspace():
+            # Shaped text, or edge whitespace getbbox doesn't count as ink
+            self.fallbacks += 1
+            bbox = self.font.getbbox(text)
+            return bbox[0], bbox[2]
+        width = self.width(text)
+        return first[0], int(round(width + last[1]))
+
+    def __repr__(self) -> str:
+        return (f'FontMetrics(glyphs={len(self.advances)}, kerning={self.has_kerning}, '
+                f'fallbacks={self.fallbacks})')
+
+
+@lru_cache(maxsize=128)
+def font_metrics(font) -> FontMetrics:
+    """Metrics for a font object, built once (load_font caches the fonts)."""
+    return FontMetrics(font)
+
+
+def text_width(font, text) -> float:
+    """Advance width of text in pixels."""
+    return font_metrics(font).width(text)
+
+
+def ink_extent(font, text):
+    """Horizontal ink extent (left, right) of text in pixels."""
+    return font_metrics(font).ink_extent(text)
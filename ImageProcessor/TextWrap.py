@@ -0,0 +1,98 @@
+# Line breaking by measured pixel width
+from .TextMeasure import text_width
+
+WRAP_MODES = ('greedy', 'balanced')
+
+
+def greedy_breaks(widths, space, max_width) -> list:
+    """Line breaks that fill each line as far as it goes.
+
+    :param widths: pixel width of each word.
+    :param space: pixel width of the space between words.
+    :return: index of the first word of every line after the first.
+    """
+    breaks = []
+    line_width = None
+    for i, width in enumerate(widths):
+        if line_width is not None and line_width + space + width > max_width:
+            breaks.append(i)
+            line_width = None
+        line_width = width if line_width is None else line_width + space + width
+    return breaks
+
+
+def balanced_breaks(widths, space, max_width) -> list:
+    """Minimum-raggedness line breaks (Knuth-Plass without hyphenation).
+
+    Minimizes the sum of squared leftover space over every line but the
+    last. Only lines that fit are considered, so each word looks back at
+    most as many words as fit on one line: O(n) for a given box width.
+    A word wider than max_width sits on a line of its own.
+
+    :return: index of the first word of every line after the first.
+    """
+    count = len(widths)
+    prefix = [0.0]
+    for width in widths:
+        prefix.append(prefix[-1] + width)
+
+    def line_width(i, j):
+        # Words i..j-1 on one line
+        return prefix[j] - prefix[i] + space * (j - i - 1)
+
+    cost = [0.0] + [float('inf')] * count
+    start = [0] * (count + 1)
+    for j in range(1, count + 1):
+        i = j - 1
+        while i >= 0:
+            width = line_width(i, j)
+            if width > max_width and i < j - 1:
+                break
+            slack = 0.0 if j == count else max(0.0, max_width - width)
+            total = cost[i] + slack * slack
+            if total < cost[j]:
+                cost[j], start[j] = total, i
+            i -= 1
+
+    breaks = []
+    j = count
+    while j > 0:
+        j = start[j]
+        if j > 0:
+            breaks.append(j)
+    return breaks[::-1]
+
+
+def wrap_paragraph(font, text, max_width, mode='balanced') -> list:
+    """Wrap one paragraph into lines no wider than max_width pixels."""
+    if mode not in WRAP_MODES:
+        raise ValueError(f'Unknown wrap mode: {mode}')
+    words = text.split()
+    if not words:
+        return []
+    widths = [text_width(font, word) for word in words]
+    space = text_width(font, ' ')
+    find_breaks = balanced_breaks if mode == 'balanced' else greedy_breaks
+    bounds = [0] + find_breaks(widths, space, max_width) + [len(words)]
+    return [' '.join(words[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+
+def wrap_text(font, text, max_width, mode='balanced') -> list:
+    """Wrap text by pixel width, keeping its line breaks as paragraph breaks.
+
+    :param font: PIL font the text will be drawn with.
+    :param max_width: widest a line may be, in pixels.
+    :param mode: 'greedy' (fill each line) or 'balanced' (even line lengths).
+    """
+    lines = []
+    for paragraph in text.splitlines():
+        lines.extend(wrap_paragraph(font, paragraph, max_width, mode))
+    return lines
+
+
+def wrap_caption(font, text, author, max_width, mode='balanced') -> list:
+    """Wrap a quote and add its "- author" line (wrapped too if it's long)."""
+    lines = wrap_text(font, text, max_width, mode)
+    if author and author.strip():
+        lines.extend(wrap_paragraph(font, f'- {author.strip()}', max_width, mode))
+    return lines
@@ -0,0 +1,67 @@
+# Downscaled copies of remote images for the editors' canvases
+import io
+
+from PIL import Image
+
+from .ImageEncoder import encode_image
+from .ImageLoader import load_image
+from .SceneRenderer import LRUCache
+
+# Largest width/height a client may ask for
+MAX_DIMENSION = 4096
+
+# Encoded bytes the cache may hold: a 4096px thumbnail can run to megabytes
+CACHE_BYTES = 64 * 1024 * 1024
+
+
+def bounded_size(size, max_width=None, max_height=None):
+    """Largest size within max_width x max_height that keeps the aspect ratio.
+
+    Never enlarges: a source already inside the box keeps its size.
+    """
+    width, height = size
+    scale = 1.0
+    if max_width:
+        scale = min(scale, max_width / width)
+    if max_height:
+        scale = min(scale, max_height / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+class Thumbnails:
+    """Downscaled, re-encoded images cached by (url, max width, max height, format).
+
+    Sources are decoded with open_image's draft mode, so a large JPEG headed
+    for a 600px canvas is decoded at 1/2 to 1/8 scale before the final resize.
+
+    :param cache_size: derived images to keep.
+    :param cache_bytes: encoded bytes to keep over all of them.
+    :param quality_preset: encoder preset (see ImageEncoder.PRESETS).
+    """
+
+    def __init__(self, cache_size=256, quality_preset='balanced', resample='lanczos',
+                 cache_bytes=CACHE_BYTES) -> None:
+        self.cache = LRUCache(cache_size, cache_bytes)
+        self.quality_preset = quality_preset
+        self.resample = resample
+
+    def get(self, url, max_width, max_height, output_format):
+        """Cached derived image for these parameters, or None."""
+        return self.cache.get((url, max_width, max_height, output_format))
+
+    def make(self, url, data, max_width, max_height, output_format):
+        """Downscale and encode data, cache it and return the EncodedImage.
+
+        Returns None for animated sources, which are passed through as they are.
+        """
+        with Image.open(io.BytesIO(data)) as probe:
+            if getattr(probe, 'is_animated', False):
+                return None
+            width, _ = bounded_size(probe.size, max_width, max_height)
+
+        img = load_image(io.BytesIO(data), width, self.resample)
+        # JPEG can't keep transparency, PNG can
+        encoded_format = 'png' if output_format == 'jpeg' and img.mode == 'RGBA' else output_format
+        encoded = encode_image(img, encoded_format, self.quality_preset)
+        self.cache.put((url, max_width, max_height, output_format), encoded)
+        return encoded
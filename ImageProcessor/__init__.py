@@ -1,2 +1,11 @@
 """Export ImageProcessor."""
 from .ImageProcessor import ImageProcessor
+from .ImageLoader import load_image, open_image, RESAMPLERS
+from .ImageEncoder import encode_image, encode_animation, negotiate_format, EncodedImage, PRESETS
+from .Animation import Animation, is_animated
+from .Fonts import load_font
+from .TextLayer import TextLayer, TextLayerCache, composite_at, render_text_block
+from .SceneRenderer import SceneRenderer, SceneError
+from .PreviewRenderer import PreviewRenderer, LatestOnly
+from .RandomPool import RandomPool
+from .Placement import PlacementMap, Placement, AUTO_COLOR
@@ -0,0 +1,271 @@
+# Counters, gauges and histograms exposed in the Prometheus text format
+#
+# Every thread writes to its own shard (a plain dict), so recording a value
+# takes no lock - only the thread's first write registers its shard. A
+# scrape adds the shards up. Shards of threads that have exited are folded
+# into one retired shard, so a thread-per-request server doesn't grow the
+# shard list forever.
+import bisect
+import math
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+# Histogram buckets in seconds, from sub-millisecond stages to slow fetches
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                   2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Shard:
+    """Values written by one thread: {(metric name, labels): number or bucket list}."""
+
+    def __init__(self, thread) -> None:
+        self.thread = weakref.ref(thread)
+        self.values = {}
+
+    def alive(self) -> bool:
+        thread = self.thread()
+        return thread is not None and thread.is_alive()
+
+
+class Registry:
+    """A set of metrics and the per-thread shards holding their values."""
+
+    def __init__(self) -> None:
+        self._metrics = {}
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            pass
+        shard = _Shard(threading.current_thread())
+        with self._lock:
+            self._retire()
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _retire(self):
+        # Fold shards of finished threads into one (they can't be written anymore)
+        live = []
+        for shard in self._shards:
+            if shard.alive():
+                live.append(shard)
+            else:
+                _merge(self._retired, shard.values)
+        self._shards = live
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f'Metric {metric.name} already registered as {existing.kind}')
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help=''):
+        return self._register(Counter(self, name, help))
+
+    def gauge(self, name, help=''):
+        return self._register(Gauge(self, name, help))
+
+    def histogram(self, name, help='', buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, help, buckets))
+
+    def gauge_function(self, name, help, read):
+        """Gauge whose value is read at scrape time.
+
+        :param read: callable returning a number, or a dict of {labels tuple: number}.
+        """
+        return self._register(FunctionMetric(self, name, help, read, 'gauge'))
+
+    def counter_function(self, name, help, read):
+        """Counter kept elsewhere (e.g. a cache's hit count), read at scrape time."""
+        return self._register(FunctionMetric(self, name, help, read, 'counter'))
+
+    def collect(self):
+        """Sum of all shards: {(name, labels): number or bucket list}."""
+        with self._lock:
+            self._retire()
+            totals = {}
+            _merge(totals, self._retired)
+            for shard in self._shards:
+                # dict.copy and list slices don't run Python code, so the owner
+                # can't change a value midway; histogram bucket lists are copied
+                # before they're summed, since the owner keeps adding to them
+                values = {key: value[:] if isinstance(value, list) else value
+                          for key, value in shard.values.copy().items()}
+                _merge(totals, values)
+        return totals
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        totals = self.collect()
+        samples = {}
+        for (name, labels), value in totals.items():
+            samples.setdefault(name, []).append((labels, value))
+
+        out = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            out.append(f'# HELP {name} {_escape_help(metric.help)}')
+            out.append(f'# TYPE {name} {metric.kind}')
+            out.extend(metric.lines(sorted(samples.get(name, []))))
+        return '\n'.join(out) + '\n'
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, registry, name, help) -> None:
+        self.registry = registry
+        self.name = name
+        self.help = help
+
+    def _add(self, labels, amount):
+        values = self.registry._shard().values
+        key = (self.name, _label_key(labels))
+        values[key] = values.get(key, 0) + amount
+
+    def lines(self, samples):
+        return [f'{self.name}{_format_labels(labels)} {_format_value(value)}'
+                for labels, value in samples]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        self._add(labels, amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, e.g. requests in flight."""
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        self._add(labels, amount)
+
+    def dec(self, amount=1, **labels):
+        self._add(labels, -amount)
+
+    @contextmanager
+    def track(self, **labels):
+        """Count the block as in progress while it runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class FunctionMetric(_Metric):
+    """Gauge or counter computed by a callback when metrics are rendered."""
+
+    def __init__(self, registry, name, help, read, kind='gauge') -> None:
+        super().__init__(registry, name, help)
+        self.read = read
+        self.kind = kind
+
+    def lines(self, samples):
+        value = self.read()
+        if not isinstance(value, dict):
+            value = {(): value}
+        samples = [(_label_key(labels), number) for labels, number in value.items()]
+        return super().lines(sorted(samples))
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (durations in seconds by default)."""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, help, buckets=DEFAULT_BUCKETS) -> None:
+        super().__init__(registry, name, help)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        values = self.registry._shard().values
+        key = (self.name, _label_key(labels))
+        counts = values.get(key)
+        if counts is None:
+            # Per-bucket counts (last one is +Inf), then sum and count
+            counts = values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-2] += value
+        counts[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def lines(self, samples):
+        out = []
+        for labels, counts in samples:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = labels + (('le', '+Inf' if bound == math.inf else _format_value(bound)),)
+                out.append(f'{self.name}_bucket{_format_labels(le)} {cumulative}')
+            out.append(f'{self.name}_sum{_format_labels(labels)} {_format_value(counts[-2])}')
+            out.append(f'{self.name}_count{_format_labels(labels)} {counts[-1]}')
+        return out
+
+
+def _merge(totals, values):
+    for key, value in values.items():
+        if isinstance(value, list):
+            current = totals.get(key)
+            totals[key] = list(value) if current is None else [a + b for a, b in zip(current, value)]
+        else:
+            totals[key] = totals.get(key, 0) + value
+
+
+def _label_key(labels):
+    if isinstance(labels, tuple):
+        return labels
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels)
+    return '{' + pairs + '}'
+
+
+def _escape_label(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _escape_help(text):
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if math.isnan(value):
+            return 'NaN'
+        return repr(value)
+    return str(value)
+
+
+# Process-wide registry used by the app
+REGISTRY = Registry()
@@ -0,0 +1,175 @@
+# Opt-in profiling of requests and CLI runs, written out for flame graphs
+#
+# 'sampling' mode runs a thread that snapshots the profiled thread's stack
+# every few milliseconds and writes collapsed stacks ("a;b;c 12" per line),
+# the input format of flamegraph.pl, speedscope and inferno. It only costs
+# anything while a profile is running. 'cprofile' mode runs cProfile instead
+# and writes a pstats file (exact call counts, no stacks).
+import cProfile
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+
+PROFILE_MODES = ('sampling', 'cprofile')
+
+# Sampling interval in seconds
+DEFAULT_INTERVAL = 0.005
+
+# Profiles kept in the output directory, the oldest are deleted beyond this
+DEFAULT_MAX_FILES = 200
+
+
+def frame_name(frame) -> str:
+    """Flame graph label of a frame: file:function."""
+    code = frame.f_code
+    return f'{os.path.basename(code.co_filename)}:{code.co_name}'
+
+
+def collapse_stack(frame) -> str:
+    """Collapsed stack of frame, outermost call first, separated by ';'."""
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class StackSampler:
+    """Samples one thread's stack at a fixed interval from a background thread."""
+
+    def __init__(self, thread_id, interval=DEFAULT_INTERVAL) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in self.stacks.most_common())
+
+
+class Profile:
+    """A profile in progress, started and stopped on the thread it profiles."""
+
+    def __init__(self, name, mode='sampling', interval=DEFAULT_INTERVAL) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f'Unknown profile mode: {mode}')
+        self.name = name
+        self.mode = mode
+        self.interval = interval
+        self.started = None
+        self.duration = None
+        self.path = None
+        self._sampler = None
+        self._profile = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.mode == 'sampling':
+            self._sampler = StackSampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def stop(self):
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profile.disable()
+        self.duration = time.perf_counter() - self.started
+        return self
+
+    def write(self, path_prefix) -> str:
+        """Write the profile next to path_prefix and return the file path."""
+        if self.mode == 'sampling':
+            path = path_prefix + '.folded'
+            with open(path, 'w') as f:
+                f.write(self._sampler.collapsed())
+        else:
+            path = path_prefix + '.prof'
+            self._profile.dump_stats(path)
+        return path
+
+
+class Profiler:
+    """Starts profiles on demand or for a random sample, and stores them.
+
+    :param output_dir: where profile files go (created on first write).
+    :param mode: 'sampling' (collapsed stacks) or 'cprofile' (pstats).
+    :param sample_rate: share of requests profiled without being asked, 0 to 1.
+    :param interval: sampling interval in seconds.
+    :param max_files: profiles kept, older ones are deleted.
+    """
+
+    def __init__(self, output_dir='./profiles', mode='sampling', sample_rate=0.0,
+                 interval=DEFAULT_INTERVAL, max_files=DEFAULT_MAX_FILES) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f'Unknown profile mode: {mode}')
+        self.output_dir = output_dir
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def sampled(self) -> bool:
+        """Whether this call falls into the random sample."""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self, name) -> Profile:
+        return Profile(name, self.mode, self.interval).start()
+
+    def finish(self, profile) -> str:
+        """Stop a profile, write it to output_dir and return the file path."""
+        profile.stop()
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', profile.name).strip('_') or 'profile'
+        prefix = os.path.join(self.output_dir, f'{time.strftime("%Y%m%d-%H%M%S")}-'
+                                               f'{safe_name}-{uuid.uuid4().hex[:8]}')
+        profile.path = profile.write(prefix)
+        self._prune()
+        return profile.path
+
+    @contextmanager
+    def profile(self, name):
+        """Profile the block; the yielded Profile's path is set once it's written."""
+        profile = self.start(name)
+        try:
+            yield profile
+        finally:
+            self.finish(profile)
+
+    def _prune(self):
+        # Keep the newest max_files profiles
+        with self._lock:
+            try:
+                names = [name for name in os.listdir(self.output_dir)
+                         if name.endswith(('.folded', '.prof'))]
+            except OSError:
+                return
+            for name in sorted(names)[:-self.max_files or None]:
+                try:
+                    os.remove(os.path.join(self.output_dir, name))
+                except OSError:
+                    pass
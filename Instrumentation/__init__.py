@@ -0,0 +1,3 @@
+"""Export Instrumentation."""
+from .Metrics import REGISTRY, Registry, Counter, Gauge, Histogram, CONTENT_TYPE
+from .Profiler import Profiler, Profile, StackSampler
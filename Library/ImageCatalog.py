@@ -0,0 +1,229 @@
+# SQLite catalog of the library images and what they look like
+#
+# Each image gets one row: dimensions, format, content hash, mean luminance
+# and dominant color, computed from a small draft decode. update() only
+# re-indexes files whose mtime or size changed since their row was written,
+# on a thread pool (Pillow releases the GIL while decoding), and drops rows
+# of files that are gone. Queries filter on indexed columns, so choosing
+# "a dark landscape" doesn't open a single image.
+import hashlib
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from PIL import Image, ImageStat
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    aspect REAL NOT NULL,
+    format TEXT,
+    sha1 TEXT NOT NULL,
+    luminance REAL NOT NULL,
+    red INTEGER NOT NULL,
+    green INTEGER NOT NULL,
+    blue INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_aspect ON images (aspect);
+CREATE INDEX IF NOT EXISTS images_luminance ON images (luminance);
+CREATE INDEX IF NOT EXISTS images_sha1 ON images (sha1);
+"""
+
+# Aspect ratio (width / height) bounds of each orientation
+ORIENTATIONS = {'landscape': (1.05, None), 'portrait': (None, 0.95), 'square': (0.95, 1.05)}
+
+# Mean luminance (0-1) bounds of each tone
+TONES = {'dark': (None, 0.35), 'medium': (0.35, 0.65), 'light': (0.65, None)}
+
+# Side of the thumbnail luminance and colors are measured on
+SAMPLE_SIZE = 64
+
+COLUMNS = ('path', 'width', 'height', 'aspect', 'format', 'sha1', 'luminance',
+           'red', 'green', 'blue')
+
+
+def describe_image(path) -> dict:
+    """Dimensions, format, hash, mean luminance and dominant color of one image file."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    stat = os.stat(path)
+    with Image.open(path) as img:
+        width, height = img.size
+        image_format = img.format
+        # JPEGs decode straight at 1/2-1/8 scale, close to the sample size
+        img.draft('RGB', (SAMPLE_SIZE, SAMPLE_SIZE))
+        sample = img.convert('RGB')
+    sample.thumbnail((SAMPLE_SIZE, SAMPLE_SIZE))
+
+    luminance = ImageStat.Stat(sample.convert('L')).mean[0] / 255
+    # Most common color of an 8-color median cut
+    quantized = sample.quantize(colors=8, method=Image.Quantize.MEDIANCUT)
+    _, index = max(quantized.getcolors())
+    red, green, blue = quantized.getpalette()[index * 3:index * 3 + 3]
+    return {'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+            'width': width, 'height': height, 'aspect': width / height,
+            'format': image_format, 'sha1': hashlib.sha1(data).hexdigest(),
+            'luminance': luminance, 'red': red, 'green': green, 'blue': blue,
+            'indexed_at': time.time()}
+
+
+def parse_color(value):
+    """(r, g, b) of '#rrggbb' or 'rrggbb'.
+
+    :raises ValueError: for anything else.
+    """
+    text = value.lstrip('#')
+    if len(text) != 6:
+        raise ValueError(f'Invalid color {value!r}, expected #rrggbb')
+    return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _row_dict(row) -> dict:
+    entry = dict(zip(COLUMNS, row))
+    entry['luminance'] = round(entry['luminance'], 3)
+    entry['dominant_color'] = '#{:02x}{:02x}{:02x}'.format(
+        entry.pop('red'), entry.pop('green'), entry.pop('blue'))
+    aspect = entry.pop('aspect')
+    entry['orientation'] = next(name for name, (low, high) in ORIENTATIONS.items()
+                                if (low is None or aspect >= low)
+                                and (high is None or aspect < high))
+    return entry
+
+
+class ImageCatalog:
+    """Image metadata in SQLite, kept in step with a list of files.
+
+    :param db_path: database file (created if missing).
+    :param workers: indexing threads (default: one per CPU).
+    """
+
+    def __init__(self, db_path, workers=None) -> None:
+        self.db_path = db_path
+        self.workers = workers or os.cpu_count() or 1
+        self.indexed = 0
+        self.failures = 0
+        with self._connect() as db:
+            if db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                # Derived data only, rebuilding it is cheaper than migrating it
+                db.execute('DROP TABLE IF EXISTS images')
+            db.executescript(SCHEMA)
+            db.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.count = self._count()
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call: cheap for SQLite, and safe from any thread.
+        # Commits on success, rolls back on error, and always closes it
+        # (sqlite3's own context manager leaves the connection open)
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            db.execute('PRAGMA journal_mode = WAL')
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def _count(self) -> int:
+        with self._connect() as db:
+            return db.execute('SELECT COUNT(*) FROM images').fetchone()[0]
+
+    def update(self, paths) -> tuple:
+        """Index new and changed files among paths and forget files not in it.
+
+        :return: (files indexed, rows removed).
+        """
+        with self._connect() as db:
+            known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                     db.execute('SELECT path, mtime_ns, size FROM images')}
+        stale = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) != (stat.st_mtime_ns, stat.st_size):
+                stale.append(path)
+        removed = set(known) - set(paths)
+
+        rows = []
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(stale))) as pool:
+                for path, result in zip(stale, pool.map(self._describe, stale)):
+                    if result is not None:
+                        rows.append(result)
+
+        if rows or removed:
+            with self._connect() as db:
+                db.executemany('DELETE FROM images WHERE path = ?', [(p,) for p in removed])
+                db.executemany(
+                    'INSERT OR REPLACE INTO images (path, mtime_ns, size, width, height, aspect,'
+                    ' format, sha1, luminance, red, green, blue, indexed_at) VALUES'
+                    ' (:path, :mtime_ns, :size, :width, :height, :aspect, :format, :sha1,'
+                    ' :luminance, :red, :green, :blue, :indexed_at)', rows)
+            self.count = self._count()
+        self.indexed += len(rows)
+        return len(rows), len(removed)
+
+    def _describe(self, path):
+        try:
+            return describe_image(path)
+        except Exception as e:
+            self.failures += 1
+            print(f"Warning: Could not index {path}: {e}")
+            return None
+
+    def query(self, orientation=None, tone=None, color=None, color_distance=80,
+              min_width=None, min_height=None, limit=None, random_order=False) -> list:
+        """Images matching every given filter.
+
+        :param orientation: 'landscape', 'portrait' or 'square'.
+        :param tone: 'dark', 'medium' or 'light' (mean luminance).
+        :param color: '#rrggbb'; dominant color within color_distance (RGB distance).
+        :param limit: at most this many rows.
+        :param random_order: shuffle instead of sorting by path.
+        :raises ValueError: for an unknown orientation or tone, or a bad color.
+        """
+        where, args = [], []
+        for value, choices, column in ((orientation, ORIENTATIONS, 'aspect'),
+                                       (tone, TONES, 'luminance')):
+            if value is None:
+                continue
+            if value not in choices:
+                raise ValueError(f"Unknown value {value!r}, expected one of {', '.join(choices)}")
+            low, high = choices[value]
+            if low is not None:
+                where.append(f'{column} >= ?')
+                args.append(low)
+            if high is not None:
+                where.append(f'{column} < ?')
+                args.append(high)
+        if color is not None:
+            red, green, blue = parse_color(color)
+            where.append('(red - ?) * (red - ?) + (green - ?) * (green - ?)'
+                         ' + (blue - ?) * (blue - ?) <= ?')
+            args.extend([red, red, green, green, blue, blue, color_distance ** 2])
+        if min_width:
+            where.append('width >= ?')
+            args.append(int(min_width))
+        if min_height:
+            where.append('height >= ?')
+            args.append(int(min_height))
+
+        sql = f"SELECT {', '.join(COLUMNS)} FROM images"
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY RANDOM()' if random_order else ' ORDER BY path'
+        if limit:
+            sql += ' LIMIT ?'
+            args.append(int(limit))
+        with self._connect() as db:
+            return [_row_dict(row) for row in db.execute(sql, args)]
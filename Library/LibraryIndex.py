@@ -0,0 +1,115 @@
+# Quotes and library images, reloaded while the app runs
+#
+# refresh() compares the stats of the files under the quote and image
+# directories with the previous scan and re-parses only quote files that
+# were added or changed. The result is published as a new LibrarySnapshot
+# by replacing one attribute, so a request that took the snapshot keeps a
+# consistent pair of lists however many refreshes happen meanwhile.
+import os
+import threading
+import time
+
+from TextParser import Parser
+
+from .Watcher import DirectoryWatcher
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+
+class LibrarySnapshot:
+    """Quotes and image paths at one point in time; never modified once published."""
+
+    def __init__(self, quotes=(), images=(), version=0) -> None:
+        self.quotes = tuple(quotes)
+        self.images = tuple(images)
+        self.version = version
+        self.loaded_at = time.time()
+
+    def __repr__(self) -> str:
+        return (f'LibrarySnapshot(version={self.version}, quotes={len(self.quotes)}, '
+                f'images={len(self.images)})')
+
+
+def _walk_files(directories):
+    # (path, stat) of the files under directories, sorted by path
+    found = []
+    for root in directories:
+        for directory, subdirectories, names in os.walk(root):
+            subdirectories.sort()
+            for name in sorted(names):
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue  # deleted while we looked
+                found.append((path, stat))
+    return found
+
+
+class LibraryIndex:
+    """Keeps a snapshot of the quote corpus and the image library up to date.
+
+    :param quote_dirs: directories of quote files (any format Parser takes).
+    :param image_dirs: directories of images, searched recursively.
+    :param on_change: optional callable run with the new snapshot after each change.
+    """
+
+    def __init__(self, quote_dirs, image_dirs, on_change=None) -> None:
+        self.quote_dirs = list(quote_dirs)
+        self.image_dirs = list(image_dirs)
+        self.on_change = on_change
+        self.snapshot = LibrarySnapshot()
+        self.reloads = 0
+        self.parsed_files = 0
+        self._quote_files = {}  # path -> ((mtime_ns, size), quotes)
+        self._lock = threading.Lock()
+        self._watcher = None
+
+    def refresh(self) -> bool:
+        """Rescan the directories and publish a new snapshot if anything changed."""
+        with self._lock:
+            quote_files = {}
+            changed = False
+            for path, stat in _walk_files(self.quote_dirs):
+                if not any(parser.can_ingest(path) for parser in Parser.parsers):
+                    continue
+                key = (stat.st_mtime_ns, stat.st_size)
+                previous = self._quote_files.get(path)
+                if previous is not None and previous[0] == key:
+                    quote_files[path] = previous
+                    continue
+                quote_files[path] = (key, Parser.parse(path))
+                self.parsed_files += 1
+                changed = True
+            changed = changed or quote_files.keys() != self._quote_files.keys()
+
+            images = tuple(path for path, _ in _walk_files(self.image_dirs)
+                           if path.lower().endswith(IMAGE_EXTENSIONS))
+            changed = changed or images != self.snapshot.images
+            if not changed:
+                return False
+
+            self._quote_files = quote_files
+            quotes = [quote for _, parsed in quote_files.values() for quote in parsed]
+            snapshot = LibrarySnapshot(quotes, images, self.snapshot.version + 1)
+            self.snapshot = snapshot
+            self.reloads += 1
+
+        if self.on_change is not None:
+            self.on_change(snapshot)
+        return True
+
+    def watch(self, poll_interval=5.0, use_inotify=True):
+        """Refresh on changes from now on (see Watcher.DirectoryWatcher)."""
+        if self._watcher is None:
+            directories = [d for d in self.quote_dirs + self.image_dirs if os.path.isdir(d)]
+            self._watcher = DirectoryWatcher(directories, self.refresh, poll_interval,
+                                             use_inotify=use_inotify).start()
+        return self._watcher
+
+    def stop(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
@@ -0,0 +1,172 @@
+# Notices changes under a set of directories
+#
+# On Linux the watcher uses inotify (through ctypes, no extra package) and
+# calls back once a burst of events has settled, e.g. after a file has been
+# copied in. Elsewhere, or when inotify can't be set up (no libc, watch
+# limit reached), it polls instead and calls back every poll interval. The
+# callback is expected to work out what changed itself, by comparing file
+# stats, so it doesn't matter which events were seen or whether some were
+# lost.
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+
+class Inotify:
+    """Minimal inotify instance: add watches, wait for events, close.
+
+    :raises OSError: when inotify isn't available.
+    """
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify needs Linux')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def add_watch(self, path):
+        # Watching a path that's already watched just returns its descriptor
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+        return wd
+
+    def drain(self) -> bool:
+        """Read all pending events; True if there were any."""
+        seen = False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return seen
+            except BlockingIOError:
+                return seen
+            seen = True
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class DirectoryWatcher:
+    """Calls on_change() when something under directories changes.
+
+    :param directories: directories to watch, with their subdirectories.
+    :param on_change: callable run on the watcher thread.
+    :param poll_interval: seconds between calls when polling.
+    :param debounce: seconds without events before on_change runs (inotify).
+    :param use_inotify: False to always poll.
+    """
+
+    def __init__(self, directories, on_change, poll_interval=5.0, debounce=0.5,
+                 use_inotify=True) -> None:
+        self.directories = list(directories)
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.mode = None  # 'inotify' or 'poll' once started
+        self._running = False
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _reset(self):
+        self._thread = None
+        self._inotify = None
+        self._wake_r = self._wake_w = None
+
+    def start(self):
+        """Start watching on a daemon thread."""
+        if self._thread is not None:
+            return self
+        self.mode = 'poll'
+        if self.use_inotify:
+            try:
+                self._inotify = Inotify()
+                self._watch_tree()
+                self.mode = 'inotify'
+            except OSError as e:
+                print(f"Warning: inotify unavailable, polling every {self.poll_interval}s: {e}")
+                if self._inotify is not None:
+                    self._inotify.close()
+                    self._inotify = None
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='library-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            os.write(self._wake_w, b'x')
+            self._thread.join()
+        self._close()
+        self._reset()
+
+    def _close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+
+    def _after_fork(self):
+        # The thread didn't survive the fork, and the inherited inotify
+        # descriptor shares its event queue with the parent's
+        running = self._running
+        self._close()
+        self._reset()
+        if running:
+            self.start()
+
+    def _watch_tree(self):
+        for root in self.directories:
+            for directory, _, _ in os.walk(root):
+                self._inotify.add_watch(directory)
+
+    def _wait(self, timeout) -> bool:
+        # True when inotify has events, False on timeout; stop() wakes it too
+        fds = [self._wake_r] + ([self._inotify.fd] if self._inotify is not None else [])
+        readable, _, _ = select.select(fds, [], [], timeout)
+        return self._inotify is not None and self._inotify.fd in readable
+
+    def _run(self):
+        while self._running:
+            if self.mode == 'poll':
+                self._wait(self.poll_interval)
+            else:
+                if not self._wait(None):
+                    continue
+                # Let the burst settle (a file being copied in fires many events)
+                while self._running and self._inotify.drain() and self._wait(self.debounce):
+                    pass
+            if not self._running:
+                break
+            try:
+                self.on_change()
+                if self._inotify is not None:
+                    self._watch_tree()  # pick up new subdirectories
+            except Exception as e:
+                print(f"Warning: Library refresh failed: {e}")
@@ -0,0 +1,4 @@
+"""Export Library."""
+from .LibraryIndex import LibraryIndex, LibrarySnapshot
+from .Watcher import DirectoryWatcher
+from .ImageCatalog import ImageCatalog
@@ -0,0 +1,362 @@
+# Generated images on disk: content-hash sharding, a byte quota and a TTL
+#
+# Files live at <root>/ab/cd/<hash>.<ext>, so no directory grows past a few
+# hundred entries and identical renders share one file. The store keeps an
+# in-memory index of size and last access (rebuilt from the files' mtimes
+# at startup) and a sweeper thread deletes what's expired or least recently
+# used once the quota is exceeded. Pinned files are never swept, and
+# neither are files this process holds (in memory only, see hold).
+#
+# With several worker processes writing into the same root (shared=True)
+# each process only indexes its own writes, so a sweep rescans the disk
+# first, accesses are recorded in the files' mtimes and pins are marker
+# files, one per pinned path, that any process can add or remove. Every
+# process runs a sweeper, but a sweep takes an exclusive lock on a state
+# file in the pins directory and is skipped when another process swept
+# within the interval; the state file also keeps the reclaimed totals, so
+# any process can report them.
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+
+try:
+    import fcntl
+except ImportError:  # Windows: shared stores sweep without coordination
+    fcntl = None
+
+# Pinned paths are marker files in this directory, next to root by default
+# (not inside it, where they would be served as static files)
+PINS_SUFFIX = '.pins'
+
+# Shared stores write an access to the file's mtime at most this often
+TOUCH_INTERVAL = 60
+
+# Lock and state ("<last sweep time> <files> <bytes>") of shared sweeps,
+# in the pins directory; scan() ignores it since it's no stored key
+SWEEP_STATE = '.sweep'
+
+# Relative path of a content-addressed file: ab/cd/abcd<20 more hex>.<ext>
+CONTENT_KEY = re.compile(r'^([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{20})\.[A-Za-z0-9]+$')
+
+
+class OutputStore:
+    """Writes generated images into hashed subdirectories and keeps them within limits.
+
+    :param root: directory the files go in (created if missing).
+    :param quota_bytes: total size kept, least recently used files go first. 0 = no quota.
+    :param ttl_seconds: files not accessed for this long are deleted. 0 = keep forever.
+    :param sweep_interval: seconds between background sweeps (see start).
+    :param pins_path: directory of pin markers, kept across restarts.
+    :param shared: other processes write into root as well (e.g. gunicorn
+                   workers), see the module comment.
+    """
+
+    def __init__(self, root, quota_bytes=0, ttl_seconds=0, sweep_interval=60,
+                 pins_path=None, shared=False) -> None:
+        self.root = root
+        self.pins_path = pins_path or os.path.normpath(root) + PINS_SUFFIX
+        self.shared = shared
+        self.quota_bytes = quota_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sweep_interval = sweep_interval
+        self.usage = 0
+        self.pinned_bytes = 0
+        self.reclaimed_bytes = 0
+        self.reclaimed_files = 0
+        self._entries = OrderedDict()  # relative path -> [size, last access], oldest first
+        self._pins = set()
+        self._held = set()  # exempt from this process's sweeps, never written to disk
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        os.makedirs(root, exist_ok=True)
+        os.makedirs(self.pins_path, exist_ok=True)
+        # A fork while the sweeper holds the lock would leave it locked forever
+        # in the child, and the sweeper thread itself isn't copied
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        self.scan()
+
+    def relative(self, path) -> str:
+        """Path of a stored file relative to root, with '/' separators."""
+        return os.path.relpath(path, self.root).replace(os.sep, '/')
+
+    def content_hash(self, path):
+        """Content hash a stored file is named after, None for other files under root.
+
+        The bytes behind a content-addressed name never change, so the hash
+        makes a strong ETag and the file can be cached as immutable.
+        """
+        match = CONTENT_KEY.match(self.relative(path))
+        return match.group(3) if match else None
+
+    def scan(self):
+        """Rebuild the index from the files under root (mtime stands in for last access)."""
+        found = []
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                found.append((stat.st_mtime, self.relative(path), stat.st_size))
+        try:
+            pins = {unquote(name) for name in os.listdir(self.pins_path)}
+        except OSError:
+            pins = set()
+
+        with self._lock:
+            self._entries.clear()
+            for mtime, key, size in sorted(found):
+                self._entries[key] = [size, mtime]
+            self._pins = {key for key in pins if key in self._entries}
+            self.usage = sum(size for size, _ in self._entries.values())
+            self.pinned_bytes = sum(self._entries[key][0] for key in self._pins)
+
+    def put(self, data, extension) -> str:
+        """Store data under its content hash and return the file path."""
+        digest = hashlib.sha1(data).hexdigest()[:24]
+        key = f'{digest[:2]}/{digest[2:4]}/{digest}.{extension}'
+        path = os.path.join(self.root, *key.split('/'))
+        directory = os.path.dirname(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and os.path.exists(path):
+                # Same image rendered before, just count it as accessed
+                self._accessed(key, entry, path)
+                return path
+
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = os.path.join(directory, f'.{digest}.{uuid.uuid4().hex[:8]}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            # Renamed under the lock so a sweep can't delete it between rename and indexing
+            os.replace(tmp_path, path)
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.usage -= old[0]
+            self._entries[key] = [len(data), time.time()]
+            self.usage += len(data)
+        return path
+
+    def touch(self, path):
+        """Record an access (e.g. the file was served), moving it to the back of the LRU."""
+        key = self.relative(path)
+        with self._lock:
+            entry = self._entry(key, path)
+            if entry is not None:
+                self._accessed(key, entry, path)
+
+    def _entry(self, key, path):
+        entry = self._entries.get(key)
+        if entry is None and self.shared:
+            # Written by another process since our last scan
+            try:
+                entry = self._entries[key] = [os.path.getsize(path), 0]
+            except OSError:
+                return None
+            self.usage += entry[0]
+        return entry
+
+    def _accessed(self, key, entry, path):
+        now = time.time()
+        if self.shared and now - entry[1] >= TOUCH_INTERVAL:
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        entry[1] = now
+        self._entries.move_to_end(key)
+
+    def pin(self, path) -> bool:
+        """Exempt a file from sweeping (it belongs to a user); False if it isn't stored."""
+        key = self.relative(path)
+        with self._lock:
+            if self._entry(key, path) is None:
+                return False
+            if key not in self._pins:
+                self._pins.add(key)
+                self.pinned_bytes += self._entries[key][0]
+                self._write_pin(key, True)
+        return True
+
+    def unpin(self, path):
+        key = self.relative(path)
+        with self._lock:
+            if key in self._pins:
+                self._pins.discard(key)
+                self.pinned_bytes -= self._entries[key][0]
+                self._write_pin(key, False)
+
+    def is_pinned(self, path) -> bool:
+        return self.relative(path) in self._pins
+
+    def hold(self, path) -> bool:
+        """Exempt a file from this process's sweeps until release; False if it isn't stored.
+
+        Unlike a pin nothing is written to disk, so a hold ends with the
+        process. For files only needed while it runs, e.g. renders waiting
+        in a pool. Another process sweeping a shared root doesn't see it.
+        """
+        key = self.relative(path)
+        with self._lock:
+            if self._entry(key, path) is None:
+                return False
+            self._held.add(key)
+        return True
+
+    def release(self, path):
+        with self._lock:
+            self._held.discard(self.relative(path))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def sweep(self, now=None) -> tuple:
+        """Delete expired files, then least recently used ones down to the quota.
+
+        :return: (files deleted, bytes reclaimed).
+        """
+        if self.shared:
+            self.scan()
+        now = time.time() if now is None else now
+        files = reclaimed = 0
+        with self._lock:
+            victims = []
+            exempt = self._pins | self._held
+            if self.ttl_seconds:
+                expires = now - self.ttl_seconds
+                victims = [key for key, (_, accessed) in self._entries.items()
+                           if accessed < expires and key not in exempt]
+            over = self.usage - sum(self._entries[key][0] for key in victims) - self.quota_bytes
+            if self.quota_bytes and over > 0:
+                chosen = set(victims)
+                for key, (size, _) in self._entries.items():
+                    if over <= 0:
+                        break
+                    if key not in chosen and key not in exempt:
+                        victims.append(key)
+                        over -= size
+
+            for key in victims:
+                if self.shared and self._pin_exists(key):
+                    continue  # pinned by another process since the scan
+                size, _ = self._entries.pop(key)
+                self.usage -= size
+                self._remove(key)
+                files += 1
+                reclaimed += size
+            self.reclaimed_files += files
+            self.reclaimed_bytes += reclaimed
+        return files, reclaimed
+
+    def start(self):
+        """Sweep every sweep_interval seconds on a daemon thread."""
+        if self._thread is None and (self.quota_bytes or self.ttl_seconds):
+            self._thread = threading.Thread(target=self._run, name='output-sweeper', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                if self.shared and fcntl is not None:
+                    self.sweep_shared()
+                else:
+                    self.sweep()
+            except Exception as e:
+                print(f"Warning: Output sweep failed: {e}")
+
+    def sweep_shared(self, now=None):
+        """Sweep unless another process is sweeping or swept within the interval.
+
+        :return: (files deleted, bytes reclaimed), or None when skipped.
+        """
+        now = time.time() if now is None else now
+        with open(os.path.join(self.pins_path, SWEEP_STATE), 'a+') as state:
+            try:
+                fcntl.flock(state, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return None  # another process is sweeping right now
+            last, files, reclaimed = self._read_state(state)
+            # Half an interval of slack, the sweepers don't tick in step
+            if now - last < self.sweep_interval / 2:
+                return None
+            result = self.sweep(now)
+            state.seek(0)
+            state.truncate()
+            state.write(f'{now} {files + result[0]} {reclaimed + result[1]}')
+            state.flush()
+        return result
+
+    def sweep_totals(self) -> tuple:
+        """(files, bytes) reclaimed so far: by any process for shared stores."""
+        if not (self.shared and fcntl is not None):
+            return self.reclaimed_files, self.reclaimed_bytes
+        try:
+            with open(os.path.join(self.pins_path, SWEEP_STATE)) as state:
+                return self._read_state(state)[1:]
+        except OSError:
+            return 0, 0
+
+    @staticmethod
+    def _read_state(state):
+        state.seek(0)
+        try:
+            last, files, reclaimed = state.read().split()
+            return float(last), int(files), int(reclaimed)
+        except ValueError:
+            return 0.0, 0, 0
+
+    def _remove(self, key):
+        path = os.path.join(self.root, *key.split('/'))
+        try:
+            os.remove(path)
+        except OSError:
+            return
+        # Drop shard directories left empty
+        directory = os.path.dirname(path)
+        while os.path.abspath(directory) != os.path.abspath(self.root):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break
+            directory = os.path.dirname(directory)
+
+    def _pin_exists(self, key) -> bool:
+        return os.path.exists(os.path.join(self.pins_path, quote(key, safe='')))
+
+    def _write_pin(self, key, pinned):
+        marker = os.path.join(self.pins_path, quote(key, safe=''))
+        try:
+            if pinned:
+                open(marker, 'a').close()
+            else:
+                os.remove(marker)
+        except OSError as e:
+            print(f"Warning: Could not save pin of {key}: {e}")
+
+    def _after_fork(self):
+        # The sweeper thread isn't copied into the child: start it again there
+        # (preforked servers start the store in the parent before forking)
+        running = self._thread is not None and not self._stop.is_set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if running:
+            self.start()
@@ -0,0 +1,2 @@
+"""Export Storage."""
+from .OutputStore import OutputStore
@@ -5,15 +5,35 @@ import random
 import os
 import requests
 import json
-from flask import Flask, render_template, request, session, redirect, url_for, flash, jsonify
+from flask import Flask, render_template, request, session, redirect, url_for, flash, jsonify, g, send_file
 from werkzeug.security import check_password_hash, generate_password_hash
+from werkzeug.utils import safe_join
 from functools import wraps
 import tempfile
+import time
+import io
+import hashlib
+import gzip
 import uuid
 from datetime import datetime
 
-from ImageProcessor import ImageProcessor
-from TextParser import Parser, Quote
+from ImageProcessor import ImageProcessor, negotiate_format, is_animated, encode_image
+from ImageProcessor import SceneRenderer, SceneError, PreviewRenderer, LatestOnly, RandomPool
+from ImageProcessor.ImageProcessor import outline_color_for
+from ImageProcessor.ImageLoader import estimate_memory
+from ImageProcessor.ImageEncoder import normalize_format
+from ImageProcessor.PreviewRenderer import source_key, PREVIEW_WIDTH
+from ImageProcessor.RandomPool import pair_key
+from ImageProcessor.Thumbnails import Thumbnails, MAX_DIMENSION
+from ImageProcessor.TextEffects import effects_from_names
+from ImageProcessor.TextFit import fit_text
+from ImageProcessor.Fonts import font_cache_info
+from Instrumentation import REGISTRY, CONTENT_TYPE, Profiler
+from Admission import Rejected, ConcurrencyLimiter, RateLimiter, MemoryBudget, SingleFlight
+from Storage import OutputStore
+from Assets import AssetBundles
+from Library import LibraryIndex, ImageCatalog
+from TextParser import Quote
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
@@ -63,8 +83,373 @@ def save_users(users_data):
 # Load users from file
 users_db = load_users()
 
+# Metrics, served on /metrics
+RENDER_STAGE_SECONDS = REGISTRY.histogram(
+    'textoverlay_render_stage_seconds',
+    'Time spent in each render stage (fetch, decode, resize, font, layout, draw, encode, save).')
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'textoverlay_http_request_duration_seconds', 'HTTP request latency by endpoint.')
+HTTP_REQUESTS = REGISTRY.counter(
+    'textoverlay_http_requests_total', 'HTTP requests by endpoint and status code.')
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    'textoverlay_http_requests_in_flight', 'HTTP requests currently being handled.')
+
+
+def observe_stage(stage, seconds):
+    RENDER_STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+# Generated images: hashed subdirectories of ./static, swept down to a byte quota
+# (least recently used first) and a TTL; images of logged-in users are pinned.
+# STORAGE_SHARED=1 when several processes serve the app (set by gunicorn.conf.py)
+storage = OutputStore('./static',
+                      quota_bytes=int(os.environ.get('STORAGE_QUOTA_MB', 1024)) * 1024 * 1024,
+                      ttl_seconds=float(os.environ.get('STORAGE_TTL_HOURS', 168)) * 3600,
+                      sweep_interval=float(os.environ.get('STORAGE_SWEEP_SECONDS', 60)),
+                      shared=os.environ.get('STORAGE_SHARED') == '1').start()
+
 # Initialize image processor 
-overlay = ImageProcessor('./static')
+overlay = ImageProcessor('./static', on_stage=observe_stage, store=storage)
+
+# Threads used to composite the frames of animated uploads
+ANIMATION_WORKERS = int(os.environ.get('ANIMATION_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Headers for fetching remote images - a browser-like set avoids 403s from some hosts
+IMAGE_REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Referer': 'https://www.google.com/'
+}
+
+# Admission control, so a burst of big renders gets 503/429 instead of an OOM kill:
+# renders and upstream fetches each take a slot (or wait in a bounded queue),
+# renders also reserve their estimated memory, and each client (user or IP)
+# gets a token bucket on /create, /proxy-image and /render-scene
+ADMISSION_TIMEOUT = float(os.environ.get('ADMISSION_TIMEOUT', 10))
+render_admission = ConcurrencyLimiter(int(os.environ.get('RENDER_CONCURRENCY', os.cpu_count() or 2)),
+                                      max_queue=int(os.environ.get('RENDER_QUEUE', 32)),
+                                      timeout=ADMISSION_TIMEOUT)
+fetch_admission = ConcurrencyLimiter(int(os.environ.get('FETCH_CONCURRENCY', 16)),
+                                     max_queue=int(os.environ.get('FETCH_QUEUE', 64)),
+                                     timeout=ADMISSION_TIMEOUT)
+render_memory = MemoryBudget(int(os.environ.get('RENDER_MEMORY_MB', 512)) * 1024 * 1024,
+                             timeout=ADMISSION_TIMEOUT)
+client_limits = RateLimiter(float(os.environ.get('CLIENT_RATE', 5)),
+                            int(os.environ.get('CLIENT_BURST', 30)))
+# Previews follow keystrokes and slider drags, so they get their own, larger
+# bucket instead of eating into the one /create uses
+preview_limits = RateLimiter(float(os.environ.get('PREVIEW_RATE', 10)),
+                             int(os.environ.get('PREVIEW_BURST', 60)))
+
+
+# Concurrent fetches of the same URL share one download (and its failure);
+# waiters give up after FETCH_WAIT_TIMEOUT seconds
+fetch_flight = SingleFlight(timeout=float(os.environ.get('FETCH_WAIT_TIMEOUT', 20)))
+
+
+def fetch_image(image_url):
+    """Download a remote image.
+
+    Requests for a URL already being downloaded wait for that download
+    instead of starting their own.
+
+    Returns:
+        tuple: (image bytes, lower-cased content type).
+
+    Raises:
+        requests.RequestException: if the download fails or returns an error status,
+            or waiting for a download in flight times out.
+        Rejected: if too many fetches are already running.
+    """
+    try:
+        return fetch_flight.do(image_url, lambda: _download_image(image_url))
+    except TimeoutError as e:
+        raise requests.exceptions.Timeout(str(e))
+
+
+def _download_image(image_url):
+    with fetch_admission.slot(), RENDER_STAGE_SECONDS.time(stage='fetch'):
+        response = requests.get(image_url, timeout=15, headers=IMAGE_REQUEST_HEADERS)
+        response.raise_for_status()
+    return response.content, response.headers.get('content-type', '').lower()
+
+
+# Server-side renderer for Canvas Creator scenes, caches fetched images and layers
+scene_renderer = SceneRenderer(fetch_image=lambda url: fetch_image(url)[0],
+                               admit=render_memory.reserve)
+
+# Live editor previews: reduced width, cached bases, only the latest request per session
+preview_renderer = PreviewRenderer(overlay, admit=lambda data, width: render_memory.reserve(
+    estimate_memory(io.BytesIO(data), width)))
+preview_requests = LatestOnly(debounce_ms=int(os.environ.get('PREVIEW_DEBOUNCE_MS', 0)))
+
+# Canvas-sized copies of proxied images (/proxy-image?w=&h=&format=)
+thumbnails = Thumbnails(
+    int(os.environ.get('PROXY_THUMBNAIL_CACHE', 256)),
+    cache_bytes=int(os.environ.get('PROXY_THUMBNAIL_CACHE_MB', 64)) * 1024 * 1024)
+
+
+def cache_stats():
+    # (hits, misses, entries) of the caches worth watching, by cache name
+    stats = {
+        'text_layer': overlay.layer_cache,
+        'preview_base': preview_renderer.base_cache,
+        'proxy_thumbnail': thumbnails.cache,
+        'scene_layer': scene_renderer.layer_cache,
+        'scene_image': scene_renderer.image_cache,
+        'scene_base': scene_renderer.base_cache,
+    }
+    stats = {name: (cache.hits, cache.misses, len(cache)) for name, cache in stats.items()}
+    for name, info in (('font', font_cache_info()), ('text_fit', fit_text.cache_info())):
+        stats[name] = (info.hits, info.misses, info.currsize)
+    return stats
+
+
+def _cache_metric(read):
+    return lambda: {(('cache', name),): read(*values) for name, values in cache_stats().items()}
+
+
+REGISTRY.counter_function('textoverlay_cache_hits_total', 'Cache hits by cache.',
+                          _cache_metric(lambda hits, misses, entries: hits))
+REGISTRY.counter_function('textoverlay_cache_misses_total', 'Cache misses by cache.',
+                          _cache_metric(lambda hits, misses, entries: misses))
+REGISTRY.gauge_function('textoverlay_cache_entries', 'Entries held by each cache.',
+                        _cache_metric(lambda hits, misses, entries: entries))
+REGISTRY.gauge_function('textoverlay_cache_hit_ratio', 'Hits / lookups since startup by cache.',
+                        _cache_metric(lambda hits, misses, entries:
+                                      hits / (hits + misses) if hits + misses else 0.0))
+REGISTRY.counter_function('textoverlay_preview_superseded_total',
+                          'Previews dropped because a newer one arrived.',
+                          lambda: preview_requests.superseded)
+
+REGISTRY.counter_function('textoverlay_fetch_coalesced_total',
+                          'Image fetches served by a download already in flight.',
+                          lambda: fetch_flight.shared)
+REGISTRY.counter_function('textoverlay_fetch_wait_timeouts_total',
+                          'Requests that gave up waiting for a download in flight.',
+                          lambda: fetch_flight.timeouts)
+REGISTRY.gauge_function('textoverlay_storage_bytes', 'Bytes of generated images on disk.',
+                        lambda: storage.usage)
+REGISTRY.gauge_function('textoverlay_storage_files', 'Generated images on disk.',
+                        lambda: len(storage))
+REGISTRY.gauge_function('textoverlay_storage_pinned_bytes',
+                        'Bytes of generated images pinned for logged-in users.',
+                        lambda: storage.pinned_bytes)
+REGISTRY.counter_function('textoverlay_storage_reclaimed_bytes_total',
+                          'Bytes deleted by the storage sweeper.',
+                          lambda: storage.sweep_totals()[1])
+REGISTRY.counter_function('textoverlay_storage_reclaimed_files_total',
+                          'Files deleted by the storage sweeper.',
+                          lambda: storage.sweep_totals()[0])
+
+ADMISSION_REJECTIONS = REGISTRY.counter(
+    'textoverlay_admission_rejections_total', 'Requests turned away by endpoint and reason.')
+REGISTRY.gauge_function('textoverlay_admission_queue_depth', 'Requests waiting for a slot.',
+                        lambda: {(('pool', 'render'),): render_admission.waiting,
+                                 (('pool', 'fetch'),): fetch_admission.waiting})
+REGISTRY.gauge_function('textoverlay_admission_active', 'Requests holding a slot.',
+                        lambda: {(('pool', 'render'),): render_admission.active,
+                                 (('pool', 'fetch'),): fetch_admission.active})
+REGISTRY.gauge_function('textoverlay_render_memory_reserved_bytes',
+                        'Estimated memory held by running renders.',
+                        lambda: render_memory.in_use)
+
+
+def client_key():
+    # Rate limits follow the user when logged in, the address otherwise
+    if 'user_id' in session:
+        return f"user:{session['user_id']}"
+    return f'ip:{request.remote_addr}'
+
+
+def rate_limited_by(limits):
+    # Decorator taking a token from the client's bucket in limits per request
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limits.check(client_key())
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def rate_limited(f):
+    return rate_limited_by(client_limits)(f)
+
+
+@app.errorhandler(Rejected)
+def admission_rejected(e):
+    ADMISSION_REJECTIONS.inc(endpoint=request.endpoint or 'unmatched', reason=e.reason)
+    headers = {'Retry-After': str(e.retry_after)} if e.retry_after else {}
+    message = {429: 'Too many requests, please slow down.',
+               413: 'Image is too large to render.'}.get(e.status, 'Server busy, please retry shortly.')
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return jsonify({'success': False, 'error': e.reason, 'message': message}), e.status, headers
+    return message, e.status, headers
+
+
+@app.before_request
+def start_request_metrics():
+    g.request_start = time.perf_counter()
+    g.request_endpoint = request.endpoint or 'unmatched'
+    HTTP_IN_FLIGHT.inc(endpoint=g.request_endpoint)
+
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_start' in g:
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - g.request_start,
+                                     endpoint=g.request_endpoint)
+        HTTP_REQUESTS.inc(endpoint=g.request_endpoint, status=response.status_code)
+    return response
+
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    if 'request_endpoint' in g:
+        HTTP_IN_FLIGHT.dec(endpoint=g.request_endpoint)
+
+
+def output_url(path):
+    # Web path of a stored output; pinned when a logged-in user made it
+    if 'user_id' in session:
+        storage.pin(path)
+    return '/static/' + storage.relative(path)
+
+
+# Content-addressed outputs never change, so browsers may keep them for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def send_output(path, etag_suffix='', **kwargs):
+    # send_file for a stored output: strong content-hash ETag and immutable caching
+    # when the file is content-addressed, 304s and Range responses either way
+    digest = storage.content_hash(path)
+    if digest is None:
+        return send_file(os.path.abspath(path), conditional=True, **kwargs)
+    response = send_file(os.path.abspath(path), conditional=True, etag=digest + etag_suffix,
+                         max_age=IMMUTABLE_MAX_AGE, **kwargs)
+    response.cache_control.immutable = True
+    return response
+
+
+def conditional_bytes(data, content_type, etag, max_age, immutable=False, headers=None):
+    # In-memory body with an ETag; answers If-None-Match/If-Modified-Since with 304
+    # and Range with 206 like send_file does for files
+    response = app.response_class(data, content_type=content_type, headers=headers)
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if immutable:
+        response.cache_control.immutable = True
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(data))
+
+
+def serve_static(filename):
+    # Replaces Flask's static view (same /static/<path:filename> rule)
+    path = safe_join(storage.root, filename)
+    if path is None or not os.path.isfile(path):
+        return 'Not found', 404
+    # Serving counts as an access for the storage sweeper
+    storage.touch(path)
+    return send_output(path)
+
+
+app.view_functions['static'] = serve_static
+
+
+# Page scripts and stylesheets: fingerprinted, precompressed copies of ./web,
+# rebuilt at startup when a source changed (python -m Assets build does it ahead)
+assets = AssetBundles('./web', './build/assets')
+assets.load()
+app.add_template_global(assets.url, 'asset_url')
+
+
+# Rendered pages are gzipped on the way out; smaller ones aren't worth it
+HTML_GZIP_MIN_BYTES = 1024
+
+
+@app.after_request
+def compress_html(response):
+    if (response.mimetype != 'text/html' or response.direct_passthrough
+            or response.status_code != 200 or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+    if request.accept_encodings.quality('gzip') <= 0:
+        return response
+    body = response.get_data()
+    if len(body) < HTML_GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=6))
+    response.content_encoding = 'gzip'
+    return response
+
+
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    # Brotli or gzip copy when the client takes it; the names change with the
+    # content, so every variant can be cached for good
+    found = assets.variant(filename, request.accept_encodings)
+    if found is None:
+        return 'Not found', 404
+    path, content_type, encoding = found
+    response = send_file(os.path.abspath(path), mimetype=content_type, conditional=True,
+                         max_age=IMMUTABLE_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    response.vary.add('Accept-Encoding')
+    if encoding is not None:
+        response.content_encoding = encoding
+    return response
+
+
+# Request profiling: admins ask for it with an X-Profile header or ?profile=1,
+# PROFILE_SAMPLE_RATE profiles a random share of all requests
+profiler = Profiler(os.environ.get('PROFILE_DIR', './profiles'),
+                    mode=os.environ.get('PROFILE_MODE', 'sampling'),
+                    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)))
+PROFILE_ADMINS = {name.strip() for name in os.environ.get('PROFILE_ADMINS', '').split(',')
+                  if name.strip()}
+UNPROFILED_ENDPOINTS = ('static', 'serve_asset', 'metrics')
+
+
+def profile_requested():
+    if request.endpoint in UNPROFILED_ENDPOINTS:
+        return False
+    if request.headers.get('X-Profile') or request.args.get('profile'):
+        return session.get('username') in PROFILE_ADMINS
+    return profiler.sampled()
+
+
+@app.before_request
+def start_request_profile():
+    if profile_requested():
+        try:
+            g.profile = profiler.start(request.endpoint or 'unmatched')
+        except ValueError as e:
+            # cProfile refuses to start while another profiler is active
+            print(f"Warning: Could not start profiler: {e}")
+
+
+@app.after_request
+def finish_request_profile(response):
+    profile = g.pop('profile', None)
+    if profile is not None:
+        path = profiler.finish(profile)
+        response.headers['X-Profile'] = os.path.basename(path)
+    return response
+
+
+@app.teardown_request
+def abandon_request_profile(error=None):
+    # The request failed before after_request, still keep what was sampled
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profiler.finish(profile)
 
 # Authentication helpers
 def login_required(f):
@@ -108,36 +493,94 @@ def create_user(username, email, password):
     return user
 
 
-def setup():
-    # Load quotes and images on startup
-    quote_files = ['./_data/SimpleLines/SimpleLines.txt',
-                   './_data/SimpleLines/SimpleLines.docx',
-                   './_data/SimpleLines/SimpleLines.pdf',
-                   './_data/SimpleLines/SimpleLines.csv']
-
-    quotes = []
-    for file in quote_files:
-        try:
-            quotes.extend(Parser.parse(file))
-        except Exception as e:
-            print(f"Warning: Could not parse {file}: {e}")
+# Quote corpus and image library, reloaded when files are added, changed or
+# removed. LIBRARY_WATCH: auto (inotify where available, else polling), poll or off
+QUOTE_DIRS = ['./_data/SimpleLines']
+IMAGE_DIRS = ['./_data/photos/images/']
 
-    images_path = "./_data/photos/images/"
-    imgs = []
-    
-    if os.path.exists(images_path):
-        for root, dirs, files in os.walk(images_path):
-            imgs = [os.path.join(root, name) for name in files 
-                   if name.lower().endswith(('.jpg', '.jpeg', '.png', '.gif'))]
-    
-    if not imgs:
+
+def setup():
+    # Index quotes and images on startup
+    index = LibraryIndex(QUOTE_DIRS, IMAGE_DIRS, on_change=library_changed)
+    index.refresh()
+    if not index.snapshot.images:
         print("Warning: No images found in the images directory")
-    
-    return quotes, imgs
+    return index
+
+
+def library_changed(snapshot):
+    # Keep the image catalog and the /random pool in step (neither exists yet
+    # during the first refresh)
+    if 'catalog' in globals():
+        catalog.update(snapshot.images)
+    if 'random_pool' in globals():
+        random_pool.set_sources(snapshot.quotes, snapshot.images)
 
 
-# Load resources at startup
-quotes, imgs = setup()
+# Load resources at startup (PROFILE_STARTUP=1 profiles the parsers)
+if os.environ.get('PROFILE_STARTUP'):
+    with profiler.profile('startup') as startup_profile:
+        library = setup()
+    print(f"Startup profile written to {startup_profile.path}")
+else:
+    library = setup()
+
+LIBRARY_WATCH = os.environ.get('LIBRARY_WATCH', 'auto')
+if LIBRARY_WATCH != 'off':
+    library.watch(poll_interval=float(os.environ.get('LIBRARY_POLL_SECONDS', 5)),
+                  use_inotify=LIBRARY_WATCH == 'auto')
+
+# Size, orientation, luminance and dominant color of every library image, in
+# SQLite, so picks can be filtered without decoding anything
+catalog = ImageCatalog(os.environ.get('IMAGE_CATALOG_PATH', './catalog.sqlite3'))
+catalog.update(library.snapshot.images)
+
+REGISTRY.gauge_function('textoverlay_catalog_images', 'Library images in the catalog.',
+                        lambda: catalog.count)
+REGISTRY.counter_function('textoverlay_catalog_indexed_total',
+                          'Images (re)indexed into the catalog.', lambda: catalog.indexed)
+REGISTRY.counter_function('textoverlay_catalog_failures_total',
+                          'Images the catalog could not index.', lambda: catalog.failures)
+REGISTRY.gauge_function('textoverlay_library_quotes', 'Quotes in the loaded corpus.',
+                        lambda: len(library.snapshot.quotes))
+REGISTRY.gauge_function('textoverlay_library_images', 'Images in the library.',
+                        lambda: len(library.snapshot.images))
+REGISTRY.counter_function('textoverlay_library_reloads_total',
+                          'Library snapshots published after a change.',
+                          lambda: library.reloads)
+REGISTRY.counter_function('textoverlay_library_parsed_files_total',
+                          'Quote files parsed (startup and changes).',
+                          lambda: library.parsed_files)
+
+# Random memes for /random, rendered ahead of time. The producer thread starts
+# with the first /random request in each process, or with app.py's __main__;
+# wsgi.py fills the pool before gunicorn forks.
+RANDOM_RENDER_SECONDS = REGISTRY.histogram(
+    'textoverlay_random_pool_render_seconds', 'Time to render one random pool entry.')
+random_pool = RandomPool(overlay, library.snapshot.quotes, library.snapshot.images,
+                         size=int(os.environ.get('RANDOM_POOL_SIZE', 16)),
+                         max_serves=int(os.environ.get('RANDOM_POOL_SERVES', 8)),
+                         # Refills wait while user renders are queueing
+                         busy=lambda: render_admission.waiting > 0,
+                         on_render=RANDOM_RENDER_SECONDS.observe)
+RANDOM_SERVED = REGISTRY.counter(
+    'textoverlay_random_served_total', '/random responses by source (pool or render).')
+REGISTRY.gauge_function('textoverlay_random_pool_entries', 'Renders ready in the random pool.',
+                        lambda: len(random_pool))
+REGISTRY.gauge_function('textoverlay_random_pool_target', 'Renders the random pool keeps ready.',
+                        lambda: random_pool.size)
+REGISTRY.counter_function('textoverlay_random_pool_produced_total',
+                          'Renders added to the random pool.', lambda: random_pool.produced)
+REGISTRY.counter_function('textoverlay_random_pool_retired_total',
+                          'Renders retired from the random pool.', lambda: random_pool.retired)
+REGISTRY.counter_function('textoverlay_random_pool_repeats_total',
+                          'Random memes a session had already seen (nothing new was ready).',
+                          lambda: random_pool.repeats)
+REGISTRY.counter_function('textoverlay_random_pool_failures_total',
+                          'Random pool renders that failed.', lambda: random_pool.failures)
+
+# Pairs remembered per session so /random doesn't repeat them
+RANDOM_SEEN_KEPT = 64
 
 
 @app.route('/')
@@ -152,6 +595,82 @@ def meme_rand():
     return render_template('try_now.html')
 
 
+def catalog_filters(args):
+    # Catalog query filters from request arguments; ValueError for bad numbers
+    filters = {name: args[name] for name in ('orientation', 'tone', 'color') if args.get(name)}
+    for name in ('min_width', 'min_height'):
+        if args.get(name):
+            filters[name] = int(args[name])
+    return filters
+
+
+@app.route('/library/images')
+def library_images():
+    # Library images matching ?orientation=&tone=&color=&min_width=&min_height=,
+    # answered from the catalog
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+        images = catalog.query(limit=limit, random_order=request.args.get('order') == 'random',
+                               **catalog_filters(request.args))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    for image in images:
+        image['name'] = os.path.basename(image['path'])
+    return jsonify({'images': images, 'count': len(images)})
+
+
+@app.route('/random')
+@rate_limited
+def random_meme():
+    # A random quote on a random library image, from the pre-rendered pool.
+    # The catalog filters (see library_images) narrow the choice of image.
+    # Returns the image, or JSON (path, quote, author) for ?format=json and XHR.
+    snapshot = library.snapshot
+    try:
+        filters = catalog_filters(request.args)
+        candidates = ({image['path'] for image in catalog.query(**filters)} if filters
+                      else None)
+    except ValueError as e:
+        return str(e), 400
+    if candidates is not None and not candidates:
+        return 'No library image matches', 404
+    where = None if candidates is None else (lambda item: item.image_path in candidates)
+
+    seen = session.get('random_seen', [])
+    item = random_pool.take(seen, where)
+    while item is not None and not os.path.exists(item.path):
+        random_pool.discard(item)  # swept or deleted underneath us
+        item = random_pool.take(seen, where)
+
+    if item is not None:
+        source, key, path, quote = 'pool', item.key, item.path, item.quote
+    else:
+        # Pool still filling (just started) or nothing pooled matches the
+        # filters: render this one on the request path
+        images = snapshot.images if candidates is None else sorted(candidates)
+        if not snapshot.quotes or not images:
+            return 'No quotes or images to choose from', 503
+        quote, image_path = random.choice(snapshot.quotes), random.choice(images)
+        with render_admission.slot():
+            path = overlay.make_meme(image_path, quote.body, quote.author,
+                                     **random_pool.render_options)
+        source, key = 'render', pair_key(quote, image_path)
+    RANDOM_SERVED.inc(source=source)
+    session['random_seen'] = ([k for k in seen if k != key] + [key])[-RANDOM_SEEN_KEPT:]
+
+    web_path = '/static/' + storage.relative(path)
+    if (request.args.get('format') == 'json'
+            or request.headers.get('X-Requested-With') == 'XMLHttpRequest'):
+        response = jsonify({'image_path': web_path, 'quote': quote.body, 'author': quote.author})
+    else:
+        response = send_file(os.path.abspath(path), max_age=0)
+        response.headers['Content-Location'] = web_path
+    # A new pick every time
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Random-Source'] = source
+    return response
+
+
 @app.route('/create', methods=['GET'])
 def meme_form():
     # Show the form for making custom overlays - Normal Editor
@@ -183,8 +702,12 @@ def fabric_editor():
 
 
 @app.route('/proxy-image')
+@rate_limited
 def proxy_image():
     """Proxy endpoint to fetch external images and serve them to avoid CORS issues.
+
+    With w, h and/or format the image is downscaled to fit w x h and
+    re-encoded, e.g. /proxy-image?url=...&w=600 for a 600px canvas.
     
     Returns:
         Flask response with image data or error message.
@@ -192,38 +715,65 @@ def proxy_image():
     image_url = request.args.get('url')
     if not image_url:
         return 'URL parameter required', 400
-    
+
+    # Optional resizing for the editors' canvases: w/h bound the size (never
+    # enlarged), format picks the encoding and is negotiated from Accept if omitted
+    resize = any(request.args.get(name) for name in ('w', 'h', 'format'))
+    if resize:
+        try:
+            max_width = int(request.args['w']) if request.args.get('w') else None
+            max_height = int(request.args['h']) if request.args.get('h') else None
+            if any(value is not None and not 1 <= value <= MAX_DIMENSION
+                   for value in (max_width, max_height)):
+                raise ValueError(f'w and h must be between 1 and {MAX_DIMENSION}')
+            output_format = negotiate_format(request.headers.get('Accept'),
+                                             request.args.get('format'))
+        except ValueError as e:
+            return f'Invalid resize parameters: {e}', 400
+
+    headers = {
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET',
+        'Access-Control-Allow-Headers': 'Content-Type',
+    }
+
+    def resized_response(encoded, cache_state):
+        resized_headers = dict(headers, **{'X-Proxy-Cache': cache_state})
+        if not request.args.get('format'):
+            resized_headers['Vary'] = 'Accept'
+        return conditional_bytes(encoded.data, encoded.mimetype,
+                                 hashlib.sha1(encoded.data).hexdigest()[:24], 3600,
+                                 headers=resized_headers)
+
     try:
-        # Enhanced headers to avoid blocking (same as in meme_post)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Referer': 'https://www.google.com/'
-        }
-        
+        if resize:
+            # Derived sizes are cached, a hit doesn't even fetch the original
+            resized = thumbnails.get(image_url, max_width, max_height, output_format)
+            if resized is not None:
+                return resized_response(resized, 'hit')
+
         print(f"Fetching image from: {image_url}")  # Debug log
-        response = requests.get(image_url, timeout=15, headers=headers)
-        response.raise_for_status()
+        content, content_type = fetch_image(image_url)
         
         # Validate content type
-        content_type = response.headers.get('content-type', '').lower()
         if not any(img_type in content_type for img_type in ['image/', 'application/octet-stream']):
             return f'Invalid content type: {content_type}', 400
         
         print(f"Successfully fetched image, content-type: {content_type}")  # Debug log
+
+        if resize:
+            with render_admission.slot(), render_memory.reserve(
+                    estimate_memory(io.BytesIO(content), max_width or MAX_DIMENSION)):
+                resized = thumbnails.make(image_url, content, max_width, max_height,
+                                          output_format)
+            # Animated images are passed through unchanged
+            if resized is not None:
+                return resized_response(resized, 'miss')
         
-        # Return the image with proper headers
-        return response.content, 200, {
-            'Content-Type': content_type,
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Methods': 'GET',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Cache-Control': 'max-age=3600'
-        }
+        # Return the image with proper headers; the content hash lets the editors
+        # revalidate with If-None-Match and get a 304 instead of the bytes again
+        return conditional_bytes(content, content_type, hashlib.sha1(content).hexdigest()[:24],
+                                 3600, headers=headers)
     except requests.exceptions.Timeout:
         print(f"Timeout fetching image: {image_url}")
         return 'Request timeout - image took too long to load', 408
@@ -233,12 +783,15 @@ def proxy_image():
     except requests.exceptions.HTTPError as e:
         print(f"HTTP error fetching image: {image_url}, status: {e.response.status_code}")
         return f'HTTP error: {e.response.status_code} - {e.response.reason}', e.response.status_code
+    except Rejected:
+        raise
     except Exception as e:
         print(f"Unexpected error fetching image: {image_url}, error: {str(e)}")
         return f'Failed to fetch image: {str(e)}', 500
 
 
 @app.route('/create', methods=['POST'])
+@rate_limited
 def meme_post():
     """Create a custom meme from user input.
     
@@ -249,17 +802,37 @@ def meme_post():
     author = request.form.get('author', '').strip()
     image_source = request.form.get('image_source', 'url')
     
-    # Get new customization parameters
-    font_size = int(request.form.get('font_size', 30))
+    # Get new customization parameters ('auto' fits the font size to the image)
+    auto_fit = request.form.get('font_size') == 'auto'
+    font_size = 30 if auto_fit else int(request.form.get('font_size', 30))
     font_family = request.form.get('font_family', 'Impact')
     text_color = request.form.get('text_color', 'white')
     position_x = int(request.form.get('text_position_x', 50))
     position_y = int(request.form.get('text_position_y', 50))
+    # Checkbox: put the text on the calmest spot instead of at position_x/y
+    auto_place = request.form.get('auto_place') is not None
     add_outline = request.form.get('add_outline') is not None  # Checkbox handling
+    quality_preset = request.form.get('quality_preset', 'balanced')
     
     # Validate input
     if not body:
         return render_template('error.html', error='Quote body is required')
+
+    # Optional effects (outline, shadow, glow, box) replace the plain outline
+    effect_names = [name for value in request.form.getlist('text_effects')
+                    for name in value.split(',')]
+    try:
+        effects = effects_from_names(effect_names, outline_color_for(text_color)) if effect_names else None
+    except ValueError as e:
+        return render_template('error.html', error=str(e))
+    # Only the format name is checked up front: whether it suits the image
+    # (still or animated) is known once the image is here
+    requested_format = request.form.get('output_format')
+    try:
+        if requested_format:
+            normalize_format(requested_format)
+    except ValueError as e:
+        return render_template('error.html', error=str(e))
     # Author is now optional - no validation needed
 
     tmp_path = None
@@ -290,20 +863,8 @@ def meme_post():
             if not image_url:
                 return render_template('error.html', error='Image URL is required when using URL source')
             
-            # Set better headers to avoid 403 errors
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Referer': 'https://www.google.com/'
-            }
-            
             # Download the image
-            response = requests.get(image_url, timeout=15, headers=headers)
-            response.raise_for_status()
+            content, _ = fetch_image(image_url)
             
             # Get file extension from URL
             extension = image_url.split('.')[-1].lower()
@@ -312,36 +873,58 @@ def meme_post():
             
             # Create temporary file
             with tempfile.NamedTemporaryFile(suffix=f'.{extension}', delete=False) as tmp_file:
-                tmp_file.write(response.content)
+                tmp_file.write(content)
                 tmp_path = tmp_file.name
         
-        # Generate meme with custom styling
-        path = overlay.make_meme(
-            tmp_path, body, author,
+        style = dict(
             font_size=font_size,
             font_family=font_family,
             text_color=text_color,
             position_x=position_x,
             position_y=position_y,
-            add_outline=add_outline
+            add_outline=add_outline,
+            effects=effects,
+            auto_fit=auto_fit,
+            auto_place=auto_place
         )
+        # Animated sources keep their animation, so they need an animated format
+        animated = is_animated(tmp_path)
+        try:
+            output_format = negotiate_format(request.headers.get('Accept'), requested_format,
+                                             animated=animated)
+        except ValueError as e:
+            os.remove(tmp_path)
+            return render_template('error.html', error=str(e))
+
+        # Wait for a render slot and room in the memory budget (or get turned away)
+        with render_admission.slot(), render_memory.reserve(estimate_memory(tmp_path, 500)):
+            if animated:
+                # Keep the animation - overlay every frame and re-encode as GIF/WebP
+                animation = overlay.render_animated_meme(tmp_path, body, author,
+                                                         output_format=output_format,
+                                                         workers=ANIMATION_WORKERS, **style)
+                encoded = overlay.save_animation(animation, output_format, quality_preset)
+            else:
+                # Generate meme with custom styling
+                img = overlay.render_meme(tmp_path, body, author, **style)
+                encoded = overlay.save_image(img, output_format, quality_preset)
+        path = encoded.path
         
         # Clean up temporary file
         if tmp_path and os.path.exists(tmp_path):
             os.remove(tmp_path)
         
         # Convert file system path to web URL
-        web_path = path.replace('./static/', '/static/').replace('.\\static\\', '/static/').replace('\\', '/')
-        if not web_path.startswith('/static/'):
-            # If it's a relative path, ensure it starts with /static/
-            filename = os.path.basename(path)
-            web_path = f'/static/{filename}'
+        web_path = output_url(path)
         
         # Check if this is an AJAX request (for staying on the same page)
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return jsonify({
                 'success': True,
                 'image_path': web_path,
+                'format': encoded.format,
+                'encoded_bytes': encoded.size,
+                'encode_ms': round(encoded.encode_ms, 2),
                 'message': 'Image created successfully!'
             })
         
@@ -363,6 +946,10 @@ def meme_post():
         
         return render_template('error.html', 
                              error=f'Could not download image: {str(e)}')
+    except Rejected:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     except Exception as e:
         # Clean up temporary file if it exists
         if tmp_path and os.path.exists(tmp_path):
@@ -380,82 +967,207 @@ def meme_post():
                              error=f'Could not generate meme: {str(e)}')
 
 
+@app.route('/preview', methods=['POST'])
+@rate_limited_by(preview_limits)
+def preview():
+    """Render a low-resolution preview for the live editors.
+
+    Takes the same form fields as POST /create plus preview_width. The
+    decoded base is cached, so after the first request the editor can send
+    source_key (from the X-Preview-Source header) instead of re-uploading
+    the file. Nothing is written to static/.
+
+    Returns:
+        Image bytes, 204 if a newer preview from the same session replaced
+        this one, or JSON with an error message.
+    """
+    body = request.form.get('body', '').strip()
+    author = request.form.get('author', '').strip()
+    text_color = request.form.get('text_color', 'white')
+    try:
+        width = int(request.form.get('preview_width', PREVIEW_WIDTH))
+        auto_fit = request.form.get('font_size') == 'auto'
+        style = dict(
+            font_size=30 if auto_fit else int(request.form.get('font_size', 30)),
+            font_family=request.form.get('font_family', 'Impact'),
+            text_color=text_color,
+            position_x=int(request.form.get('text_position_x', 50)),
+            position_y=int(request.form.get('text_position_y', 50)),
+            add_outline=request.form.get('add_outline') is not None,
+            auto_fit=auto_fit,
+            auto_place=request.form.get('auto_place') is not None
+        )
+        effect_names = [name for value in request.form.getlist('text_effects')
+                        for name in value.split(',')]
+        if effect_names:
+            style['effects'] = effects_from_names(effect_names, outline_color_for(text_color))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    # Work out where the base comes from without downloading/reading it yet
+    upload = request.files.get('image_file')
+    if request.form.get('image_source') == 'file' and upload and upload.filename:
+        data = upload.read()
+        key, load = source_key(data=data), lambda: data
+    elif request.form.get('source_key'):
+        key = request.form['source_key']
+        def load():
+            raise LookupError('Preview source expired, send the image again')
+    else:
+        image_url = request.form.get('image_url', '').strip()
+        if not image_url:
+            return jsonify({'success': False, 'error': 'Image URL or file is required'}), 400
+        key, load = source_key(url=image_url), lambda: fetch_image(image_url)[0]
+
+    # One preview at a time per editor session, stale requests are dropped
+    if 'preview_id' not in session:
+        session['preview_id'] = uuid.uuid4().hex
+    def render():
+        # A render slot like /create; decoding a new base also reserves its
+        # estimated memory (see preview_renderer's admit hook)
+        with render_admission.slot():
+            return preview_renderer.render(key, load, body, author, width=width, **style)
+
+    try:
+        rendered = preview_requests.run(session['preview_id'], render)
+    except LookupError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except requests.RequestException as e:
+        return jsonify({'success': False, 'error': f'Could not download image: {str(e)}'}), 400
+    except Rejected:
+        raise
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Could not render preview: {str(e)}'}), 500
+
+    if rendered is None:
+        return '', 204, {'Cache-Control': 'no-store'}
+    return rendered.encoded.data, 200, {
+        'Content-Type': rendered.encoded.mimetype,
+        'Cache-Control': 'no-store',
+        'X-Preview-Source': key,
+        'X-Render-Ms': f'{rendered.render_ms:.1f}',
+        'X-Base-Cached': str(int(rendered.base_cached)),
+        'X-Layer-Cached': str(int(rendered.layer_cached)),
+    }
+
+
+def scene_memory(scene):
+    # Rough peak bytes of a scene render: the canvas plus one canvas-sized
+    # RGBA layer per layer; malformed sizes count as 0 and fail validation.
+    # Source images are reserved by scene_renderer as they're decoded
+    try:
+        width, height = int(scene.get('width', 0)), int(scene.get('height', 0))
+        layers = len(scene.get('layers') or [])
+    except (TypeError, ValueError):
+        return 0
+    return max(0, width) * max(0, height) * 4 * (layers + 1)
+
+
+@app.route('/render-scene', methods=['POST'])
+@rate_limited
+def render_scene():
+    """Render a Canvas Creator scene document on the server.
+
+    Avoids tainted-canvas export failures and per-image proxy round trips:
+    the editor posts its layers as JSON and gets the finished image back.
+    Pass "save": true to store the result under static/ and get its path.
+
+    Returns:
+        Image bytes, or JSON with the saved path / an error message.
+    """
+    scene = request.get_json(silent=True)
+    if not isinstance(scene, dict):
+        return jsonify({'success': False, 'error': 'Scene JSON body required'}), 400
+
+    try:
+        output_format = negotiate_format(request.headers.get('Accept'), scene.get('output_format'))
+        # Same gates as /create: a render slot and room in the memory budget
+        with render_admission.slot(), render_memory.reserve(scene_memory(scene)):
+            rendered = scene_renderer.render(scene)
+            encoded = encode_image(rendered.image, output_format, scene.get('quality_preset'))
+    except requests.RequestException as e:
+        return jsonify({'success': False, 'error': f'Could not download image: {str(e)}'}), 400
+    except (SceneError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    stats = {
+        'X-Render-Ms': f'{rendered.render_ms:.1f}',
+        'X-Layers-Rendered': str(rendered.layers_rendered),
+        'X-Layers-Cached': str(rendered.layers_cached),
+    }
+    if scene.get('save'):
+        path = overlay.save_encoded(encoded).path
+        return jsonify({'success': True, 'image_path': output_url(path),
+                        'format': encoded.format, 'encoded_bytes': encoded.size}), 200, stats
+
+    return encoded.data, 200, dict(stats, **{'Content-Type': encoded.mimetype})
+
+
 @app.route('/download/<path:filename>')
 def download_image(filename):
-    """Download generated image with different format options."""
+    """Download generated image with different format options.
+
+    Converted formats are encoded in memory, nothing is written to static/.
+    """
     try:
         # Get the format parameter (default to original)
         format_type = request.args.get('format', 'original')
         
-        # Read the source image
-        image_path = os.path.join(app.static_folder, filename)
-        if not os.path.exists(image_path):
+        # Read the source image (safe_join refuses paths outside static/)
+        image_path = safe_join(storage.root, filename)
+        if image_path is None or not os.path.isfile(image_path):
             return "Image not found", 404
+        storage.touch(image_path)
         
+        digest = storage.content_hash(image_path)
+        download_id = (digest or uuid.uuid4().hex)[:8]
+        if format_type not in ('png', 'webp', 'pdf'):  # original format
+            original_ext = filename.split('.')[-1]
+            return send_output(image_path, as_attachment=True,
+                               download_name=f"text-overlay-{download_id}.{original_ext}")
+
+        # A conversion of a content-addressed file never changes either, so a
+        # revalidation is answered before converting anything
+        download_name = f"text-overlay-{download_id}.{format_type}"
+        headers = {'Content-Disposition': f'attachment; filename={download_name}'}
+        etag = f'{digest}-{format_type}' if digest else None
+        if etag and request.if_none_match.contains(etag):
+            return conditional_bytes(b'', None, etag, IMMUTABLE_MAX_AGE, immutable=True,
+                                     headers=headers)
+
         from PIL import Image
-        img = Image.open(image_path)
-        
-        # Create a temporary file for the converted image
-        import tempfile
-        import uuid
-        
-        if format_type == 'png':
-            temp_filename = f"download_{uuid.uuid4()}.png"
-            temp_path = os.path.join(app.static_folder, temp_filename)
-            img.save(temp_path, 'PNG', optimize=True)
-            download_name = f"text-overlay-{uuid.uuid4().hex[:8]}.png"
-        elif format_type == 'webp':
-            temp_filename = f"download_{uuid.uuid4()}.webp"
-            temp_path = os.path.join(app.static_folder, temp_filename)
-            img.save(temp_path, 'WEBP', quality=90, optimize=True)
-            download_name = f"text-overlay-{uuid.uuid4().hex[:8]}.webp"
-        elif format_type == 'pdf':
-            temp_filename = f"download_{uuid.uuid4()}.pdf"
-            temp_path = os.path.join(app.static_folder, temp_filename)
-            # Convert to RGB if necessary for PDF
-            if img.mode in ('RGBA', 'LA', 'P'):
-                rgb_img = Image.new('RGB', img.size, (255, 255, 255))
-                rgb_img.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                rgb_img.save(temp_path, 'PDF', resolution=100.0)
+        buffer = io.BytesIO()
+        with Image.open(image_path) as img:
+            if format_type == 'png':
+                img.save(buffer, 'PNG', optimize=True)
+            elif format_type == 'webp':
+                img.save(buffer, 'WEBP', quality=90, optimize=True)
             else:
-                img.save(temp_path, 'PDF', resolution=100.0)
-            download_name = f"text-overlay-{uuid.uuid4().hex[:8]}.pdf"
-        else:  # original format
-            temp_path = image_path
-            original_ext = filename.split('.')[-1]
-            download_name = f"text-overlay-{uuid.uuid4().hex[:8]}.{original_ext}"
-        
-        # Send the file and clean up temporary file
-        def remove_file(response):
-            if temp_path != image_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
-            return response
-        
-        from flask import send_file
-        response = send_file(temp_path, as_attachment=True, download_name=download_name)
-        
-        # Schedule cleanup after response is sent
-        if temp_path != image_path:
-            import threading
-            def cleanup():
-                import time
-                time.sleep(5)  # Wait a bit before cleanup
-                try:
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
-                except:
-                    pass
-            threading.Thread(target=cleanup).start()
-        
-        return response
+                # Convert to RGB if necessary for PDF
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    img = img.convert('RGBA')
+                    rgb_img = Image.new('RGB', img.size, (255, 255, 255))
+                    rgb_img.paste(img, mask=img.split()[-1])
+                    img = rgb_img
+                img.save(buffer, 'PDF', resolution=100.0)
+        data = buffer.getvalue()
+        mimetype = {'png': 'image/png', 'webp': 'image/webp', 'pdf': 'application/pdf'}[format_type]
+        if etag:
+            return conditional_bytes(data, mimetype, etag, IMMUTABLE_MAX_AGE, immutable=True,
+                                     headers=headers)
+        return conditional_bytes(data, mimetype, hashlib.sha1(data).hexdigest()[:24], 0,
+                                 headers=headers)
         
     except Exception as e:
         return f"Error downloading image: {str(e)}", 500
 
 
+@app.route('/metrics')
+def metrics():
+    # Prometheus scrape endpoint: stage timings, request latency, cache hit ratios
+    return REGISTRY.render(), 200, {'Content-Type': CONTENT_TYPE}
+
+
 @app.route('/test-url')
 def test_url():
     # Test endpoint to check if a URL works
@@ -561,4 +1273,7 @@ def profile():
 
 
 if __name__ == "__main__":
+    # With the debug reloader only the serving child renders the random pool
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        random_pool.start()
     app.run(host='0.0.0.0', port=3000, debug=True)
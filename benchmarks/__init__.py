@@ -0,0 +1 @@
+"""Offline benchmarks for the render and ingest hot paths."""
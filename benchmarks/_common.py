@@ -0,0 +1,133 @@
+# Shared helpers for the benchmark scripts
+import io
+import os
+import statistics
+import sys
+import time
+
+import numpy
+from PIL import Image, ImageDraw
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Make the repo packages importable when run as `python benchmarks/<script>.py`
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def synthetic_image(width, height, seed=0):
+    """Build a deterministic photo-like RGB image (gradients, shapes and noise)."""
+    rng = numpy.random.default_rng(seed)
+    y, x = numpy.mgrid[0:height, 0:width].astype(numpy.float32)
+    r = 127 + 127 * numpy.sin(x / (width / 7.0) + seed)
+    g = 127 + 127 * numpy.cos(y / (height / 5.0))
+    b = 255 * (x + y) / float(width + height)
+    pixels = numpy.stack([r, g, b], axis=-1)
+    pixels += rng.normal(0, 12, pixels.shape)
+    img = Image.fromarray(numpy.clip(pixels, 0, 255).astype(numpy.uint8), 'RGB')
+
+    draw = ImageDraw.Draw(img)
+    for _ in range(40):
+        x0, y0 = int(rng.integers(0, width)), int(rng.integers(0, height))
+        size = int(rng.integers(width // 40 + 1, width // 6 + 2))
+        color = tuple(int(c) for c in rng.integers(0, 256, 3))
+        draw.ellipse((x0, y0, x0 + size, y0 + size), fill=color)
+    return img
+
+
+def synthetic_file(directory, width, height, fmt='JPEG', seed=0, quality=90):
+    """Write a synthetic image to directory and return its path."""
+    extension = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}[fmt]
+    path = os.path.join(directory, f'synthetic_{width}x{height}_{seed}.{extension}')
+    if not os.path.exists(path):
+        img = synthetic_image(width, height, seed)
+        if fmt == 'JPEG':
+            img.save(path, fmt, quality=quality)
+        else:
+            img.save(path, fmt)
+    return path
+
+
+def encode(img, fmt='JPEG', **params):
+    """Encode an image into bytes."""
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+def time_call(fn, repeat=5, warmup=1):
+    """Call fn repeatedly and return timing stats in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'max_ms': round(max(samples), 3),
+        'repeat': repeat,
+    }
+
+
+def reset_peak_rss():
+    """Reset the peak RSS counter where the kernel allows it (Linux)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss_kb():
+    """Return the peak resident set size of this process in KiB, if known."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def ssim(img_a, img_b):
+    """Mean structural similarity of two same-sized images (luma, 8x8 windows)."""
+    a = numpy.asarray(img_a.convert('L'), dtype=numpy.float64)
+    b = numpy.asarray(img_b.convert('L'), dtype=numpy.float64)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+
+    def window_mean(values, size=8):
+        # Box filter via a summed-area table
+        table = numpy.pad(values, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+        total = (table[size:, size:] - table[:-size, size:]
+                 - table[size:, :-size] + table[:-size, :-size])
+        return total / (size * size)
+
+    mu_a, mu_b = window_mean(a), window_mean(b)
+    var_a = window_mean(a * a) - mu_a ** 2
+    var_b = window_mean(b * b) - mu_b ** 2
+    covariance = window_mean(a * b) - mu_a * mu_b
+    score = ((2 * mu_a * mu_b + c1) * (2 * covariance + c2)) / (
+        (mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(score.mean())
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned text table."""
+    widths = [max(len(str(col)), *(len(str(row.get(col, ''))) for row in rows))
+              for col in columns]
+    print('  '.join(str(col).ljust(w) for col, w in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(str(row.get(col, '')).ljust(w) for col, w in zip(columns, widths)))
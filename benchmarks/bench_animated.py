@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the animated overlay pipeline on 100+ frame inputs.
+
+Compares redrawing the text on every frame with compositing one
+pre-rendered text layer, serially and across a thread pool, and times the
+GIF / animated WebP encoders.
+
+Usage: python benchmarks/bench_animated.py [--frames 120] [--workers 1 2 4]
+"""
+import argparse
+import json
+import os
+import tempfile
+import textwrap
+import time
+
+from _common import ROOT, print_table, synthetic_image
+from PIL import Image, ImageDraw, ImageSequence
+
+from ImageProcessor import ImageProcessor
+from ImageProcessor.Fonts import load_font
+from ImageProcessor.ImageEncoder import encode_animation
+from ImageProcessor.ImageLoader import target_size
+
+TEXT = 'Animated captions should cost one layout, not one per frame'
+AUTHOR = 'Benchmark'
+
+
+def synthetic_gif(path, frames, size):
+    base = synthetic_image(*size, seed=1)
+    images = []
+    for i in range(frames):
+        # Shift the base a little each frame so frames differ
+        frame = base.rotate(i * 3, translate=(i % 20, 0))
+        images.append(frame.quantize(256, method=Image.Quantize.FASTOCTREE))
+    images[0].save(path, save_all=True, append_images=images[1:], duration=40, loop=0)
+    return path
+
+
+def layout_lines(draw, font, size, font_size=30, position_x=50, position_y=80):
+    # Per-line layout as make_meme did it before text layers
+    lines = textwrap.wrap(TEXT, width=40) + [f'- {AUTHOR}']
+    line_height = font_size + 5
+    start_y = int(position_y / 100 * size[1]) - len(lines) * line_height // 2
+    for i, line in enumerate(lines):
+        bbox = draw.textbbox((0, 0), line, font=font)
+        x = int(position_x / 100 * size[0]) - (bbox[2] - bbox[0]) // 2
+        y = start_y + i * line_height
+        yield line, max(5, x), max(5, min(y, size[1] - font_size - 5))
+
+
+def redraw_every_frame(path, width):
+    # The naive approach: lay out and draw the text again on each frame
+    source = Image.open(path)
+    size = target_size(source.size, width)
+    font = load_font('Impact', 30)
+    frames = []
+    for frame in ImageSequence.Iterator(source):
+        frame = frame.convert('RGB').resize(size)
+        draw = ImageDraw.Draw(frame)
+        for line, x, y in layout_lines(draw, font, size):
+            for dx in [-2, -1, 0, 1, 2]:
+                for dy in [-2, -1, 0, 1, 2]:
+                    if dx != 0 or dy != 0:
+                        draw.text((x + dx, y + dy), line, font=font, fill='black')
+            draw.text((x, y), line, font=font, fill='white')
+        frames.append(frame.quantize(256, method=Image.Quantize.FASTOCTREE))
+    return frames
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Animated overlay benchmark.')
+    parser.add_argument('--frames', type=int, default=120, help='Frames in the synthetic GIF.')
+    parser.add_argument('--size', type=int, nargs=2, default=[800, 600], help='Source frame size.')
+    parser.add_argument('--width', type=int, default=500, help='Output width.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4],
+                        help='Worker pool sizes to try.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    workdir = os.path.join(tempfile.gettempdir(), 'textoverlay-bench')
+    os.makedirs(workdir, exist_ok=True)
+    path = synthetic_gif(os.path.join(workdir, f'animated_{args.frames}.gif'),
+                         args.frames, tuple(args.size))
+    processor = ImageProcessor(workdir)
+
+    rows = []
+    _, elapsed = timed(lambda: redraw_every_frame(path, args.width))
+    rows.append({'case': 'redraw per frame', 'workers': 1, 'render_ms': round(elapsed, 1),
+                 'per_frame_ms': round(elapsed / args.frames, 2)})
+
+    animation = None
+    for workers in args.workers:
+        animation, elapsed = timed(lambda: processor.render_animated_meme(
+            path, TEXT, AUTHOR, width=args.width, position_y=80, output_format='gif',
+            workers=workers))
+        rows.append({'case': 'shared layer', 'workers': workers, 'render_ms': round(elapsed, 1),
+                     'per_frame_ms': round(elapsed / args.frames, 2)})
+
+    for output_format in ['gif', 'webp']:
+        if output_format == 'webp':
+            animation = processor.render_animated_meme(path, TEXT, AUTHOR, width=args.width,
+                                                       position_y=80, output_format='webp',
+                                                       workers=max(args.workers))
+        encoded = encode_animation(animation.frames, animation.durations, animation.loop,
+                                   output_format)
+        rows.append({'case': f'encode {output_format}', 'workers': 1,
+                     'render_ms': round(encoded.encode_ms, 1),
+                     'per_frame_ms': round(encoded.encode_ms / args.frames, 2),
+                     'bytes': encoded.size})
+
+    print(f'{args.frames} frames, {args.size[0]}x{args.size[1]} -> width {args.width}')
+    print_table(rows, ['case', 'workers', 'render_ms', 'per_frame_ms', 'bytes'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
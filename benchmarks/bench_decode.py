@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark source image decoding and resizing for large inputs.
+
+Compares the old path (full decode + NEAREST) with draft-mode JPEG decoding
+and the configurable resamplers, reporting decode time, peak memory and SSIM
+against a full-resolution LANCZOS reference.
+
+Usage: python benchmarks/bench_decode.py [--width 500] [--repeat 5]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+
+from _common import ROOT, peak_rss_kb, reset_peak_rss, print_table, ssim, synthetic_file, time_call
+from PIL import Image
+
+from ImageProcessor.ImageLoader import get_resampler, load_image, target_size
+
+SOURCE_SIZES = [(2000, 1500), (4000, 3000), (6000, 4000)]
+
+STRATEGIES = ['full+nearest', 'full+lanczos', 'draft+nearest', 'draft+bilinear',
+              'draft+bicubic', 'draft+lanczos']
+
+
+def full_decode(path, width, resample):
+    # The pre-draft path: decode at full size, then resize
+    img = Image.open(path)
+    img.load()
+    return img.resize(target_size(img.size, width), get_resampler(resample))
+
+
+def run_strategy(path, width, strategy, repeat):
+    decoder, resample = strategy.split('+')
+    if decoder == 'full':
+        render = lambda: full_decode(path, width, resample)
+    else:
+        render = lambda: load_image(path, width, resample)
+
+    # A forked child starts with its parent's high-water mark
+    reset_peak_rss()
+    baseline_kb = peak_rss_kb()
+    timing = time_call(render, repeat=repeat)
+    output = render()
+    peak_kb = peak_rss_kb()
+    return {
+        'timing': timing,
+        'peak_delta_kb': None if baseline_kb is None else peak_kb - baseline_kb,
+        'size': output.size,
+        'pixels': output.convert('RGB').tobytes(),
+    }
+
+
+def _child(queue, path, width, strategy, repeat):
+    queue.put(run_strategy(path, width, strategy, repeat))
+
+
+def measure_isolated(path, width, strategy, repeat):
+    # Run each case in a fresh process so peak RSS isn't shared between cases
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(queue, path, width, strategy, repeat))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Decode/resample benchmark.')
+    parser.add_argument('--width', type=int, default=500, help='Output width.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    workdir = os.path.join(tempfile.gettempdir(), 'textoverlay-bench')
+    os.makedirs(workdir, exist_ok=True)
+
+    rows = []
+    for width, height in SOURCE_SIZES:
+        path = synthetic_file(workdir, width, height, 'JPEG')
+        reference = full_decode(path, args.width, 'lanczos')
+
+        for strategy in STRATEGIES:
+            result = measure_isolated(path, args.width, strategy, args.repeat)
+            output = Image.frombytes('RGB', result['size'], result['pixels'])
+            rows.append({
+                'source': f'{width}x{height}',
+                'strategy': strategy,
+                'median_ms': result['timing']['median_ms'],
+                'peak_mem_kb': result['peak_delta_kb'],
+                'ssim': round(ssim(output, reference), 4),
+            })
+
+    print_table(rows, ['source', 'strategy', 'median_ms', 'peak_mem_kb', 'ssim'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark the NumPy text effects against drawing the text once per offset.
+
+The naive versions are what the old 5x5 outline loop generalizes to: an
+outline of width w costs (2w+1)^2 - 1 extra draws, and a soft shadow/glow
+drawn as translucent copies costs one draw per kernel tap. The vectorized
+versions draw the glyphs once and derive the effect from the coverage mask.
+
+Usage: python benchmarks/bench_effects.py [--sizes 24 48 96] [--repeat 5]
+"""
+import argparse
+import json
+
+from _common import ROOT, print_table, time_call
+from PIL import Image, ImageDraw
+
+from ImageProcessor.Fonts import load_font
+from ImageProcessor.TextEffects import Box, Glow, Outline, Shadow, effect_padding
+from ImageProcessor.TextLayer import render_text_block
+
+LINES = ['The only way to do great work', 'is to love what you do.', '- Steve Jobs']
+
+
+def naive_layer(lines, font, font_size, effect):
+    # Draw straight onto an RGBA layer, once per offset the effect needs
+    line_height = font_size + 5
+    pad = effect_padding([effect]) + 4
+    width = max(font.getbbox(line)[2] for line in lines) + 2 * pad
+    layer = Image.new('RGBA', (width, len(lines) * line_height + 2 * pad), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(layer)
+
+    def draw_lines(dx, dy, fill):
+        for i, line in enumerate(lines):
+            draw.text((pad + dx, pad + i * line_height + dy), line, font=font, fill=fill)
+
+    if isinstance(effect, Outline):
+        for dx in range(-effect.width, effect.width + 1):
+            for dy in range(-effect.width, effect.width + 1):
+                if dx or dy:
+                    draw_lines(dx, dy, (0, 0, 0, 255))
+    elif isinstance(effect, (Shadow, Glow)):
+        # Approximate the blur with translucent copies on a square kernel
+        reach = int(effect.blur) if isinstance(effect, Shadow) else effect.radius
+        base_x, base_y = effect.offset if isinstance(effect, Shadow) else (0, 0)
+        taps = (2 * reach + 1) ** 2
+        alpha = max(1, int(255 * effect.opacity * 3 / taps))
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                draw_lines(base_x + dx, base_y + dy, (0, 0, 0, alpha))
+    elif isinstance(effect, Box):
+        draw.rectangle((pad - effect.padding, pad - effect.padding,
+                        layer.size[0] - pad + effect.padding, layer.size[1] - pad + effect.padding),
+                       fill=(0, 0, 0, int(255 * effect.opacity)))
+    draw_lines(0, 0, (255, 255, 255, 255))
+    return layer
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text effect benchmark.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[24, 48, 96], help='Font sizes.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    effects = {
+        'outline w2': Outline(2),
+        'outline w6': Outline(6),
+        'outline w6 round': Outline(6, shape='round'),
+        'shadow': Shadow(offset=(4, 4), blur=3),
+        'glow': Glow(radius=8),
+        'box': Box(padding=10),
+    }
+
+    rows = []
+    for font_size in args.sizes:
+        font = load_font('Impact', font_size)
+        line_height = font_size + 5
+        for name, effect in effects.items():
+            naive = time_call(lambda: naive_layer(LINES, font, font_size, effect), args.repeat)
+            vectorized = time_call(lambda: render_text_block(LINES, font, line_height, 'white',
+                                                             (effect,)), args.repeat)
+            rows.append({
+                'font_size': font_size,
+                'effect': name,
+                'naive_ms': naive['median_ms'],
+                'numpy_ms': vectorized['median_ms'],
+                'speedup': round(naive['median_ms'] / vectorized['median_ms'], 2),
+            })
+
+    print_table(rows, ['font_size', 'effect', 'naive_ms', 'numpy_ms', 'speedup'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Load-test /create and /proxy-image against a local stand-in image origin.
+
+Starts an OriginServer (synthetic images with configurable latency, jitter,
+size and error rate), then drives the app from --concurrency worker threads
+and reports throughput, p50/p95/p99 latency and error rates per endpoint.
+The app runs in-process through the Flask test client ('inproc'), behind a
+local threaded WSGI server ('wsgi', real sockets and HTTP keep-alive), or
+anywhere else given a base URL (e.g. gunicorn on localhost; it has to reach
+the origin on 127.0.0.1). Like any /create request, the renders are
+written to the app's ./static.
+
+Usage:
+    python benchmarks/bench_load.py --endpoint proxy --concurrency 8 --requests 400
+    python benchmarks/bench_load.py --endpoint mix --server wsgi --duration 30 \\
+        --origin-latency-ms 120 --origin-jitter-ms 60 --origin-error-rate 0.02
+    python benchmarks/bench_load.py --server http://127.0.0.1:3000 --json load.json
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from _common import ROOT, print_table
+from origin import OriginServer
+
+ENDPOINTS = ('create', 'proxy', 'mix')
+
+TEXT = 'The only way to do great work is to love what you do.'
+
+
+def percentile(sorted_values, share):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(share * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class InProcessClient:
+    """Flask test client with the same call shape as a requests.Session."""
+
+    def __init__(self, app) -> None:
+        self.client = app.test_client()
+
+    def get(self, path, params=None):
+        response = self.client.get(path, query_string=params)
+        return response.status_code
+
+    def post(self, path, data=None, headers=None):
+        response = self.client.post(path, data=data, headers=headers)
+        return response.status_code
+
+
+class HTTPClient:
+    """requests.Session against a base URL, one per worker so connections are reused."""
+
+    def __init__(self, base_url) -> None:
+        self.base_url = base_url.rstrip('/')
+        self.session = requests.Session()
+
+    def get(self, path, params=None):
+        return self.session.get(self.base_url + path, params=params, timeout=60).status_code
+
+    def post(self, path, data=None, headers=None):
+        return self.session.post(self.base_url + path, data=data, headers=headers,
+                                 timeout=60).status_code
+
+
+def request_once(client, endpoint, image_url, n):
+    if endpoint == 'proxy':
+        return client.get('/proxy-image', params={'url': image_url})
+    # A new caption per request, so every render misses the text layer cache
+    return client.post('/create', headers={'X-Requested-With': 'XMLHttpRequest'}, data={
+        'body': f'{TEXT} #{n}', 'author': 'Steve Jobs', 'image_source': 'url',
+        'image_url': image_url, 'font_size': '40', 'add_outline': 'on'})
+
+
+@contextlib.contextmanager
+def wsgi_server(app):
+    """Serve app on a local threaded WSGI server, yielding its base URL."""
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    thread = threading.Thread(target=server.serve_forever, name='wsgi', daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        thread.join()
+
+
+def run_load(make_client, args, origin):
+    """Drive the app from args.concurrency threads; returns per-endpoint samples."""
+    samples = []  # (endpoint, seconds, status code or exception name)
+    lock = threading.Lock()
+    issued = iter(range(args.requests)) if args.requests else None
+    deadline = time.perf_counter() + args.duration if not args.requests else None
+    counter = iter(range(1 << 62))
+
+    def next_request():
+        with lock:
+            if issued is not None:
+                return next(issued, None)
+            return next(counter) if time.perf_counter() < deadline else None
+
+    def worker(index):
+        client = make_client()
+        rng = random.Random(args.seed + index)
+        local = []
+        while True:
+            n = next_request()
+            if n is None:
+                break
+            endpoint = args.endpoint if args.endpoint != 'mix' else rng.choice(('create', 'proxy'))
+            image_url = origin.url(rng.randrange(args.origin_images))
+            start = time.perf_counter()
+            try:
+                outcome = request_once(client, endpoint, image_url, n)
+            except Exception as e:
+                outcome = type(e).__name__
+            local.append((endpoint, time.perf_counter() - start, outcome))
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    """One row per endpoint plus a total: throughput, latency percentiles, errors."""
+    groups = {}
+    for endpoint, seconds, outcome in samples:
+        groups.setdefault(endpoint, []).append((seconds, outcome))
+    groups = dict(sorted(groups.items()))
+    if len(groups) > 1:
+        groups['total'] = [(seconds, outcome) for _, seconds, outcome in samples]
+
+    rows = []
+    for endpoint, results in groups.items():
+        latencies = sorted(seconds * 1000 for seconds, _ in results)
+        outcomes = Counter(outcome for _, outcome in results)
+        errors = sum(count for outcome, count in outcomes.items()
+                     if not isinstance(outcome, int) or outcome >= 400)
+        rows.append({
+            'endpoint': endpoint,
+            'requests': len(results),
+            'rps': round(len(results) / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.50), 1),
+            'p95_ms': round(percentile(latencies, 0.95), 1),
+            'p99_ms': round(percentile(latencies, 0.99), 1),
+            'max_ms': round(latencies[-1], 1),
+            'errors': errors,
+            'error_rate': round(errors / len(results), 4),
+            'statuses': ' '.join(f'{outcome}:{count}' for outcome, count in
+                                 sorted(outcomes.items(), key=lambda item: str(item[0]))),
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test against a local image origin.')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='mix',
+                        help='Endpoint to drive, or an even mix of both.')
+    parser.add_argument('--server', default='inproc',
+                        help="'inproc' (Flask test client), 'wsgi' (local threaded server) "
+                             'or the base URL of a running app.')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients.')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='Total requests (0 to run for --duration instead).')
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help='Seconds to run when --requests is 0.')
+    parser.add_argument('--warmup', type=int, default=4, help='Untimed requests first.')
+    parser.add_argument('--origin-latency-ms', type=float, default=50.0)
+    parser.add_argument('--origin-jitter-ms', type=float, default=0.0)
+    parser.add_argument('--origin-error-rate', type=float, default=0.0)
+    parser.add_argument('--origin-size', type=int, nargs=2, default=[1200, 800],
+                        metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--origin-images', type=int, default=8,
+                        help='Distinct image URLs (1 makes every fetch the same URL).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="Keep the app's stdout logging.")
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    origin = OriginServer(size=tuple(args.origin_size), images=args.origin_images,
+                          latency_ms=args.origin_latency_ms, jitter_ms=args.origin_jitter_ms,
+                          error_rate=args.origin_error_rate, seed=args.seed)
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(origin)
+        if args.server in ('inproc', 'wsgi'):
+            # Every request comes from one client, don't rate limit it unless asked to
+            os.environ.setdefault('CLIENT_RATE', '0')
+            from app import app
+            if args.server == 'inproc':
+                make_client = lambda: InProcessClient(app)
+            else:
+                base_url = stack.enter_context(wsgi_server(app))
+                make_client = lambda: HTTPClient(base_url)
+        else:
+            make_client = lambda: HTTPClient(args.server)
+        if not args.verbose:
+            # The handlers print per request; that would swamp the report and skew timings
+            devnull = stack.enter_context(open(os.devnull, 'w'))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+
+        warmup = make_client()
+        for n in range(args.warmup):
+            endpoint = ('create', 'proxy')[n % 2] if args.endpoint == 'mix' else args.endpoint
+            request_once(warmup, endpoint, origin.url(n % args.origin_images), -1 - n)
+        warmup_hits, warmup_errors = origin.hits, origin.errors
+
+        samples, elapsed = run_load(make_client, args, origin)
+
+    rows = summarize(samples, elapsed)
+    print_table(rows, ['endpoint', 'requests', 'rps', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms',
+                       'errors', 'error_rate', 'statuses'])
+    origin_hits = origin.hits - warmup_hits
+    origin_errors = origin.errors - warmup_errors
+    print(f'\n{len(samples)} requests in {elapsed:.2f}s at concurrency {args.concurrency}, '
+          f'{origin_hits} origin fetches ({origin_errors} failed by design)')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'elapsed_s': round(elapsed, 3),
+                       'origin_hits': origin_hits,
+                       'origin_errors': origin_errors, 'results': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
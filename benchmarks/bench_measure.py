@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark text measurement: textbbox against the advance tables.
+
+Measures every word and every line of a small quote corpus per case, the
+way wrapping and auto-fit do. 'textbbox' is ImageDraw.textbbox, 'getlength'
+is FreeType's advance-only layout, 'table width' / 'table ink' are
+TextMeasure's summed advances and ink extents on a warm table, and
+'table cold' measures the widths with a new table (a font size seen for
+the first time). Mismatches against textbbox/getlength are counted so a
+speedup can't hide a wrong answer.
+
+Usage: python benchmarks/bench_measure.py [--sizes 16 40 96] [--repeat 20]
+"""
+import argparse
+import json
+
+from _common import ROOT, print_table, time_call
+from PIL import Image, ImageDraw
+
+from ImageProcessor.Fonts import load_font
+from ImageProcessor.TextMeasure import FontMetrics
+
+QUOTES = [
+    'The only way to do great work is to love what you do.',
+    'Life is what happens when you are busy making other plans.',
+    'In the middle of every difficulty lies opportunity.',
+    'Whether you think you can, or you think you can\'t - you\'re right.',
+    'It always seems impossible until it\'s done.',
+    'Café au lait, naïve façade: “smart quotes” & 100% accents.',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text measurement micro-benchmark.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 40, 96], help='Font sizes.')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    words = [word for quote in QUOTES for word in quote.split()]
+    strings = words + QUOTES
+    draw = ImageDraw.Draw(Image.new('L', (1, 1)))
+
+    rows = []
+    for font_size in args.sizes:
+        font = load_font('Impact', font_size)
+        metrics = FontMetrics(font)
+
+        mismatches = sum(1 for s in strings if metrics.width(s) != font.getlength(s))
+        mismatches += sum(1 for s in strings
+                          if metrics.ink_extent(s) != tuple(draw.textbbox((0, 0), s, font=font)[::2]))
+
+        cases = {
+            'textbbox': lambda: [draw.textbbox((0, 0), s, font=font) for s in strings],
+            'getlength': lambda: [font.getlength(s) for s in strings],
+            'table width': lambda: [metrics.width(s) for s in strings],
+            'table ink': lambda: [metrics.ink_extent(s) for s in strings],
+            'table cold': lambda: [cold.width(s) for cold in [FontMetrics(font)] for s in strings],
+        }
+        baseline = None
+        for name, fn in cases.items():
+            stats = time_call(fn, args.repeat)
+            baseline = baseline or stats['median_ms']
+            rows.append({'font_size': font_size, 'case': name, 'strings': len(strings),
+                         'median_ms': stats['median_ms'],
+                         'speedup': round(baseline / stats['median_ms'], 1),
+                         'mismatches': mismatches if name.startswith('table') else ''})
+
+    print_table(rows, ['font_size', 'case', 'strings', 'median_ms', 'speedup', 'mismatches'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Page weight of the editor pages before and after moving their inline JS/CSS
+into fingerprinted, precompressed assets.
+
+Every page is rendered through the test client. 'before' puts each asset
+back inline, which gives the page as it was served before the move: one
+uncompressed HTML response that nothing could cache. 'after' is the
+gzipped HTML plus its assets in the best encoding a browser would get (br,
+else gzip), and on a repeat visit only the HTML, since the assets are
+cached as immutable.
+
+Time to interactive is modelled, not measured in a browser. The page is
+taken as interactive once its HTML and its own blocking scripts and
+stylesheets have arrived. The HTML is one round trip plus its transfer;
+the assets add one more round trip and their transfer, as they're fetched
+in parallel once the HTML has been parsed. Third-party CDN resources are
+the same before and after and are left out, which makes the extra round
+trip an upper bound: every page also loads CDN scripts found in the same
+HTML, fetched alongside the assets, and those usually hide it.
+
+Usage: python benchmarks/bench_pages.py [--json pages.json]
+"""
+import argparse
+import json
+import os
+import re
+
+from _common import ROOT, print_table
+
+PAGES = ['/', '/create', '/canvas_creator', '/advanced', '/pro', '/meme_rand', '/fabric']
+
+# (name, bits per second, round trip seconds), roughly Lighthouse's throttling presets
+NETWORKS = [('3g', 1.6e6, 0.300), ('4g', 9e6, 0.150), ('cable', 5e6, 0.028)]
+
+ASSET_TAG = re.compile(r'<script src="/assets/([^"]+)"></script>'
+                       r'|<link rel="stylesheet" href="/assets/([^"]+)">')
+
+
+def transfer_seconds(size, bandwidth, rtt, round_trips=1):
+    return round_trips * rtt + size * 8 / bandwidth
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Page weight before/after the asset build.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    os.environ.setdefault('CLIENT_RATE', '0')
+    from app import app, assets
+
+    source_of = {entry['file']: name for name, entry in assets.manifest.items()}
+    client = app.test_client()
+    rows = []
+    for page in PAGES:
+        response = client.get(page)
+        if response.status_code != 200:
+            continue
+        html = response.get_data(as_text=True)
+        after_html = len(client.get(page, headers={'Accept-Encoding': 'br, gzip'}).data)
+
+        def inline(match):
+            built = match.group(1) or match.group(2)
+            with open(os.path.join(assets.source_dir, *source_of[built].split('/')),
+                      encoding='utf-8') as f:
+                content = f.read()
+            tag = 'script' if match.group(1) else 'style'
+            return f'<{tag}>\n{content}</{tag}>'
+
+        before = len(ASSET_TAG.sub(inline, html).encode('utf-8'))
+        raw = encoded = 0
+        for match in ASSET_TAG.finditer(html):
+            built = match.group(1) or match.group(2)
+            asset = client.get('/assets/' + built, headers={'Accept-Encoding': 'br, gzip'})
+            raw += assets.manifest[source_of[built]]['size']
+            encoded += len(asset.data)
+
+        row = {'page': page, 'before_kb': round(before / 1024, 1),
+               'html_kb': round(after_html / 1024, 1), 'assets_kb': round(raw / 1024, 1),
+               'assets_wire_kb': round(encoded / 1024, 1),
+               'first_visit_kb': round((after_html + encoded) / 1024, 1),
+               'repeat_visit_kb': round(after_html / 1024, 1)}
+        for name, bandwidth, rtt in NETWORKS:
+            row[f'tti_{name}_before_ms'] = round(transfer_seconds(before, bandwidth, rtt) * 1000)
+            first = transfer_seconds(after_html, bandwidth, rtt)
+            if encoded:
+                first += transfer_seconds(encoded, bandwidth, rtt)
+            row[f'tti_{name}_first_ms'] = round(first * 1000)
+            row[f'tti_{name}_repeat_ms'] = round(
+                transfer_seconds(after_html, bandwidth, rtt) * 1000)
+        rows.append(row)
+
+    print_table(rows, ['page', 'before_kb', 'html_kb', 'assets_kb', 'assets_wire_kb',
+                       'first_visit_kb', 'repeat_visit_kb'])
+    print()
+    print_table(rows, ['page'] + [f'tti_{name}_{when}_ms' for name, _, _ in NETWORKS
+                                  for when in ('before', 'first', 'repeat')])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'networks': NETWORKS, 'pages': rows}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
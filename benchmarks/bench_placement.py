@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark automatic text placement (ImageProcessor.Placement) on large images.
+
+For each source size and render width the base is decoded and resized the
+way render_meme does it, then:
+- map_ms:      building the summed-area tables (PlacementMap)
+- place_ms:    scoring every candidate position for the text layer
+- brute_ms:    the same candidates scored by summing each box at full
+               resolution, what the summed-area tables replace
+- render_ms / render_auto_ms: render_meme without and with auto_place,
+               with a warm text layer cache
+- stage_ms:    the 'place' stage inside render_auto_ms (on_stage hook), and
+               its share of the render; the end-to-end difference is mostly
+               noise from decoding and resizing large sources
+- score_center / score_auto: placement score (lower is calmer, better
+               contrast) of the centered default and of the chosen spot
+
+Usage: python benchmarks/bench_placement.py [--sources 2000x1500 6000x4000]
+                                            [--widths 500 1200] [--json out.json]
+"""
+import argparse
+import json
+import statistics
+import tempfile
+
+from _common import print_table, synthetic_file, time_call
+
+import numpy
+
+from ImageProcessor import ImageProcessor, load_image
+from ImageProcessor.Placement import (PlacementMap, GRID_STEPS, CLUTTER_WEIGHT,
+                                      SPREAD_WEIGHT, CONTRAST_WEIGHT)
+
+TEXT = 'When the build is green on the first try and nobody believes you'
+AUTHOR = 'Anonymous'
+
+
+def brute_force(base, layer_size, padding):
+    # Score the grid by summing every box directly, at full resolution
+    luminance = numpy.asarray(base.convert('L'), dtype=numpy.float32) / 255
+    edges = numpy.zeros_like(luminance)
+    horizontal = numpy.abs(numpy.diff(luminance, axis=1))
+    vertical = numpy.abs(numpy.diff(luminance, axis=0))
+    edges[:, 1:] += horizontal
+    edges[:, :-1] += horizontal
+    edges[1:, :] += vertical
+    edges[:-1, :] += vertical
+    edges /= 2
+
+    height, width = luminance.shape
+    box_width, box_height = layer_size[0] - 2 * padding, layer_size[1] - 2 * padding
+    best = None
+    for top in numpy.linspace(0, height - box_height, GRID_STEPS).astype(int):
+        for left in numpy.linspace(0, width - box_width, GRID_STEPS).astype(int):
+            box = luminance[top:top + box_height, left:left + box_width]
+            mean = box.mean()
+            score = (CLUTTER_WEIGHT * edges[top:top + box_height, left:left + box_width].mean()
+                     + SPREAD_WEIGHT * box.std() - CONTRAST_WEIGHT * max(mean, 1 - mean))
+            best = score if best is None else min(best, score)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Automatic text placement benchmark.')
+    parser.add_argument('--sources', nargs='+', default=['2000x1500', '4000x3000', '6000x4000'],
+                        help='Source image sizes, WIDTHxHEIGHT.')
+    parser.add_argument('--widths', type=int, nargs='+', default=[500, 1200, 2400],
+                        help='Render widths.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        stages = []
+        processor = ImageProcessor(output_dir=directory, on_stage=lambda name, seconds: (
+            stages.append(seconds * 1000) if name == 'place' else None))
+        for source in args.sources:
+            source_width, source_height = (int(n) for n in source.split('x'))
+            path = synthetic_file(directory, source_width, source_height)
+            for width in args.widths:
+                base = load_image(path, width)
+                style = dict(width=width, font_size=max(12, width // 18), text_color='white')
+                layer = processor.render_text_layer(TEXT, AUTHOR, width,
+                                                    font_size=style['font_size'])
+                placement_map = PlacementMap(base)
+                chosen = placement_map.place(layer.size, 'white', padding=layer.padding)
+                center = placement_map.place(layer.size, 'white', (50, 50), layer.padding)
+
+                row = {'source': source, 'width': width, 'base': '{}x{}'.format(*base.size),
+                       'layer': '{}x{}'.format(*layer.size),
+                       'map_ms': time_call(lambda: PlacementMap(base), args.repeat)['median_ms'],
+                       'place_ms': time_call(lambda: placement_map.place(
+                           layer.size, 'white', padding=layer.padding), args.repeat)['median_ms'],
+                       'brute_ms': time_call(lambda: brute_force(base, layer.size, layer.padding),
+                                             1, 0)['median_ms'],
+                       'score_center': round(center.score, 3),
+                       'score_auto': round(chosen.score, 3)}
+                row['render_ms'] = time_call(lambda: processor.render_meme(
+                    path, TEXT, AUTHOR, **style), args.repeat)['median_ms']
+                stages.clear()
+                row['render_auto_ms'] = time_call(lambda: processor.render_meme(
+                    path, TEXT, AUTHOR, auto_place=True, **style), args.repeat)['median_ms']
+                row['stage_ms'] = round(statistics.median(stages), 3)
+                row['stage_share'] = f"{row['stage_ms'] / row['render_auto_ms']:.1%}"
+                rows.append(row)
+                print(f"{source} @ {width}px: place {row['stage_ms']:.2f} ms "
+                      f"of {row['render_auto_ms']:.1f} ms")
+
+    print()
+    print_table(rows, ['source', 'width', 'base', 'layer', 'map_ms', 'place_ms', 'brute_ms',
+                       'render_ms', 'render_auto_ms', 'stage_ms', 'stage_share', 'score_center',
+                       'score_auto'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark editor previews against the full /create render path.
+
+'create' is what every editor tweak used to cost: full decode, render at
+500px, balanced encode and a file write. 'preview cold' decodes the base
+once, 'preview warm' only moves the text (cached base and layer) and
+'preview edit' changes the text (cached base, new layer).
+
+Usage: python benchmarks/bench_preview.py [--width 320] [--repeat 10]
+"""
+import argparse
+import itertools
+import json
+import tempfile
+
+from _common import ROOT, print_table, synthetic_file, time_call
+
+from ImageProcessor import ImageProcessor
+from ImageProcessor.PreviewRenderer import PreviewRenderer, source_key
+
+SOURCE_SIZES = [(1200, 800), (4000, 3000)]
+
+TEXT = 'The only way to do great work is to love what you do.'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Preview rendering benchmark.')
+    parser.add_argument('--width', type=int, default=320, help='Preview width.')
+    parser.add_argument('--repeat', type=int, default=10, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for width, height in SOURCE_SIZES:
+            path = synthetic_file(tmp, width, height)
+            with open(path, 'rb') as f:
+                data = f.read()
+            key = source_key(data=data)
+
+            # A fresh processor per call, a tweak usually changes the text anyway
+            create = time_call(lambda: ImageProcessor(tmp).make_meme(path, TEXT, 'Steve Jobs',
+                                                                     font_size=40), args.repeat)
+
+            def cold():
+                renderer = PreviewRenderer(ImageProcessor(tmp))
+                renderer.render(key, lambda: data, TEXT, 'Steve Jobs', args.width, font_size=40)
+
+            renderer = PreviewRenderer(ImageProcessor(tmp))
+            positions = itertools.cycle(range(10, 90, 5))
+            warm = lambda: renderer.render(key, lambda: data, TEXT, 'Steve Jobs', args.width,
+                                           font_size=40, position_x=next(positions))
+            edits = itertools.count()
+            edit = lambda: renderer.render(key, lambda: data, f'{TEXT} {next(edits)}',
+                                           'Steve Jobs', args.width, font_size=40)
+
+            for name, fn in [('create', create), ('preview cold', cold),
+                             ('preview warm', warm), ('preview edit', edit)]:
+                stats = fn if isinstance(fn, dict) else time_call(fn, args.repeat)
+                rows.append({'source': f'{width}x{height}', 'case': name,
+                             'median_ms': stats['median_ms'], 'max_ms': stats['max_ms']})
+
+    print_table(rows, ['source', 'case', 'median_ms', 'max_ms'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Compare the development server with the gunicorn production setup.
+
+Starts each server as a subprocess on a free port, times its first request
+(what warm-up saves), drives it with bench_load's clients against a local
+OriginServer, and reads the memory of every process in its tree from /proc
+(Linux) after the run. RSS counts shared pages in full in every process;
+PSS splits them between the processes sharing them, so the PSS of a worker
+is what it really adds, and 'shared' shows how much it got from the preload.
+
+Servers:
+    dev            python app.py as shipped (Flask's server with the debug reloader)
+    gunicorn       gunicorn -c gunicorn.conf.py wsgi:app
+    gunicorn-cold  the same with WARM_UP=0 (preloaded, but no warm-up)
+
+Like bench_load, the renders are written to the app's ./static.
+
+Usage:
+    python benchmarks/bench_server.py --servers dev,gunicorn --workers 2 --threads 4
+    python benchmarks/bench_server.py --endpoint create --duration 20 --json server.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+from _common import ROOT, print_table
+from bench_load import ENDPOINTS, HTTPClient, request_once, run_load, summarize
+from origin import OriginServer
+
+SERVERS = ('dev', 'gunicorn', 'gunicorn-cold')
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_command(name, port):
+    if name == 'dev':
+        # app.py's own __main__ block, on our port
+        return [sys.executable, '-c',
+                f"from app import app; app.run(host='127.0.0.1', port={port}, debug=True)"]
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app']
+
+
+@contextlib.contextmanager
+def running_server(name, args):
+    """Start a server and yield (base URL, pid, seconds until it answered)."""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), CLIENT_RATE='0', GUNICORN_ACCESS_LOG='',
+               WEB_CONCURRENCY=str(args.workers), GUNICORN_THREADS=str(args.threads))
+    if name == 'gunicorn-cold':
+        env['WARM_UP'] = '0'
+    log = open(os.devnull, 'w') if not args.verbose else None
+    start = time.perf_counter()
+    process = subprocess.Popen(server_command(name, port), cwd=ROOT, env=env,
+                               stdout=log, stderr=log)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'{name} exited with status {process.returncode}')
+            try:
+                requests.get(base_url + '/', timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.1)
+            if time.perf_counter() - start > 60:
+                raise RuntimeError(f'{name} did not start within 60s')
+        yield base_url, process.pid, time.perf_counter() - start
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        if log is not None:
+            log.close()
+
+
+def process_tree(pid):
+    """pid and all its descendants, parents first."""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                with open(f'/proc/{entry}/stat') as f:
+                    # The command name may contain spaces, the fields after it don't
+                    fields = f.read().rsplit(')', 1)[1].split()
+            except OSError:
+                continue
+            parents.setdefault(int(fields[1]), []).append(int(entry))
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop(0)
+        tree.append(current)
+        pending.extend(sorted(parents.get(current, [])))
+    return tree
+
+
+def memory_kb(pid) -> dict:
+    """RSS, PSS, shared and private KiB of a process (smaps_rollup needs Linux 4.14+)."""
+    totals = {'Rss': 0, 'Pss': 0, 'Shared_Clean': 0, 'Shared_Dirty': 0,
+              'Private_Clean': 0, 'Private_Dirty': 0}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in totals:
+                totals[key] = int(value.split()[0])
+    return {'rss': totals['Rss'], 'pss': totals['Pss'],
+            'shared': totals['Shared_Clean'] + totals['Shared_Dirty'],
+            'private': totals['Private_Clean'] + totals['Private_Dirty']}
+
+
+def memory_rows(name, pid):
+    rows = []
+    try:
+        tree = process_tree(pid)
+    except OSError:
+        return rows  # no /proc
+    for index, child in enumerate(tree):
+        try:
+            usage = memory_kb(child)
+        except OSError:
+            continue
+        if name == 'dev':
+            role = 'reloader' if index == 0 else 'server'
+        else:
+            role = 'master' if index == 0 else 'worker'
+        rows.append({'server': name, 'pid': child, 'role': role,
+                     **{f'{key}_mb': round(kb / 1024, 1) for key, kb in usage.items()}})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Dev server vs gunicorn benchmark.')
+    parser.add_argument('--servers', default='dev,gunicorn',
+                        help=f"Comma-separated, from {', '.join(SERVERS)}.")
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes.')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per gunicorn worker.')
+    parser.add_argument('--endpoint', choices=ENDPOINTS, default='mix')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients.')
+    parser.add_argument('--requests', type=int, default=0,
+                        help='Total requests per server (0 to run for --duration instead).')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--origin-latency-ms', type=float, default=50.0)
+    parser.add_argument('--origin-images', type=int, default=8)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help="Show the servers' output.")
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.servers.split(',') if name.strip()]
+    unknown = set(names) - set(SERVERS)
+    if unknown:
+        parser.error(f"unknown server(s): {', '.join(sorted(unknown))}")
+
+    load_rows, memory = [], []
+    with OriginServer(size=(1200, 800), images=args.origin_images,
+                      latency_ms=args.origin_latency_ms, seed=args.seed) as origin:
+        for name in names:
+            with running_server(name, args) as (base_url, pid, startup_s):
+                client = HTTPClient(base_url)
+                start = time.perf_counter()
+                request_once(client, 'create', origin.url(0), -1)
+                first_ms = (time.perf_counter() - start) * 1000
+
+                samples, elapsed = run_load(lambda: HTTPClient(base_url), args, origin)
+                for row in summarize(samples, elapsed):
+                    if row['endpoint'] in (args.endpoint, 'total'):
+                        load_rows.append({'server': name, 'startup_s': round(startup_s, 2),
+                                          'first_ms': round(first_ms, 1), **row})
+                memory.extend(memory_rows(name, pid))
+
+    print_table(load_rows, ['server', 'endpoint', 'startup_s', 'first_ms', 'requests', 'rps',
+                            'p50_ms', 'p95_ms', 'p99_ms', 'errors'])
+    if memory:
+        print()
+        print_table(memory, ['server', 'pid', 'role', 'rss_mb', 'pss_mb', 'shared_mb',
+                             'private_mb'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'config': vars(args), 'load': load_rows, 'memory': memory}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
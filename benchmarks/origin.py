@@ -0,0 +1,100 @@
+# Local stand-in for remote image hosts, for load tests and fetch benchmarks
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from _common import encode, synthetic_image
+
+FORMATS = {'jpg': ('JPEG', 'image/jpeg'), 'png': ('PNG', 'image/png'),
+           'webp': ('WEBP', 'image/webp')}
+
+
+class OriginServer:
+    """Threaded HTTP server on 127.0.0.1 serving synthetic images at /images/<n>.<ext>.
+
+    Images are encoded once up front, so a request only costs the simulated
+    latency. Use as a context manager; the port is picked by the OS.
+
+    :param size: (width, height) of the served images.
+    :param images: number of distinct images (n in the URL is taken modulo this).
+    :param latency_ms: delay before each response.
+    :param jitter_ms: extra random delay, uniform in 0..jitter_ms.
+    :param error_rate: share of requests answered with 503, 0 to 1.
+    :param seed: seed for the images, jitter and errors.
+    """
+
+    def __init__(self, size=(1200, 800), images=8, latency_ms=50, jitter_ms=0,
+                 error_rate=0.0, fmt='jpg', seed=0) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.fmt = fmt
+        pil_format, self.content_type = FORMATS[fmt]
+        self.bodies = [encode(synthetic_image(*size, seed=seed + i), pil_format)
+                       for i in range(images)]
+        self.hits = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def url(self, n=0) -> str:
+        return f'http://127.0.0.1:{self.port}/images/{n}.{self.fmt}'
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        origin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                origin._respond(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='origin',
+                                        daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _respond(self, handler):
+        with self._lock:
+            self.hits += 1
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        time.sleep(delay / 1000)
+
+        try:
+            n = int(handler.path.split('/images/', 1)[1].split('.', 1)[0])
+        except (IndexError, ValueError):
+            handler.send_error(404)
+            return
+        if failed:
+            handler.send_error(503)
+            return
+        body = self.bodies[n % len(self.bodies)]
+        handler.send_response(200)
+        handler.send_header('Content-Type', self.content_type)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the render and ingest hot paths, comparable across commits.
+
+Runs offline on synthetic inputs only:
+- render: ImageProcessor.make_meme over source sizes x fonts x outline
+  on/off, a fresh processor per call so the text layer is rendered too
+- parse:  every TextParser strategy over a generated quote corpus (PDF
+  needs pdftotext and is skipped without it)
+- http:   POST /create with an uploaded image through the Flask test client
+
+Results go to a JSON file with the commit and environment. --compare runs
+the suite (or loads --current) and compares median times with a baseline;
+the exit status is 1 when a case got slower than --threshold allows.
+
+Usage:
+    python benchmarks/run_suite.py --json before.json
+    python benchmarks/run_suite.py --compare before.json [--threshold 0.15]
+    python benchmarks/run_suite.py --compare before.json --current after.json
+    python benchmarks/run_suite.py --only render --repeat 3
+"""
+import argparse
+import csv
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from _common import ROOT, print_table, synthetic_file, time_call
+
+import PIL
+import docx
+
+from ImageProcessor import ImageProcessor
+from ImageProcessor.Fonts import load_font
+from TextParser.CSVParser import CSVParser
+from TextParser.DOCXParser import DOCXParser
+from TextParser.PDFParser import PDFParser
+from TextParser.TXTParser import TXTParser
+
+GROUPS = ('render', 'parse', 'http')
+
+SOURCE_SIZES = [(640, 480), (1920, 1080), (4000, 3000)]
+
+# The form's default family (a missing system font falls back to the bundled
+# one) and a common system font; the resolved files are recorded in the results
+FONTS = ['Impact', 'DejaVuSans.ttf']
+
+TEXT = 'The only way to do great work is to love what you do.'
+
+CORPUS_SIZE = 1000
+
+WORDS = ('time life love work dream light world heart mind truth change people way day '
+         'nothing everything never always only great small simple hard brave free').split()
+
+AUTHORS = ['Maya Angelou', 'Mark Twain', 'Jane Austen', 'Oscar Wilde', 'Stephen King',
+           'Virginia Woolf', 'Albert Camus', 'Toni Morrison']
+
+
+def make_corpus(size, seed=0):
+    """Deterministic (body, author) pairs - no '-' in the body, parsers split on it."""
+    rng = random.Random(seed)
+    return [(' '.join(rng.choice(WORDS) for _ in range(rng.randint(6, 24))).capitalize() + '.',
+             rng.choice(AUTHORS))
+            for _ in range(size)]
+
+
+def write_txt(path, corpus):
+    with open(path, 'w') as f:
+        for body, author in corpus:
+            f.write(f'"{body}" - {author}\n')
+
+
+def write_csv(path, corpus):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['body', 'author'])
+        writer.writerows(corpus)
+
+
+def write_docx(path, corpus):
+    document = docx.Document()
+    for body, author in corpus:
+        document.add_paragraph(f'"{body}" - {author}')
+    document.save(path)
+
+
+def write_pdf(path, corpus, lines_per_page=60):
+    """Minimal text-only PDF (Helvetica, one quote per line), no PDF library needed."""
+    lines = [f'"{body}" - {author}' for body, author in corpus]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    def escape(text):
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    # 1 catalog, 2 page tree, 3 font, then a page and its content stream per page
+    kids = ' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>',
+               f'<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>'.encode(),
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    for i, page in enumerate(pages):
+        text = ''.join(f'({escape(line)}) Tj T*\n' for line in page)
+        stream = f'BT /F1 9 Tf 11 TL 20 820 Td\n{text}ET'.encode('latin-1')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 842 842] '
+                       f'/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>'
+                       .encode())
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objects) + 1, xref)
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def bench_render(tmp, repeat):
+    rows = []
+    for width, height in SOURCE_SIZES:
+        path = synthetic_file(tmp, width, height)
+        for font in FONTS:
+            for outline in (True, False):
+                fn = lambda: ImageProcessor(tmp).make_meme(path, TEXT, 'Steve Jobs', font_size=40,
+                                                           font_family=font, add_outline=outline)
+                rows.append(dict(case=f'make_meme {width}x{height} {font} '
+                                      f'{"outline" if outline else "plain"}',
+                                 **time_call(fn, repeat)))
+    return rows
+
+
+def bench_parse(tmp, repeat):
+    corpus = make_corpus(CORPUS_SIZE)
+    strategies = [('txt', TXTParser, write_txt), ('csv', CSVParser, write_csv),
+                  ('docx', DOCXParser, write_docx), ('pdf', PDFParser, write_pdf)]
+    rows = []
+    for extension, parser, write in strategies:
+        case = f'{parser.__name__} {len(corpus)} quotes'
+        if parser is PDFParser and shutil.which('pdftotext') is None:
+            rows.append({'case': case, 'skipped': 'pdftotext not installed'})
+            continue
+        path = os.path.join(tmp, f'corpus.{extension}')
+        write(path, corpus)
+        # A parser that drops quotes isn't faster, it's broken
+        parsed = parser.parse(path)
+        if len(parsed) != len(corpus):
+            raise RuntimeError(f'{parser.__name__} parsed {len(parsed)} of {len(corpus)} quotes')
+        rows.append(dict(case=case, **time_call(lambda: parser.parse(path), repeat)))
+    return rows
+
+
+def bench_http(tmp, repeat):
+    os.environ.setdefault('CLIENT_RATE', '0')  # one client, many requests
+    from app import app
+    client = app.test_client()
+    rows = []
+    for width, height in SOURCE_SIZES[:2]:
+        with open(synthetic_file(tmp, width, height), 'rb') as f:
+            data = f.read()
+        created = []
+
+        def create():
+            # A new caption every call, as when a user edits the text
+            response = client.post('/create', headers={'X-Requested-With': 'XMLHttpRequest'},
+                                   content_type='multipart/form-data', data={
+                                       'body': f'{TEXT} #{len(created)}', 'author': 'Steve Jobs',
+                                       'image_source': 'file', 'font_size': '40',
+                                       'add_outline': 'on',
+                                       'image_file': (io.BytesIO(data), 'upload.jpg')})
+            result = response.get_json()
+            if response.status_code != 200 or not result.get('success'):
+                raise RuntimeError(f'POST /create failed: {response.status_code} {result}')
+            created.append(os.path.join(ROOT, result['image_path'].lstrip('/')))
+
+        try:
+            rows.append(dict(case=f'POST /create upload {width}x{height}',
+                             **time_call(create, repeat)))
+        finally:
+            for path in created:
+                if os.path.exists(path):
+                    os.remove(path)
+    return rows
+
+
+def environment():
+    """Where the numbers came from, so comparisons across machines can be spotted."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pillow': PIL.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'fonts': {font: getattr(load_font(font, 40), 'path', 'default') for font in FONTS},
+    }
+
+
+def run_suite(groups, repeat):
+    benches = {'render': bench_render, 'parse': bench_parse, 'http': bench_http}
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for group in groups:
+            for row in benches[group](tmp, repeat):
+                row['case'] = f'{group}/{row["case"]}'
+                results.append(row)
+    return {'environment': environment(), 'results': results}
+
+
+def compare(baseline, current, threshold, min_delta_ms):
+    """Rows comparing median times, and whether any case regressed."""
+    before = {row['case']: row for row in baseline['results']}
+    after = {row['case']: row for row in current['results']}
+    rows, regressed = [], False
+    for case in list(before) + [case for case in after if case not in before]:
+        old, new = before.get(case, {}), after.get(case, {})
+        row = {'case': case, 'baseline_ms': old.get('median_ms', ''),
+               'current_ms': new.get('median_ms', '')}
+        if 'median_ms' not in old or 'median_ms' not in new:
+            row['status'] = ('skipped' if 'skipped' in old or 'skipped' in new
+                             else 'new' if case not in before else 'missing')
+        else:
+            change = new['median_ms'] / old['median_ms'] - 1
+            row['change'] = f'{change:+.1%}'
+            # Ignore sub-millisecond jitter on fast cases
+            if change > threshold and new['median_ms'] - old['median_ms'] >= min_delta_ms:
+                row['status'] = 'REGRESSION'
+                regressed = True
+            elif change < -threshold:
+                row['status'] = 'faster'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render and ingest benchmark suite.')
+    parser.add_argument('--only', choices=GROUPS, nargs='+', default=list(GROUPS),
+                        help='Groups to run.')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per case.')
+    parser.add_argument('--json', type=str, help='Write results to this JSON file.')
+    parser.add_argument('--compare', type=str, metavar='BASELINE',
+                        help='Compare with a results file from an earlier run.')
+    parser.add_argument('--current', type=str,
+                        help='With --compare: compare this results file instead of running.')
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help='Slowdown that counts as a regression (0.15 = 15%%).')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='Smallest slowdown in ms that counts as a regression.')
+    args = parser.parse_args()
+
+    # Relative paths (bundled font, ./static, ./tmp for the PDF parser) resolve from the root
+    os.chdir(ROOT)
+    if args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        current = run_suite(args.only, args.repeat)
+        print_table(current['results'], ['case', 'median_ms', 'min_ms', 'max_ms', 'skipped'])
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for key in ('python', 'pillow', 'machine', 'cpus', 'fonts'):
+            if baseline['environment'].get(key) != current['environment'].get(key):
+                print(f'Warning: {key} differs from the baseline, timings may not be comparable')
+        rows, regressed = compare(baseline, current, args.threshold, args.min_delta_ms)
+        print(f'\n{baseline["environment"].get("commit")} -> '
+              f'{current["environment"].get("commit")}')
+        print_table(rows, ['case', 'baseline_ms', 'current_ms', 'change', 'status'])
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+# Gunicorn settings for production: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# The app is imported (and warmed up, see wsgi.py) once in the master before
+# the workers are forked. Tuning comes from the environment:
+#   PORT                  port to listen on (3000)
+#   WEB_CONCURRENCY       worker processes (one per CPU)
+#   GUNICORN_THREADS      threads per worker (4); renders release the GIL in
+#                         Pillow, fetches wait on the network
+#   GUNICORN_TIMEOUT      seconds before a silent worker is restarted (60)
+#   GUNICORN_MAX_REQUESTS restart workers after this many requests (0 = never),
+#                         with 10% jitter so they don't all restart at once
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 3000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+
+# Heartbeat files on tmpfs; a disk-backed /tmp (common in containers) can
+# stall the heartbeat long enough to get workers killed
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+
+# Every worker writes into ./static; the store has to rescan before sweeping
+# and keep accesses and pins on disk (see Storage.OutputStore). Set here so
+# it's in place before the preloaded app creates the store.
+os.environ.setdefault('STORAGE_SHARED', '1')
+
+
+def when_ready(server):
+    server.log.info('Preloaded app, starting %d workers x %d threads', workers, threads)
@@ -1,13 +1,16 @@
 # CLI script for creating text overlays
 import os
+import sys
 import random
 import argparse
 
 from ImageProcessor import ImageProcessor
 from TextParser import Parser, Quote
+from Library.LibraryIndex import IMAGE_EXTENSIONS
+from Instrumentation import Profiler
 
 
-def generate_meme(path=None, body=None, author=None):
+def generate_meme(path=None, body=None, author=None, auto_fit=False):
     # Generate a text overlay given an image path and quote
     img = None
     quote = None
@@ -16,7 +19,8 @@ def generate_meme(path=None, body=None, author=None):
         images = "./_data/photos/images/"
         imgs = []
         for root, dirs, files in os.walk(images):
-            imgs = [os.path.join(root, name) for name in files]
+            imgs.extend(os.path.join(root, name) for name in files
+                        if name.lower().endswith(IMAGE_EXTENSIONS))
 
         img = random.choice(imgs)
     elif type(path) == str:
@@ -40,7 +44,7 @@ def generate_meme(path=None, body=None, author=None):
         quote = Quote(body, author)
 
     overlay = ImageProcessor('./tmp')
-    path = overlay.make_meme(img, quote.body, quote.author)
+    path = overlay.make_meme(img, quote.body, quote.author, auto_fit=auto_fit)
     return path
 
 
@@ -49,10 +53,20 @@ if __name__ == "__main__":
     parser.add_argument('--path', type=str, help='Path of a image file.')
     parser.add_argument('--body', type=str, help='Message to insert into the image.')
     parser.add_argument('--author', type=str, help='Author of the message.')
+    parser.add_argument('--auto-fit', action='store_true',
+                        help='Pick the largest font size that fits the image.')
+    parser.add_argument('--profile', choices=['sampling', 'cprofile'],
+                        help='Profile the run (quote parsing and rendering) into ./profiles.')
 
     args = parser.parse_args()
     path = args.path
     body = args.body
     author = args.author
 
-    print(generate_meme(args.path, args.body, args.author))
+    if args.profile:
+        with Profiler('./profiles', mode=args.profile).profile('cli') as profile:
+            path = generate_meme(args.path, args.body, args.author, args.auto_fit)
+        print(f'Profile written to {profile.path}', file=sys.stderr)
+        print(path)
+    else:
+        print(generate_meme(args.path, args.body, args.author, args.auto_fit))
@@ -5,7 +5,11 @@ Run this script to verify the project works correctly.
 """
 
 import os
+import shutil
 import sys
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 def test_imports():
@@ -158,6 +162,751 @@ def test_flask_app():
         print(f"❌ Error with Flask app: {e}")
         return False
 
+def test_autofit_long_quote():
+    """Test that a very long quote is shrunk and wrapped to fit its box."""
+    print("🔍 Testing auto-fit with a long quote...")
+    from ImageProcessor.TextFit import fit_text, MIN_FONT_SIZE
+    from ImageProcessor.TextMeasure import text_width
+    from ImageProcessor.Fonts import load_font
+
+    text = ("It is not the critic who counts; not the man who points out how the strong "
+            "man stumbles, or where the doer of deeds could have done them better. ") * 3
+    box_width, box_height = 440, 240
+    fitted = fit_text(text, 'Theodore Roosevelt', 'Impact', box_width, box_height)
+    font = load_font('Impact', fitted.font_size)
+
+    assert MIN_FONT_SIZE < fitted.font_size < 40, f'font size {fitted.font_size}'
+    assert len(fitted.lines) > 3, f'{len(fitted.lines)} lines'
+    assert max(text_width(font, line) for line in fitted.lines) <= box_width
+    assert fitted.width <= box_width and fitted.height <= box_height, fitted
+    assert ' '.join(' '.join(fitted.lines).split()).startswith(' '.join(text.split()))
+
+    # One size up must overflow, otherwise the search stopped too early
+    bigger = fit_text(text, 'Theodore Roosevelt', 'Impact', box_width, box_height,
+                      min_size=fitted.font_size + 1, max_size=fitted.font_size + 1)
+    assert bigger.width > box_width or bigger.height > box_height, \
+        f'font size {fitted.font_size} is not the largest that fits'
+    print(f"✅ Long quote fitted at {fitted.font_size}px in {len(fitted.lines)} lines")
+
+def test_autofit_short_quote():
+    """Test that a very short quote grows to fill its box."""
+    print("🔍 Testing auto-fit with a short quote...")
+    from ImageProcessor.TextFit import fit_text, MAX_FONT_SIZE
+
+    fitted = fit_text('Hi', '', 'Impact', 440, 240)
+    assert fitted.font_size == MAX_FONT_SIZE and fitted.lines == ('Hi',), fitted
+
+    # A single long word has to shrink to the box width, not wrap
+    fitted = fit_text('Supercalifragilisticexpialidocious', '', 'Impact', 300, 240)
+    assert fitted.lines == ('Supercalifragilisticexpialidocious',), fitted.lines
+    assert fitted.width <= 300 and fitted.font_size < MAX_FONT_SIZE, fitted
+    print(f"✅ Short quote fitted at {MAX_FONT_SIZE}px, long word at {fitted.font_size}px")
+
+def test_fetch_single_flight():
+    """Test that concurrent requests for one image URL share a single upstream fetch."""
+    print("🔍 Testing single-flight image fetches...")
+    import threading
+    sys.path.insert(0, str(Path(__file__).parent / 'benchmarks'))
+    from origin import OriginServer
+    from app import app
+
+    def proxy_concurrently(url, count):
+        # Every client sends its request at the same moment, from its own address
+        barrier = threading.Barrier(count)
+        responses = [None] * count
+
+        def proxy(i):
+            client = app.test_client()
+            barrier.wait()
+            responses[i] = client.get('/proxy-image', query_string={'url': url},
+                                      environ_base={'REMOTE_ADDR': f'10.0.43.{i}'})
+
+        threads = [threading.Thread(target=proxy, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    clients = 8
+    with OriginServer(size=(320, 240), latency_ms=300) as origin:
+        responses = proxy_concurrently(origin.url(0), clients)
+    statuses = [response.status_code for response in responses]
+    assert origin.hits == 1, f'{clients} requests caused {origin.hits} fetches'
+    assert statuses == [200] * clients, statuses
+    assert len({response.data for response in responses}) == 1, 'clients got different bodies'
+
+    # A failed download is shared too, nobody retries it on their own
+    with OriginServer(size=(32, 32), latency_ms=300, error_rate=1.0) as origin:
+        responses = proxy_concurrently(origin.url(1), 4)
+    statuses = [response.status_code for response in responses]
+    assert origin.hits == 1, f'failed fetch not shared: {origin.hits} fetches'
+    assert statuses == [503] * 4, statuses
+    print(f"✅ {clients} concurrent requests made one upstream fetch")
+
+def test_output_format_negotiation():
+    """Test format negotiation and that outputs get their format's extension."""
+    print("🔍 Testing output format negotiation...")
+    from PIL import Image
+    from ImageProcessor import ImageProcessor, negotiate_format, encode_image
+
+    # An explicit format wins, WebP only when the client lists it by name
+    assert negotiate_format('image/webp,*/*', 'png') == 'png'
+    assert negotiate_format('image/avif,image/webp,*/*;q=0.8') == 'webp'
+    assert negotiate_format('*/*') == 'jpeg'
+    assert negotiate_format('image/png,image/jpeg;q=0.5') == 'png'
+    assert negotiate_format(None, 'jpg') == 'jpeg'
+    assert negotiate_format('image/webp', animated=True) == 'webp'
+    assert negotiate_format(None, animated=True) == 'gif'
+    for requested, animated in (('gif', False), ('png', True), ('bmp', False)):
+        try:
+            negotiate_format(None, requested, animated=animated)
+        except ValueError:
+            continue
+        raise AssertionError(f'{requested} accepted for animated={animated}')
+
+    img = Image.new('RGB', (64, 48), 'navy')
+    output_dir = tempfile.mkdtemp()
+    try:
+        processor = ImageProcessor(output_dir)
+        for output_format, extension, magic in (('jpeg', '.jpg', b'\xff\xd8'),
+                                                ('png', '.png', b'\x89PNG'),
+                                                ('webp', '.webp', b'RIFF')):
+            encoded = encode_image(img, output_format)
+            assert encoded.data.startswith(magic), f'{output_format} has the wrong signature'
+            path = processor.save_image(img, output_format).path
+            assert path.endswith(extension), f'{output_format} saved as {path}'
+    finally:
+        shutil.rmtree(output_dir)
+    print("✅ Formats negotiated and saved with matching extensions")
+
+def test_animated_frame_count():
+    """Test that overlaying text on an animated GIF keeps every frame."""
+    print("🔍 Testing animated overlay...")
+    from PIL import Image
+    from ImageProcessor import ImageProcessor
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(work_dir, 'source.gif')
+        frames = [Image.new('RGB', (120, 90), (40 * i, 80, 160)) for i in range(5)]
+        frames[0].save(source, save_all=True, append_images=frames[1:], duration=80, loop=0)
+
+        processor = ImageProcessor(work_dir)
+        for output_format in ('gif', 'webp'):
+            path = processor.make_animated_meme(source, 'Still moving', 'Test', width=100,
+                                                output_format=output_format, workers=2)
+            with Image.open(path) as result:
+                assert result.n_frames == 5, f'{output_format} has {result.n_frames} frames'
+                assert result.size == (100, 75), f'{output_format} is {result.size}'
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ Animated GIF and WebP keep all 5 frames")
+
+def test_text_layer_cache():
+    """Test that repeated renders of one caption reuse its cached text layer."""
+    print("🔍 Testing the text layer cache...")
+    from PIL import Image
+    from ImageProcessor import ImageProcessor
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        backgrounds = []
+        for i, color in enumerate(('red', 'green', 'blue')):
+            path = os.path.join(work_dir, f'{i}.png')
+            Image.new('RGB', (200, 150), color).save(path)
+            backgrounds.append(path)
+
+        processor = ImageProcessor(work_dir)
+        first = processor.render_text_layer('Cached caption', 'Test', 200)
+        processor.make_memes(backgrounds, 'Cached caption', 'Test', width=200)
+        assert processor.layer_cache.misses == 1, f'{processor.layer_cache.misses} misses'
+        assert processor.layer_cache.hits == 3, f'{processor.layer_cache.hits} hits'
+        assert processor.render_text_layer('Cached caption', 'Test', 200) is first
+
+        # Anything that changes the pixels is a new layer
+        processor.render_text_layer('Cached caption', 'Test', 200, text_color='yellow')
+        assert processor.layer_cache.misses == 2 and len(processor.layer_cache) == 2
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ One text layer rendered for three backgrounds")
+
+def test_scene_layer_limits():
+    """Test that the scene renderer rejects oversized or invalid layers."""
+    print("🔍 Testing scene layer limits...")
+    from ImageProcessor import SceneRenderer, SceneError
+    from ImageProcessor.SceneRenderer import MAX_SCENE_SIZE, MAX_LAYERS
+
+    renderer = SceneRenderer()
+    text = {'type': 'text', 'text': 'Hi', 'font_size': 40}
+    rejected = {
+        'huge text': dict(text, text='W' * 50, font_size=1000),
+        'wide stroke': dict(text, stroke_color='#000000', stroke_width=200),
+        'stroke over a quarter of the font': dict(text, stroke_color='#000000', stroke_width=11),
+        'tall lines': dict(text, line_height=50),
+        'max_width': dict(text, max_width=10 ** 6),
+        'font_size': dict(text, font_size=0),
+        'type': {'type': 'video'},
+        'image url': {'type': 'image', 'url': 'file:///etc/passwd'},
+    }
+    for name, layer in rejected.items():
+        try:
+            renderer.render({'width': 400, 'height': 300, 'layers': [layer]})
+        except SceneError:
+            continue
+        raise AssertionError(f'{name} layer was rendered')
+    for scene in ({'width': MAX_SCENE_SIZE + 1, 'height': 10},
+                  {'width': 10, 'height': 10, 'layers': [text] * (MAX_LAYERS + 1)}):
+        try:
+            renderer.render(scene)
+        except SceneError:
+            continue
+        raise AssertionError(f'scene {scene["width"]}x{scene["height"]} was rendered')
+    assert len(renderer.layer_cache) == 0, 'a rejected layer was cached'
+
+    scene = renderer.render({'width': 400, 'height': 300,
+                             'layers': [dict(text, stroke_color='#000000', stroke_width=4)]})
+    assert scene.image.size == (400, 300) and scene.layers_rendered == 1
+
+    # Source images are admitted by their decoded size; bombs are a SceneError
+    import base64
+    import io
+    from contextlib import nullcontext
+    from PIL import Image
+    png = io.BytesIO()
+    Image.new('RGB', (300, 200), 'teal').save(png, 'PNG')
+    url = 'data:image/png;base64,' + base64.b64encode(png.getvalue()).decode('ascii')
+    admitted = []
+    renderer = SceneRenderer(admit=lambda nbytes: admitted.append(nbytes) or nullcontext())
+    renderer.render({'width': 400, 'height': 300, 'base': {'url': url}})
+    assert admitted == [300 * 200 * 4 * 2], admitted
+    renderer = SceneRenderer()
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = 1000
+    try:
+        renderer.render({'width': 400, 'height': 300, 'layers': [{'type': 'image', 'url': url}]})
+        raise AssertionError('decompression bomb was rendered')
+    except SceneError as e:
+        assert 'too large' in str(e), e
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+    print("✅ Oversized and invalid layers rejected, valid ones rendered")
+
+def test_admission_rejections():
+    """Test that the rate, concurrency and memory limits turn requests away."""
+    print("🔍 Testing admission control...")
+    from Admission import Rejected, ConcurrencyLimiter, RateLimiter, MemoryBudget
+
+    def rejection(call):
+        try:
+            call()
+        except Rejected as e:
+            return e
+        return None
+
+    # A burst of 3, then 429 with the wait until the next token
+    limits = RateLimiter(rate=1, burst=3)
+    for _ in range(3):
+        limits.check('client-a')
+    e = rejection(lambda: limits.check('client-a'))
+    assert e and e.status == 429 and e.retry_after == 1, f'4th request: {e}'
+    assert rejection(lambda: limits.check('client-b')) is None, 'buckets are not per client'
+    unlimited = RateLimiter(0, 1)
+    assert all(rejection(lambda: unlimited.check('x')) is None for _ in range(5)), 'rate 0 limits'
+
+    # One slot, no queue: the second holder is rejected at once
+    limiter = ConcurrencyLimiter(1, max_queue=0, timeout=0.1)
+    with limiter.slot():
+        e = rejection(limiter.acquire)
+        assert e and e.status == 503 and e.reason == 'queue_full', f'no queue: {e}'
+    # With a queue, a waiter gives up after the timeout
+    limiter = ConcurrencyLimiter(1, max_queue=1, timeout=0.1)
+    with limiter.slot():
+        e = rejection(limiter.acquire)
+        assert e and e.reason == 'queue_timeout', f'queued: {e}'
+    assert limiter.active == 0 and limiter.waiting == 0
+
+    budget = MemoryBudget(1000, timeout=0.1)
+    e = rejection(lambda: budget.reserve(2000).__enter__())
+    assert e and e.status == 413, f'over the budget: {e}'
+    with budget.reserve(600):
+        e = rejection(lambda: budget.reserve(600).__enter__())
+        assert e and e.status == 503 and e.reason == 'memory', f'no room: {e}'
+    assert budget.in_use == 0
+    print("✅ Rate, concurrency and memory limits reject as expected")
+
+def test_output_store_sweep():
+    """Test that the output store sweeps down to its quota, oldest first, keeping pins."""
+    print("🔍 Testing output store sweeping...")
+    from Storage import OutputStore
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        store = OutputStore(os.path.join(work_dir, 'static'), quota_bytes=3000)
+        paths = [store.put(bytes([i]) * 1000, 'jpg') for i in range(5)]
+        assert store.usage == 5000 and len(store) == 5
+        assert store.put(bytes([0]) * 1000, 'jpg') == paths[0], 'same content stored twice'
+
+        # paths[0] was just accessed again, paths[1] is pinned: 2 and 3 go
+        assert store.pin(paths[1])
+        assert store.sweep() == (2, 2000)
+        kept = [os.path.exists(path) for path in paths]
+        assert kept == [True, True, False, False, True], f'kept {kept}'
+        assert store.usage == 3000 and store.reclaimed_files == 2
+
+        # Pins survive a restart, expired files go unless pinned
+        reopened = OutputStore(store.root, ttl_seconds=60)
+        assert reopened.is_pinned(paths[1])
+        assert reopened.sweep(now=time.time() + 3600) == (2, 2000)
+        assert [os.path.exists(path) for path in paths] == [False, True, False, False, False]
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ Swept to the quota and TTL, pinned file kept")
+
+@contextmanager
+def temporary_outputs():
+    """Point the app's output store at a temporary directory for the block."""
+    import app as meme_app
+    from Storage import OutputStore
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        store = OutputStore(os.path.join(work_dir, 'static'))
+        saved = meme_app.storage, meme_app.overlay.store
+        meme_app.storage = meme_app.overlay.store = store
+        try:
+            yield store
+        finally:
+            meme_app.storage, meme_app.overlay.store = saved
+
+def test_static_conditional_requests():
+    """Test that /static answers If-None-Match with 304 and Range with 206."""
+    print("🔍 Testing conditional and range requests on /static...")
+    from app import app
+
+    client = app.test_client()
+    with temporary_outputs() as storage:
+        data = bytes(range(256)) * 8
+        path = storage.put(data, 'png')
+        url = '/static/' + storage.relative(path)
+
+        response = client.get(url)
+        etag = response.headers.get('ETag')
+        assert response.status_code == 200 and response.data == data, url
+        assert etag and 'immutable' in response.headers['Cache-Control'], response.headers
+
+        response = client.get(url, headers={'If-None-Match': etag})
+        assert response.status_code == 304 and not response.data, \
+            f'If-None-Match: {response.status_code}'
+
+        response = client.get(url, headers={'Range': 'bytes=0-9'})
+        assert response.status_code == 206 and response.data == data[:10], \
+            f'Range: {response.status_code}'
+        assert response.headers['Content-Range'] == f'bytes 0-9/{len(data)}'
+
+        assert client.get('/static/../app.py').status_code == 404
+    print("✅ ETag gave 304, Range gave 206")
+
+def test_random_pool_unseen():
+    """Test that the random pool serves pairs the session hasn't seen first."""
+    print("🔍 Testing the random pool...")
+    from PIL import Image
+    from ImageProcessor import ImageProcessor
+    from ImageProcessor.RandomPool import RandomPool
+    from Storage import OutputStore
+    from TextParser import Quote
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        image_path = os.path.join(work_dir, 'base.jpg')
+        Image.new('RGB', (200, 150), 'navy').save(image_path)
+        quotes = [Quote(f'Quote number {i}', 'Tester') for i in range(3)]
+        store = OutputStore(os.path.join(work_dir, 'static'), quota_bytes=1)
+        pool = RandomPool(ImageProcessor(work_dir, store=store), quotes, [image_path], size=3,
+                          width=200, auto_fit=True)
+        pool.stop()  # fill on this thread only, take() won't refill behind our back
+        for _ in range(20):
+            pool.fill()
+            if len(pool) == 3:
+                break
+        assert len(pool) == 3, f'pool holds {len(pool)} renders'
+
+        # Two of three seen: the third is the only choice, every time
+        keys = [item.key for item in pool._items.values()]
+        for _ in range(5):
+            item = pool.take(seen=keys[:2])
+            assert item.key == keys[2] and os.path.exists(item.path), item
+        assert pool.repeats == 0
+
+        # All seen: the one seen longest ago comes back, and is retired as stale
+        item = pool.take(seen=[keys[1], keys[2], keys[0]])
+        assert item.key == keys[1] and pool.repeats == 1 and len(pool) == 2
+        assert pool.take(where=lambda item: False) is None and pool.empty == 1
+
+        # Pooled renders are held in memory, not pinned: nothing outlives the
+        # process, and the retired render is the only one the sweep can take
+        assert not os.listdir(store.pins_path) and store.pinned_bytes == 0
+        assert store.sweep()[0] == 1 and not os.path.exists(item.path)
+        assert all(os.path.exists(kept.path) for kept in pool._items.values())
+        assert OutputStore(store.root, quota_bytes=1).sweep()[0] == 2, 'holds outlived the store'
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ Unseen pairs served first, oldest repeat when none left")
+
+def test_library_refresh():
+    """Test that refreshing the library picks up added and changed files only."""
+    print("🔍 Testing library refresh...")
+    from PIL import Image
+    from Library import LibraryIndex
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        quote_dir = os.path.join(work_dir, 'quotes')
+        image_dir = os.path.join(work_dir, 'images', 'nested')
+        os.makedirs(quote_dir)
+        os.makedirs(image_dir)
+        with open(os.path.join(quote_dir, 'a.txt'), 'w') as f:
+            f.write('First quote - Alice\n')
+        Image.new('RGB', (20, 20)).save(os.path.join(image_dir, 'one.jpg'))
+
+        snapshots = []
+        index = LibraryIndex([quote_dir], [os.path.dirname(image_dir)], on_change=snapshots.append)
+        assert index.refresh() and len(index.snapshot.quotes) == 1
+        assert not index.refresh(), 'refresh without changes published a snapshot'
+
+        new_image = os.path.join(image_dir, 'two.png')
+        Image.new('RGB', (20, 20)).save(new_image)
+        with open(os.path.join(quote_dir, 'b.txt'), 'w') as f:
+            f.write('Second quote - Bob\nThird quote - Carol\n')
+        old = index.snapshot
+        assert index.refresh(), 'new files not noticed'
+        assert new_image in index.snapshot.images and len(index.snapshot.quotes) == 3
+        assert index.parsed_files == 2, f'{index.parsed_files} files parsed, a.txt again?'
+        assert len(old.images) == 1 and snapshots[-1] is index.snapshot
+        assert index.snapshot.version == old.version + 1
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ New image and quote file picked up, unchanged file not re-parsed")
+
+def test_image_catalog_filters():
+    """Test that the image catalog filters by orientation, tone and color."""
+    print("🔍 Testing image catalog filters...")
+    from PIL import Image
+    from Library import ImageCatalog
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        specs = {'dark_wide.png': ((300, 200), (20, 20, 30)),
+                 'light_wide.png': ((300, 200), (240, 240, 230)),
+                 'dark_tall.png': ((200, 300), (10, 10, 10)),
+                 'red_square.png': ((200, 200), (230, 120, 120))}
+        paths = {}
+        for name, (size, color) in specs.items():
+            paths[name] = os.path.join(work_dir, name)
+            Image.new('RGB', size, color).save(paths[name])
+
+        catalog = ImageCatalog(os.path.join(work_dir, 'catalog.sqlite3'), workers=2)
+        assert catalog.update(list(paths.values())) == (4, 0) and catalog.count == 4
+
+        def names(**filters):
+            return [os.path.basename(row['path']) for row in catalog.query(**filters)]
+
+        assert names(orientation='landscape') == ['dark_wide.png', 'light_wide.png']
+        assert names(orientation='portrait') == ['dark_tall.png']
+        assert names(tone='dark') == ['dark_tall.png', 'dark_wide.png']
+        assert names(orientation='landscape', tone='light') == ['light_wide.png']
+        assert names(tone='medium') == ['red_square.png']
+        assert names(color='#e67878', color_distance=30) == ['red_square.png']
+        try:
+            catalog.query(tone='dim')
+            assert False, 'unknown tone accepted'
+        except ValueError:
+            pass
+
+        # Unchanged files are skipped, removed ones forgotten
+        assert catalog.update([paths['dark_tall.png']]) == (0, 3) and catalog.count == 1
+    finally:
+        shutil.rmtree(work_dir)
+    print("✅ Orientation, tone and color filters matched")
+
+def test_auto_placement():
+    """Test that automatic placement picks the calm half of an image and a contrasting fill."""
+    print("🔍 Testing automatic text placement...")
+    import numpy
+    from PIL import Image
+    from ImageProcessor.Placement import PlacementMap
+
+    noise = numpy.random.default_rng(7).integers(0, 256, (200, 400, 3), dtype=numpy.uint8)
+    for flat, expected_fill in ((20, 'white'), (235, 'black')):
+        pixels = numpy.concatenate([noise, numpy.full((200, 400, 3), flat, numpy.uint8)])
+        placement = PlacementMap(Image.fromarray(pixels)).place((200, 60), padding=10)
+        x, y = placement.dest
+        assert y + 10 >= 200 and placement.position_y > 50, f'placed at {placement.dest}'
+        assert placement.fill == expected_fill, f'{placement.fill} on {flat}'
+        assert placement.outline != placement.fill
+
+        # A fixed position only picks the colors
+        fixed = PlacementMap(Image.fromarray(pixels)).place((200, 60), position=(50, 75),
+                                                            padding=10)
+        assert abs(fixed.position_y - 75) < 1 and fixed.fill == expected_fill
+    print("✅ Text placed on the flat half, fill contrasts with it")
+
+def test_text_effects():
+    """Test the NumPy text effects against Pillow filters and each other."""
+    print("🔍 Testing text effects...")
+    import numpy
+    from PIL import Image, ImageDraw, ImageFilter
+    from ImageProcessor.TextEffects import (Outline, Shadow, apply_effects, dilate,
+                                            gaussian_blur)
+
+    mask = Image.new('L', (120, 60))
+    ImageDraw.Draw(mask).text((10, 10), 'Meme!', fill=255, font_size=36)
+    coverage = numpy.asarray(mask)
+
+    # Square dilation is a max filter
+    for radius in (1, 2, 4):
+        expected = numpy.asarray(mask.filter(ImageFilter.MaxFilter(2 * radius + 1)))
+        assert numpy.array_equal(dilate(coverage, radius, 'square'), expected), f'radius {radius}'
+    round_grown = dilate(coverage, 4, 'round')
+    assert (round_grown >= coverage).all() and (round_grown <= dilate(coverage, 4)).all()
+
+    # Blurring moves alpha around but keeps its total while nothing reaches the edges
+    blob = numpy.zeros((80, 80), dtype=numpy.float32)
+    blob[30:50, 25:55] = 1.0
+    blurred = gaussian_blur(blob, 3.0)
+    assert abs(blurred.sum() - blob.sum()) < 1e-3 * blob.sum(), f'{blurred.sum()} vs {blob.sum()}'
+    assert blurred[30, 25] < 0.5 < blurred[40, 40] and blurred[0, 0] == 0
+
+    # Text stays on top in its own color, the outline shows only around it
+    layer = numpy.asarray(apply_effects(coverage, 'white', (Shadow(), Outline(width=2))))
+    solid = coverage == 255
+    assert (layer[solid] == (255, 255, 255, 255)).all()
+    ring = (dilate(coverage, 2) == 255) & (dilate(coverage, 1) == 0)
+    assert ring.any() and (layer[ring][:, :3] == 0).all() and (layer[ring][:, 3] == 255).all()
+    assert layer[0, 0, 3] == 0
+    print("✅ Dilation matches MaxFilter, blur keeps alpha, effects paint under the text")
+
+def test_preview_latest_only():
+    """Test that a newer preview supersedes older ones and that expired sources get a 409."""
+    print("🔍 Testing preview coalescing...")
+    import io
+    import threading
+    from PIL import Image
+    from ImageProcessor import LatestOnly
+
+    coalescer = LatestOnly()
+    rendered, results = [], {}
+    release = threading.Event()
+
+    def render_as(name, wait=False):
+        def render():
+            if wait:
+                release.wait(5)
+            rendered.append(name)
+            return name
+        return render
+
+    def submit(name, wait=False):
+        results[name] = coalescer.run('session', render_as(name, wait))
+
+    def generation():
+        state = coalescer._sessions.get('session')
+        return state[0] if state else 0
+
+    def submit_in_thread(name, wait=False):
+        # Start a request and wait until it has taken the next generation
+        expected = generation() + 1
+        thread = threading.Thread(target=submit, args=(name, wait))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while generation() < expected and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return thread
+
+    # 'first' is rendering; 'second' and 'third' queue behind it and only the newest renders
+    threads = [submit_in_thread('first', wait=True)]
+    while not coalescer._sessions['session'][1].locked():
+        time.sleep(0.005)
+    threads += [submit_in_thread('second'), submit_in_thread('third')]
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert rendered == ['first', 'third'], rendered
+    assert results == {'first': 'first', 'second': None, 'third': 'third'}, results
+    assert coalescer.superseded == 1
+    assert coalescer.run('other session', lambda: 'alone') == 'alone'
+
+    # Through the app: the base is cached by its source key, an unknown key is a 409
+    from app import app
+    client = app.test_client()
+    upload = io.BytesIO()
+    Image.new('RGB', (400, 300), 'purple').save(upload, 'JPEG')
+    form = {'body': 'Preview me', 'author': 'Tester', 'image_source': 'file',
+            'image_file': (io.BytesIO(upload.getvalue()), 'base.jpg')}
+    response = client.post('/preview', data=form, content_type='multipart/form-data')
+    assert response.status_code == 200, response.status_code
+    key = response.headers['X-Preview-Source']
+    response = client.post('/preview', data={'body': 'Again', 'source_key': key})
+    assert response.status_code == 200 and response.headers['X-Base-Cached'] == '1'
+    response = client.post('/preview', data={'body': 'Again', 'source_key': 'expired'})
+    assert response.status_code == 409 and not response.json['success']
+    print("✅ Stale previews dropped, expired source keys answered with 409")
+
+def test_font_metrics_parity():
+    """Test that cached glyph advances measure what font.getlength does."""
+    print("🔍 Testing font metrics...")
+    from ImageProcessor.Fonts import load_font
+    from ImageProcessor.TextMeasure import FontMetrics
+
+    font = load_font('Impact', 40)
+    metrics = FontMetrics(font)
+    for text in ('AVATAR WAVY Tomato', 'Hello, world. To you.', 'café naïve', ' spaced ', ''):
+        assert abs(metrics.width(text) - font.getlength(text)) < 0.01, text
+    for text in ('AVATAR WAVY Tomato', 'Hello, world. To you.', 'café naïve'):
+        left, _, right, _ = font.getbbox(text)
+        assert metrics.ink_extent(text) == (left, right), text
+    assert metrics.fallbacks == 0
+
+    # Combining marks need shaping: measured by the font itself, and counted
+    shaped = 'cafe\u0301 nai\u0308ve'
+    assert metrics.width(shaped) == font.getlength(shaped) and metrics.fallbacks == 1
+
+    class KernedFont:
+        # 10px advances, 'AV' and 'To' pairs pulled together like a kerned font
+        def getlength(self, text):
+            return 10.0 * len(text) - 3.0 * sum(text[i:i + 2] in ('AV', 'To')
+                                                for i in range(len(text) - 1))
+
+        def getbbox(self, text):
+            return 0, 0, int(self.getlength(text)), 10
+
+    kerned = KernedFont()
+    metrics = FontMetrics(kerned)
+    assert metrics.has_kerning
+    for text in ('AVATAR', 'Tomato To', 'plain', 'AVAV'):
+        assert metrics.width(text) == kerned.getlength(text), text
+    assert metrics.kerning['AV'] == -3.0 and metrics.kerning['AT'] == 0.0
+    print("✅ Cached widths match getlength for plain, kerned and shaped text")
+
+def test_balanced_wrapping():
+    """Test that balanced wrapping fits the box as greedy does, with evener lines."""
+    print("🔍 Testing balanced line wrapping...")
+    from ImageProcessor.Fonts import load_font
+    from ImageProcessor.TextMeasure import text_width
+    from ImageProcessor.TextWrap import balanced_breaks, greedy_breaks, wrap_text
+
+    def raggedness(widths, space, max_width, breaks):
+        # Squared leftover space of every line but the last
+        bounds = [0] + breaks + [len(widths)]
+        lines = [sum(widths[a:b]) + space * (b - a - 1) for a, b in zip(bounds, bounds[1:])]
+        return sum((max_width - width) ** 2 for width in lines[:-1])
+
+    # Greedy fills "aaa bb" and leaves "cc" alone; balanced moves "bb" down
+    widths, space, max_width = [3, 2, 2, 5], 1, 6
+    assert greedy_breaks(widths, space, max_width) == [2, 3]
+    assert balanced_breaks(widths, space, max_width) == [1, 3]
+    assert raggedness(widths, space, max_width, [1, 3]) < raggedness(widths, space, max_width,
+                                                                     [2, 3])
+
+    font = load_font('Impact', 32)
+    text = ("Any sufficiently advanced technology is indistinguishable from magic, "
+            "and any sufficiently advanced meme is indistinguishable from art")
+    for max_width in (120, 200, 320, 480):
+        greedy = wrap_text(font, text, max_width, 'greedy')
+        balanced = wrap_text(font, text, max_width, 'balanced')
+        # Only a single word wider than the box may overflow it
+        assert all(text_width(font, line) <= max_width or ' ' not in line
+                   for line in greedy + balanced), max_width
+        assert len(balanced) <= len(greedy), f'{len(balanced)} > {len(greedy)} at {max_width}'
+        assert ' '.join(balanced) == ' '.join(text.split())
+
+    # A word wider than the box still comes out, on a line of its own
+    for mode in ('greedy', 'balanced'):
+        lines = wrap_text(font, 'so Supercalifragilisticexpialidocious it is', 100, mode)
+        assert 'Supercalifragilisticexpialidocious' in lines, lines
+    print("✅ Balanced lines fit, never outnumber greedy ones and are less ragged")
+
+def test_metrics_exposition():
+    """Test the /metrics text format and that retired thread shards keep their totals."""
+    print("🔍 Testing metrics exposition...")
+    import io
+    import re
+    import threading
+    from PIL import Image
+    from Instrumentation import Registry
+
+    # Values written by threads that have exited are still counted
+    registry = Registry()
+    jobs = registry.counter('jobs_total', 'Jobs.')
+    latency = registry.histogram('job_seconds', 'Job latency.', buckets=(0.1, 1.0))
+
+    def work(seconds):
+        jobs.inc(kind='batch')
+        latency.observe(seconds)
+
+    for seconds in (0.05, 0.5, 5.0):
+        thread = threading.Thread(target=work, args=(seconds,))
+        thread.start()
+        thread.join()
+    jobs.inc(kind='batch')
+    text = registry.render()
+    assert len(registry._shards) == 1, 'exited threads kept their shards'
+    for line in ('# TYPE jobs_total counter', 'jobs_total{kind="batch"} 4',
+                 '# TYPE job_seconds histogram', 'job_seconds_bucket{le="0.1"} 1',
+                 'job_seconds_bucket{le="1.0"} 2', 'job_seconds_bucket{le="+Inf"} 3',
+                 'job_seconds_sum 5.55', 'job_seconds_count 3'):
+        assert line in text.splitlines(), f'{line!r} not in\n{text}'
+
+    # Through the app: a /create call shows up in the request and stage metrics
+    from app import app
+    client = app.test_client()
+
+    def sample(text, pattern):
+        match = re.search('^' + re.escape(pattern) + r' (\S+)$', text, re.MULTILINE)
+        return float(match.group(1)) if match else 0.0
+
+    upload = io.BytesIO()
+    Image.new('RGB', (320, 240), 'olive').save(upload, 'JPEG')
+    form = {'body': 'Measured', 'author': 'Tester', 'image_source': 'file',
+            'image_file': (io.BytesIO(upload.getvalue()), 'base.jpg')}
+    before = client.get('/metrics').get_data(as_text=True)
+    with temporary_outputs() as storage:
+        response = client.post('/create', data=form, content_type='multipart/form-data',
+                               headers={'X-Requested-With': 'XMLHttpRequest'})
+        assert response.status_code == 200 and response.json['success'], response.data[:200]
+        assert len(storage) == 1
+    response = client.get('/metrics')
+    assert response.status_code == 200 and response.content_type.startswith('text/plain')
+    after = response.get_data(as_text=True)
+
+    requests_line = 'textoverlay_http_requests_total{endpoint="meme_post",status="200"}'
+    assert sample(after, requests_line) == sample(before, requests_line) + 1
+    count_line = 'textoverlay_http_request_duration_seconds_count{endpoint="meme_post"}'
+    inf_line = ('textoverlay_http_request_duration_seconds_bucket'
+                '{endpoint="meme_post",le="+Inf"}')
+    assert sample(after, count_line) == sample(after, inf_line) == sample(before, count_line) + 1
+    assert sample(after, 'textoverlay_render_stage_seconds_count{stage="encode"}') >= 1
+    print("✅ Counters and histograms exposed, retired shards counted")
+
+def test_thumbnail_cache_budget():
+    """Test that proxied thumbnails are cached within a byte budget."""
+    print("🔍 Testing the thumbnail cache budget...")
+    import io
+    import numpy
+    from PIL import Image
+    from ImageProcessor.Thumbnails import Thumbnails
+
+    noise = numpy.random.default_rng(3).integers(0, 256, (600, 800, 3), dtype=numpy.uint8)
+    source = io.BytesIO()
+    Image.fromarray(noise).save(source, 'PNG')
+
+    thumbnails = Thumbnails(cache_size=100, cache_bytes=1_000_000)
+    sizes = [len(thumbnails.make('https://example.com/a.png', source.getvalue(), width, None,
+                                 'png').data) for width in (200, 300, 400, 500)]
+    assert thumbnails.cache.bytes <= 1_000_000 < sum(sizes), (thumbnails.cache.bytes, sizes)
+    assert thumbnails.get('https://example.com/a.png', 500, None, 'png') is not None
+    assert thumbnails.get('https://example.com/a.png', 200, None, 'png') is None, 'oldest kept'
+    print(f"✅ {len(thumbnails.cache)} of 4 thumbnails kept in {thumbnails.cache.bytes} bytes")
+
 def main():
     """Run all tests."""
     print("🚀 Dynamic Meme Creator - Project Test Suite")
@@ -169,12 +918,37 @@ def main():
         test_quote_loading,
         test_image_availability,
         test_meme_generation,
-        test_flask_app
+        test_flask_app,
+        test_autofit_long_quote,
+        test_autofit_short_quote,
+        test_fetch_single_flight,
+        test_output_format_negotiation,
+        test_animated_frame_count,
+        test_text_layer_cache,
+        test_scene_layer_limits,
+        test_admission_rejections,
+        test_output_store_sweep,
+        test_static_conditional_requests,
+        test_random_pool_unseen,
+        test_library_refresh,
+        test_image_catalog_filters,
+        test_auto_placement,
+        test_text_effects,
+        test_preview_latest_only,
+        test_font_metrics_parity,
+        test_balanced_wrapping,
+        test_metrics_exposition,
+        test_thumbnail_cache_budget
     ]
     
     results = []
     for test in tests:
-        results.append(test())
+        # Older tests return True/False, newer ones assert
+        try:
+            results.append(test() is not False)
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            results.append(False)
         print()
     
     passed = sum(results)
@@ -0,0 +1,854 @@
+// Initialize Fabric.js canvas
+const canvas = new fabric.Canvas('fabricCanvas', {
+    backgroundColor: '#ffffff',
+    selection: true,
+    preserveObjectStacking: true
+});
+
+let layerCounter = 0;
+let canvasHistory = [];
+let historyStep = 0;
+
+// Save canvas state for undo/redo
+function saveCanvasState() {
+    if (historyStep < canvasHistory.length - 1) {
+        canvasHistory = canvasHistory.slice(0, historyStep + 1);
+    }
+    canvasHistory.push(JSON.stringify(canvas.toJSON()));
+    historyStep++;
+
+    if (canvasHistory.length > 50) {
+        canvasHistory = canvasHistory.slice(-50);
+        historyStep = canvasHistory.length - 1;
+    }
+}
+
+// Quick color setter
+function setQuickColor(color) {
+    document.getElementById('textColor').value = color;
+    document.getElementById('textColorHex').value = color;
+
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('fill', color);
+        canvas.renderAll();
+        saveCanvasState();
+    }
+}
+
+// Template functions
+document.querySelectorAll('.template-btn').forEach(btn => {
+    btn.addEventListener('click', function() {
+        const template = this.dataset.template;
+        applyTemplate(template);
+    });
+});
+
+function applyTemplate(template) {
+    const templates = {
+        quote: {
+            text: '"Your inspirational quote here"',
+            fontSize: 48,
+            fontFamily: 'Georgia',
+            fill: '#2c3e50',
+            textAlign: 'center'
+        },
+        social: {
+            text: 'Follow @username',
+            fontSize: 36,
+            fontFamily: 'Arial',
+            fill: '#1da1f2',
+            textAlign: 'left'
+        },
+        title: {
+            text: 'MAIN TITLE',
+            fontSize: 64,
+            fontFamily: 'Impact',
+            fill: '#000000',
+            textAlign: 'center'
+        },
+        minimal: {
+            text: 'simple.',
+            fontSize: 32,
+            fontFamily: 'Helvetica',
+            fill: '#666666',
+            textAlign: 'left'
+        }
+    };
+
+    const config = templates[template];
+    if (config) {
+        document.getElementById('textInput').value = config.text;
+        document.getElementById('fontSize').value = config.fontSize;
+        document.getElementById('fontSizeValue').textContent = config.fontSize;
+        document.getElementById('fontFamily').value = config.fontFamily;
+        setQuickColor(config.fill);
+
+        addTextToCanvas(config);
+    }
+}
+
+// Enhanced add text function
+function addTextToCanvas(config = null) {
+    const textInput = document.getElementById('textInput').value;
+    if (textInput.trim()) {
+        const textConfig = config || {
+            fontSize: parseInt(document.getElementById('fontSize').value),
+            fontFamily: document.getElementById('fontFamily').value,
+            fill: document.getElementById('textColor').value,
+        };
+
+        const text = new fabric.IText(textInput, {
+            left: canvas.getWidth() / 2,
+            top: canvas.getHeight() / 2,
+            originX: 'center',
+            originY: 'center',
+            ...textConfig,
+            stroke: document.getElementById('enableStroke').checked ? document.getElementById('strokeColor').value : '',
+            strokeWidth: document.getElementById('enableStroke').checked ? parseInt(document.getElementById('strokeWidth').value) : 0
+        });
+
+        canvas.add(text);
+        canvas.setActiveObject(text);
+        canvas.renderAll();
+
+        document.getElementById('textInput').value = '';
+        updateLayersPanel();
+        saveCanvasState();
+    }
+}
+
+// Add heading function
+document.getElementById('addHeadingBtn').addEventListener('click', function() {
+    const textInput = document.getElementById('textInput').value || 'Heading';
+    const text = new fabric.IText(textInput, {
+        left: canvas.getWidth() / 2,
+        top: canvas.getHeight() / 4,
+        originX: 'center',
+        originY: 'center',
+        fontSize: 64,
+        fontFamily: 'Impact',
+        fill: '#000000',
+        fontWeight: 'bold'
+    });
+
+    canvas.add(text);
+    canvas.setActiveObject(text);
+    canvas.renderAll();
+
+    document.getElementById('textInput').value = '';
+    updateLayersPanel();
+    saveCanvasState();
+});
+
+// Generate gradient background
+document.getElementById('generateBgBtn').addEventListener('click', function() {
+    const gradients = [
+        ['#667eea', '#764ba2'],
+        ['#f093fb', '#f5576c'],
+        ['#4facfe', '#00f2fe'],
+        ['#43e97b', '#38f9d7'],
+        ['#fa709a', '#fee140'],
+        ['#a8edea', '#fed6e3'],
+        ['#ff9a9e', '#fecfef'],
+        ['#ffecd2', '#fcb69f']
+    ];
+
+    const randomGradient = gradients[Math.floor(Math.random() * gradients.length)];
+    const gradient = new fabric.Gradient({
+        type: 'linear',
+        coords: { x1: 0, y1: 0, x2: canvas.width, y2: canvas.height },
+        colorStops: [
+            { offset: 0, color: randomGradient[0] },
+            { offset: 1, color: randomGradient[1] }
+        ]
+    });
+
+    canvas.setBackgroundColor(gradient, canvas.renderAll.bind(canvas));
+    saveCanvasState();
+});
+
+// Stroke width display
+document.getElementById('strokeWidth').addEventListener('input', function() {
+    document.getElementById('strokeWidthValue').textContent = this.value + 'px';
+    updateStroke();
+});
+
+// Alignment functions
+document.getElementById('alignLeftBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('textAlign', 'left');
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+document.getElementById('alignCenterBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('textAlign', 'center');
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+document.getElementById('alignRightBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('textAlign', 'right');
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Shadow effects
+document.getElementById('addShadowBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject) {
+        activeObject.set('shadow', {
+            color: 'rgba(0,0,0,0.3)',
+            blur: 5,
+            offsetX: 3,
+            offsetY: 3
+        });
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Glow effects
+document.getElementById('addGlowBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject) {
+        activeObject.set('shadow', {
+            color: activeObject.fill || '#000000',
+            blur: 20,
+            offsetX: 0,
+            offsetY: 0
+        });
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Duplicate function
+document.getElementById('duplicateBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject) {
+        activeObject.clone(function(cloned) {
+            cloned.set({
+                left: cloned.left + 20,
+                top: cloned.top + 20
+            });
+            canvas.add(cloned);
+            canvas.setActiveObject(cloned);
+            canvas.renderAll();
+            updateLayersPanel();
+            saveCanvasState();
+        });
+    }
+});
+
+// Undo/Redo functions
+document.getElementById('undoBtn').addEventListener('click', function() {
+    if (historyStep > 0) {
+        historyStep--;
+        canvas.loadFromJSON(canvasHistory[historyStep], canvas.renderAll.bind(canvas));
+        updateLayersPanel();
+    }
+});
+
+document.getElementById('redoBtn').addEventListener('click', function() {
+    if (historyStep < canvasHistory.length - 1) {
+        historyStep++;
+        canvas.loadFromJSON(canvasHistory[historyStep], canvas.renderAll.bind(canvas));
+        updateLayersPanel();
+    }
+});
+
+// Image upload functionality
+document.getElementById('imageInput').addEventListener('change', function(e) {
+    const file = e.target.files[0];
+    if (file) {
+        const reader = new FileReader();
+        reader.onload = function(f) {
+            loadBackgroundImage(f.target.result);
+        };
+        reader.readAsDataURL(file);
+    }
+});
+
+document.getElementById('loadImageBtn').addEventListener('click', function() {
+    const url = document.getElementById('imageUrl').value;
+    if (url) {
+        loadBackgroundImage(url);
+    }
+});
+
+function loadBackgroundImage(url) {
+    // Use the image proxy to avoid CORS issues
+    let imageUrl = url;
+
+    // If it's an external URL, use the proxy
+    if (url.startsWith('http://') || url.startsWith('https://')) {
+        // Downscaled to the canvas (x2 for the 2x export) instead of the full original
+        imageUrl = `/proxy-image?url=${encodeURIComponent(url)}&w=${canvas.getWidth() * 2}&h=${canvas.getHeight() * 2}`;
+    }
+
+    fabric.Image.fromURL(imageUrl, function(img) {
+        if (!img) {
+            showNotification('Error', 'Failed to load the image. Please check the URL.', 'error');
+            return;
+        }
+
+        // Scale image to fit canvas while maintaining aspect ratio
+        const canvasWidth = canvas.getWidth();
+        const canvasHeight = canvas.getHeight();
+        const imgAspectRatio = img.width / img.height;
+        const canvasAspectRatio = canvasWidth / canvasHeight;
+
+        let scaleFactor;
+        if (imgAspectRatio > canvasAspectRatio) {
+            scaleFactor = canvasWidth / img.width;
+        } else {
+            scaleFactor = canvasHeight / img.height;
+        }
+
+        img.scale(scaleFactor);
+        img.set({
+            left: (canvasWidth - img.width * scaleFactor) / 2,
+            top: (canvasHeight - img.height * scaleFactor) / 2,
+            selectable: true
+        });
+
+        canvas.add(img);
+        canvas.sendToBack(img);
+        canvas.renderAll();
+
+        updateLayersPanel();
+        saveCanvasState();
+    });
+}
+
+// Add text functionality
+document.getElementById('addTextBtn').addEventListener('click', function() {
+    addTextToCanvas();
+});
+
+// Font size slider
+document.getElementById('fontSize').addEventListener('input', function() {
+    const value = this.value;
+    document.getElementById('fontSizeValue').textContent = value;
+
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('fontSize', parseInt(value));
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Text color
+document.getElementById('textColor').addEventListener('change', function() {
+    const color = this.value;
+    document.getElementById('textColorHex').value = color;
+
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('fill', color);
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+document.getElementById('textColorHex').addEventListener('change', function() {
+    const color = this.value;
+    document.getElementById('textColor').value = color;
+
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('fill', color);
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Font family
+document.getElementById('fontFamily').addEventListener('change', function() {
+    const fontFamily = this.value;
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        activeObject.set('fontFamily', fontFamily);
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Stroke functionality
+document.getElementById('enableStroke').addEventListener('change', function() {
+    updateStroke();
+});
+
+document.getElementById('strokeColor').addEventListener('change', function() {
+    updateStroke();
+});
+
+function updateStroke() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        const enabled = document.getElementById('enableStroke').checked;
+        if (enabled) {
+            activeObject.set({
+                stroke: document.getElementById('strokeColor').value,
+                strokeWidth: parseInt(document.getElementById('strokeWidth').value)
+            });
+        } else {
+            activeObject.set({
+                stroke: '',
+                strokeWidth: 0
+            });
+        }
+        canvas.renderAll();
+        saveCanvasState();
+    }
+}
+
+// Style buttons
+document.getElementById('boldBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        const isBold = activeObject.fontWeight === 'bold';
+        activeObject.set('fontWeight', isBold ? 'normal' : 'bold');
+        canvas.renderAll();
+        this.classList.toggle('bg-gray-200', !isBold);
+        saveCanvasState();
+    }
+});
+
+document.getElementById('italicBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        const isItalic = activeObject.fontStyle === 'italic';
+        activeObject.set('fontStyle', isItalic ? 'normal' : 'italic');
+        canvas.renderAll();
+        this.classList.toggle('bg-gray-200', !isItalic);
+        saveCanvasState();
+    }
+});
+
+document.getElementById('underlineBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject && activeObject.type === 'i-text') {
+        const isUnderlined = activeObject.underline;
+        activeObject.set('underline', !isUnderlined);
+        canvas.renderAll();
+        this.classList.toggle('bg-gray-200', !isUnderlined);
+        saveCanvasState();
+    }
+});
+
+// Clear canvas
+document.getElementById('clearBtn').addEventListener('click', function() {
+    showConfirmModal(
+        'Clear Canvas',
+        'Are you sure you want to clear the entire canvas? This action cannot be undone.',
+        function() {
+            // On confirm
+            canvas.clear();
+            canvas.backgroundColor = '#ffffff';
+            updateLayersPanel();
+            saveCanvasState();
+        },
+        function() {
+            // On cancel - nothing to do
+        }
+    );
+});
+
+// Center object
+document.getElementById('centerBtn').addEventListener('click', function() {
+    const activeObject = canvas.getActiveObject();
+    if (activeObject) {
+        activeObject.center();
+        canvas.renderAll();
+        saveCanvasState();
+    }
+});
+
+// Download functionality
+document.getElementById('downloadBtn').addEventListener('click', function() {
+    try {
+        // Check if canvas has any objects
+        if (canvas.getObjects().length === 0) {
+            // Show a notification that there's nothing to download
+            showNotification('Canvas is empty', 'Add some text or images before downloading.', 'warning');
+            return;
+        }
+
+        // Try to generate the image
+        try {
+            const dataURL = canvas.toDataURL({
+                format: 'png',
+                quality: 1.0,
+                multiplier: 2
+            });
+
+            // Check if dataURL is valid
+            if (!dataURL || dataURL === 'data:,') {
+                throw new Error('Failed to generate image data');
+            }
+
+            // Create download link
+            const link = document.createElement('a');
+            link.download = `textoverlay-creation-${Date.now()}.png`;
+            link.href = dataURL;
+
+            // Trigger download
+            document.body.appendChild(link);
+            link.click();
+            document.body.removeChild(link);
+
+            // Show success notification
+            showNotification('Success!', 'Your creation has been downloaded.', 'success');
+
+        } catch (corsError) {
+            if (corsError.name === 'SecurityError' || corsError.message.includes('tainted')) {
+                // CORS/Tainted canvas error - offer alternative
+                showConfirmModal(
+                    'Download Issue',
+                    'The canvas contains external images that prevent direct download due to browser security. Would you like to render it on the server instead?',
+                    function() {
+                        downloadServerRender();
+                    }
+                );
+            } else {
+                throw corsError; // Re-throw if it's not a CORS issue
+            }
+        }
+
+    } catch (error) {
+        console.error('Download error:', error);
+        showNotification('Download Failed', 'There was an error downloading your creation. Please try again.', 'error');
+    }
+});
+
+// Describe the canvas as a scene document for /render-scene
+function sceneFromCanvas() {
+    const imageLayer = (obj, common) => {
+        let src = obj.getSrc();
+        // Send the original URL instead of the proxy round trip
+        const proxied = src.match(/\/proxy-image\?url=([^&]+)/);
+        if (proxied) {
+            src = decodeURIComponent(proxied[1]);
+        }
+        return {
+            ...common,
+            type: 'image',
+            url: src,
+            width: Math.round(obj.getScaledWidth()),
+            height: Math.round(obj.getScaledHeight())
+        };
+    };
+
+    const objects = canvas.backgroundImage ? [canvas.backgroundImage, ...canvas.getObjects()] : canvas.getObjects();
+    const layers = objects.map((obj, index) => {
+        const center = obj.getCenterPoint();
+        const common = {
+            id: String(index),
+            x: center.x,
+            y: center.y,
+            rotation: obj.angle || 0,
+            opacity: obj.opacity === undefined ? 1 : obj.opacity
+        };
+        if (obj.type === 'i-text' || obj.type === 'text' || obj.type === 'textbox') {
+            return {
+                ...common,
+                type: 'text',
+                text: obj.text,
+                font_family: obj.fontFamily,
+                font_size: Math.round(obj.fontSize * (obj.scaleY || 1)),
+                color: typeof obj.fill === 'string' ? obj.fill : '#000000',
+                stroke_color: obj.stroke || null,
+                stroke_width: obj.stroke ? obj.strokeWidth : 0
+            };
+        }
+        if (obj.type === 'image') {
+            return imageLayer(obj, common);
+        }
+        return null;
+    }).filter(Boolean);
+
+    return {
+        width: canvas.getWidth(),
+        height: canvas.getHeight(),
+        background: typeof canvas.backgroundColor === 'string' ? canvas.backgroundColor : '#ffffff',
+        layers: layers,
+        output_format: 'png'
+    };
+}
+
+// Render the canvas on the server (works with tainted canvases)
+async function downloadServerRender() {
+    try {
+        const response = await fetch('/render-scene', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(sceneFromCanvas())
+        });
+        if (!response.ok) {
+            const result = await response.json().catch(() => ({}));
+            throw new Error(result.error || `Server returned ${response.status}`);
+        }
+        const blob = await response.blob();
+        const link = document.createElement('a');
+        link.download = `textoverlay-creation-${Date.now()}.png`;
+        link.href = URL.createObjectURL(blob);
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(link.href);
+        showNotification('Success!', 'Your creation has been rendered and downloaded.', 'success');
+    } catch (renderError) {
+        console.error('Server render error:', renderError);
+        showNotification('Download Failed', `Server render failed: ${renderError.message}`, 'error');
+    }
+}
+
+// Zoom functionality
+document.getElementById('zoomInBtn').addEventListener('click', function() {
+    canvas.setZoom(canvas.getZoom() * 1.1);
+});
+
+document.getElementById('zoomOutBtn').addEventListener('click', function() {
+    canvas.setZoom(canvas.getZoom() / 1.1);
+});
+
+document.getElementById('fitToScreenBtn').addEventListener('click', function() {
+    canvas.setZoom(1);
+    canvas.viewportTransform = [1, 0, 0, 1, 0, 0];
+    canvas.renderAll();
+});
+
+// Update object properties when selected
+canvas.on('selection:created', function(e) {
+    updateControlsFromObject(e.target);
+});
+
+canvas.on('selection:updated', function(e) {
+    updateControlsFromObject(e.target);
+});
+
+function updateControlsFromObject(obj) {
+    if (obj && obj.type === 'i-text') {
+        document.getElementById('fontFamily').value = obj.fontFamily || 'Arial';
+        document.getElementById('fontSize').value = obj.fontSize || 36;
+        document.getElementById('fontSizeValue').textContent = obj.fontSize || 36;
+        document.getElementById('textColor').value = obj.fill || '#000000';
+        document.getElementById('textColorHex').value = obj.fill || '#000000';
+
+        // Update style buttons
+        document.getElementById('boldBtn').classList.toggle('bg-gray-200', obj.fontWeight === 'bold');
+        document.getElementById('italicBtn').classList.toggle('bg-gray-200', obj.fontStyle === 'italic');
+        document.getElementById('underlineBtn').classList.toggle('bg-gray-200', obj.underline === true);
+    }
+}
+
+// Layers panel functionality
+function updateLayersPanel() {
+    const layersPanel = document.getElementById('layersPanel');
+    layersPanel.innerHTML = '';
+
+    const objects = canvas.getObjects();
+    objects.forEach((obj, index) => {
+        const layerDiv = document.createElement('div');
+        layerDiv.className = 'flex items-center justify-between p-2 bg-gray-50 rounded-lg hover:bg-gray-100 cursor-pointer';
+
+        let layerName = 'Layer ' + (index + 1);
+        if (obj.type === 'i-text') {
+            layerName = obj.text.substring(0, 20) + (obj.text.length > 20 ? '...' : '');
+        } else if (obj.type === 'image') {
+            layerName = 'Image';
+        }
+
+        layerDiv.innerHTML = `
+            <div class="flex items-center space-x-2">
+                <i class="fas ${obj.type === 'i-text' ? 'fa-font' : 'fa-image'} text-gray-500"></i>
+                <span class="text-sm text-gray-700">${layerName}</span>
+            </div>
+            <button class="text-red-500 hover:text-red-700 text-sm" onclick="removeLayer(${index})">
+                <i class="fas fa-trash"></i>
+            </button>
+        `;
+
+        layerDiv.addEventListener('click', function(e) {
+            if (!e.target.closest('button')) {
+                canvas.setActiveObject(obj);
+                canvas.renderAll();
+            }
+        });
+
+        layersPanel.appendChild(layerDiv);
+    });
+}
+
+function removeLayer(index) {
+    const objects = canvas.getObjects();
+    if (objects[index]) {
+        canvas.remove(objects[index]);
+        updateLayersPanel();
+        saveCanvasState();
+    }
+}
+
+// Update layers panel when objects are modified
+canvas.on('object:added', function() {
+    updateLayersPanel();
+    saveCanvasState();
+});
+
+canvas.on('object:removed', function() {
+    updateLayersPanel();
+});
+
+// Initialize canvas state
+saveCanvasState();
+
+// Modern Confirmation Modal System
+function showConfirmModal(title, message, onConfirm, onCancel) {
+    // Create modal backdrop
+    const modalBackdrop = document.createElement('div');
+    modalBackdrop.id = 'confirmModal';
+    modalBackdrop.className = 'fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50 opacity-0 transition-opacity duration-200';
+
+    // Create modal content
+    modalBackdrop.innerHTML = `
+        <div class="bg-white rounded-xl shadow-2xl max-w-md w-full mx-4 transform scale-95 transition-transform duration-200">
+            <div class="p-6">
+                <div class="flex items-start">
+                    <div class="mx-auto flex-shrink-0 flex items-center justify-center h-12 w-12 rounded-full bg-red-100 mb-4">
+                        <i class="fas fa-exclamation-triangle text-red-600 text-lg"></i>
+                    </div>
+                </div>
+                <div class="text-center">
+                    <h3 class="text-lg font-medium text-gray-900 mb-2">${title}</h3>
+                    <p class="text-sm text-gray-500 mb-6">${message}</p>
+                </div>
+                <div class="flex gap-3 justify-center">
+                    <button id="confirmBtn" class="px-4 py-2 bg-red-600 text-white rounded-lg hover:bg-red-700 transition-colors duration-200 focus:outline-none focus:ring-2 focus:ring-red-500 focus:ring-offset-2">
+                        Yes, Clear
+                    </button>
+                    <button id="cancelBtn" class="px-4 py-2 bg-gray-300 text-gray-700 rounded-lg hover:bg-gray-400 transition-colors duration-200 focus:outline-none focus:ring-2 focus:ring-gray-500 focus:ring-offset-2">
+                        Cancel
+                    </button>
+                </div>
+            </div>
+        </div>
+    `;
+
+    document.body.appendChild(modalBackdrop);
+
+    // Animate in
+    setTimeout(() => {
+        modalBackdrop.classList.remove('opacity-0');
+        modalBackdrop.querySelector('.bg-white').classList.remove('scale-95');
+        modalBackdrop.querySelector('.bg-white').classList.add('scale-100');
+    }, 10);
+
+    // Add event listeners
+    const confirmBtn = modalBackdrop.querySelector('#confirmBtn');
+    const cancelBtn = modalBackdrop.querySelector('#cancelBtn');
+
+    function closeModal() {
+        modalBackdrop.classList.add('opacity-0');
+        modalBackdrop.querySelector('.bg-white').classList.add('scale-95');
+        modalBackdrop.querySelector('.bg-white').classList.remove('scale-100');
+
+        setTimeout(() => {
+            if (modalBackdrop.parentNode) {
+                modalBackdrop.parentNode.removeChild(modalBackdrop);
+            }
+        }, 200);
+    }
+
+    confirmBtn.addEventListener('click', () => {
+        onConfirm();
+        closeModal();
+    });
+
+    cancelBtn.addEventListener('click', () => {
+        if (onCancel) onCancel();
+        closeModal();
+    });
+
+    // Close on backdrop click
+    modalBackdrop.addEventListener('click', (e) => {
+        if (e.target === modalBackdrop) {
+            if (onCancel) onCancel();
+            closeModal();
+        }
+    });
+
+    // Close on Escape key
+    const handleEscape = (e) => {
+        if (e.key === 'Escape') {
+            if (onCancel) onCancel();
+            closeModal();
+            document.removeEventListener('keydown', handleEscape);
+        }
+    };
+    document.addEventListener('keydown', handleEscape);
+}
+
+// Toast Notification System
+function showNotification(title, message, type = 'info') {
+    const colors = {
+        success: 'bg-green-500',
+        error: 'bg-red-500',
+        warning: 'bg-yellow-500',
+        info: 'bg-blue-500'
+    };
+
+    const icons = {
+        success: 'fas fa-check-circle',
+        error: 'fas fa-exclamation-circle',
+        warning: 'fas fa-exclamation-triangle',
+        info: 'fas fa-info-circle'
+    };
+
+    const toast = document.createElement('div');
+    toast.className = `fixed top-4 right-4 ${colors[type]} text-white px-6 py-4 rounded-lg shadow-lg z-50 transform translate-x-full transition-transform duration-300 max-w-sm`;
+
+    toast.innerHTML = `
+        <div class="flex items-start">
+            <i class="${icons[type]} text-lg mr-3 mt-0.5"></i>
+            <div class="flex-1">
+                <h4 class="font-medium">${title}</h4>
+                <p class="text-sm opacity-90 mt-1">${message}</p>
+            </div>
+            <button class="ml-4 text-white hover:text-gray-200" onclick="this.parentElement.parentElement.remove()">
+                <i class="fas fa-times"></i>
+            </button>
+        </div>
+    `;
+
+    document.body.appendChild(toast);
+
+    // Animate in
+    setTimeout(() => {
+        toast.classList.remove('translate-x-full');
+        toast.classList.add('translate-x-0');
+    }, 10);
+
+    // Auto remove after 5 seconds
+    setTimeout(() => {
+        if (toast.parentNode) {
+            toast.classList.add('translate-x-full');
+            setTimeout(() => {
+                if (toast.parentNode) {
+                    toast.parentNode.removeChild(toast);
+                }
+            }, 300);
+        }
+    }, 5000);
+}
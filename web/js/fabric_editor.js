@@ -0,0 +1,138 @@
+        // Initialize app
+        let canvasEngine;
+
+        document.addEventListener('DOMContentLoaded', function() {
+            canvasEngine = new CanvasEngine('canvas', {
+                width: 800,
+                height: 600
+            });
+
+            // Update slider value displays
+            document.getElementById('fontSize').addEventListener('input', function() {
+                document.getElementById('fontSizeValue').textContent = this.value + 'px';
+            });
+
+            document.getElementById('strokeWidth').addEventListener('input', function() {
+                document.getElementById('strokeWidthValue').textContent = this.value + 'px';
+            });
+
+            console.log('🚀 TextOverlay Pro - Fabric.js Editor Ready!');
+        });
+
+        // Handle image upload
+        function handleImageUpload(input) {
+            const file = input.files[0];
+            if (file) {
+                const reader = new FileReader();
+                reader.onload = function(e) {
+                    canvasEngine.setBackgroundImage(e.target.result)
+                        .then(() => {
+                            console.log('✅ Image uploaded successfully');
+                        })
+                        .catch(error => {
+                            console.error('❌ Image upload failed:', error);
+                            alert('Failed to load image. Please try again.');
+                        });
+                };
+                reader.readAsDataURL(file);
+            }
+        }
+
+        // Load image from URL
+        function loadImageFromUrl() {
+            const url = document.getElementById('imageUrl').value.trim();
+            if (url) {
+                canvasEngine.setBackgroundImage(url)
+                    .then(() => {
+                        console.log('✅ Image loaded from URL');
+                        document.getElementById('imageUrl').value = '';
+                    })
+                    .catch(error => {
+                        console.error('❌ Failed to load image from URL:', error);
+                        alert('Failed to load image from URL. Please check the URL and try again.');
+                    });
+            }
+        }
+
+        // Add new text
+        function addNewText() {
+            const text = document.getElementById('newText').value.trim();
+            if (text) {
+                canvasEngine.addTextLayer(text);
+                document.getElementById('newText').value = '';
+            } else {
+                alert('Please enter some text first!');
+            }
+        }
+
+        // Toggle lock for selected object
+        function toggleLockSelected() {
+            const isLocked = canvasEngine.toggleLock();
+            const lockBtn = event.target;
+            if (isLocked) {
+                lockBtn.innerHTML = '<i class="fas fa-lock"></i> Locked';
+                lockBtn.classList.remove('btn-secondary');
+                lockBtn.classList.add('bg-orange-600', 'hover:bg-orange-700');
+            } else {
+                lockBtn.innerHTML = '<i class="fas fa-lock-open"></i> Lock';
+                lockBtn.classList.remove('bg-orange-600', 'hover:bg-orange-700');
+                lockBtn.classList.add('btn-secondary');
+            }
+        }
+
+        // Keyboard shortcuts
+        document.addEventListener('keydown', function(e) {
+            if (e.ctrlKey || e.metaKey) {
+                switch(e.key) {
+                    case 'z':
+                        e.preventDefault();
+                        if (e.shiftKey) {
+                            canvasEngine.redo();
+                        } else {
+                            canvasEngine.undo();
+                        }
+                        break;
+                    case 'y':
+                        e.preventDefault();
+                        canvasEngine.redo();
+                        break;
+                    case 's':
+                        e.preventDefault();
+                        canvasEngine.downloadImage('text-overlay', 'png');
+                        break;
+                }
+            }
+
+            // Delete key
+            if (e.key === 'Delete' || e.key === 'Backspace') {
+                const activeElement = document.activeElement;
+                if (activeElement.tagName !== 'INPUT' && activeElement.tagName !== 'TEXTAREA') {
+                    e.preventDefault();
+                    canvasEngine.deleteSelected();
+                }
+            }
+        });
+
+        // Welcome message
+        setTimeout(() => {
+            console.log(`
+🎨 ========================================= 🎨
+   TEXTOVERLAY PRO - FABRIC.JS EDITOR
+🎨 ========================================= 🎨
+
+✨ Professional Features:
+   • Drag & Drop Text Layers
+   • Advanced Font Controls  
+   • Multi-Layer Management
+   • Undo/Redo System
+   • Professional Export Options
+
+🎯 Keyboard Shortcuts:
+   • Ctrl+Z: Undo
+   • Ctrl+Shift+Z: Redo
+   • Ctrl+S: Download PNG
+   • Delete: Remove Selected
+
+Ready to create something amazing! 🚀
+            `);
+        }, 1000);
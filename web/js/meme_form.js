@@ -0,0 +1,1014 @@
+        document.addEventListener('DOMContentLoaded', function() {
+            // Get all elements
+            const urlRadio = document.querySelector('input[value="url"]');
+            const fileRadio = document.querySelector('input[value="file"]');
+            const urlInput = document.getElementById('url_input');
+            const fileInput = document.getElementById('file_input');
+            const imageUrlField = document.querySelector('input[name="image_url"]');
+            const imageFileField = document.querySelector('input[name="image_file"]');
+
+            // Preview elements
+            const previewPanel = document.getElementById('preview-panel');
+            const previewCanvas = document.getElementById('preview-canvas');
+            const previewLoading = document.getElementById('preview-loading');
+
+            // Text controls
+            const textArea = document.querySelector('textarea[name="body"]');
+            const textColor = document.querySelector('select[name="text_color"]');
+            const fontSize = document.querySelector('select[name="font_size"]');
+            const fontFamily = document.querySelector('select[name="font_family"]');
+            const positionX = document.querySelector('input[name="text_position_x"]');
+            const positionY = document.querySelector('input[name="text_position_y"]');
+
+            // Info panels
+            const infoPanels = document.querySelectorAll('.info-panel');
+
+            let currentImageUrl = ''; // Track current loaded image URL
+            let currentImage = null;
+            let ctx = null;
+            let isDragging = false;
+            let textX = 50; // Percentage
+            let textY = 50; // Percentage
+
+            // Sample templates
+            const samples = {
+                motivational: {
+                    image: 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop',
+                    text: 'SUCCESS IS NOT FINAL\nFAILURE IS NOT FATAL\nIT IS THE COURAGE TO CONTINUE\nTHAT COUNTS',
+                    color: 'white',
+                    size: '48',
+                    family: 'Impact',
+                    x: '50',
+                    y: '50'
+                },
+                funny: {
+                    image: 'https://images.unsplash.com/photo-1415604934674-561df9abf539?w=800&h=600&fit=crop',
+                    text: 'WHEN YOU FINALLY FIX\nTHE BUG THAT\'S BEEN\nBUGGING YOU ALL DAY',
+                    color: 'white',
+                    size: '36',
+                    family: 'Arial',
+                    x: '50',
+                    y: '20'
+                },
+                announcement: {
+                    image: 'https://images.unsplash.com/photo-1540575467063-178a50c2df87?w=800&h=600&fit=crop',
+                    text: 'IMPORTANT ANNOUNCEMENT\n\nEvent: Team Meeting\nDate: Tomorrow\nTime: 3:00 PM',
+                    color: 'white',
+                    size: '32',
+                    family: 'Arial',
+                    x: '50',
+                    y: '40'
+                }
+            };
+
+            // Demo steps configuration
+            const demoSteps = [
+                {
+                    title: "📸 Step 1: Choose Your Image",
+                    description: "Start by selecting an image URL or uploading a file",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-6">
+                            <div class="space-y-4">
+                                <div class="bg-yellow-50 border-l-4 border-yellow-400 p-4 rounded">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 What we're doing:</h4>
+                                    <p class="text-gray-700">Loading a beautiful mountain landscape that will serve as our background image.</p>
+                                </div>
+
+                                <div class="bg-white border border-gray-200 rounded-lg p-4">
+                                    <label class="block text-sm font-semibold text-gray-700 mb-2">Image URL</label>
+                                    <div class="relative">
+                                        <input type="url" value="https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop" class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-gray-50" readonly>
+                                        <div class="absolute right-3 top-3 text-green-500">
+                                            <i class="fas fa-check-circle"></i>
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <div class="flex items-center space-x-2 text-sm text-gray-600">
+                                    <i class="fas fa-info-circle text-blue-500"></i>
+                                    <span>The image will load automatically and show a preview</span>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-4 flex items-center justify-center">
+                                <div class="text-center">
+                                    <div class="animate-pulse bg-gray-300 rounded-lg w-80 h-60 mb-4"></div>
+                                    <p class="text-gray-500">Image preview will appear here</p>
+                                </div>
+                            </div>
+                        </div>
+                    `,
+                    action: () => {
+                        // Simulate image selection
+                        urlRadio.checked = true;
+                        toggleInputs();
+                        imageUrlField.value = 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop';
+                    }
+                },
+                {
+                    title: "✏️ Step 2: Add Your Text",
+                    description: "Enter your message and customize the styling",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-6">
+                            <div class="space-y-4">
+                                <div class="bg-blue-50 border-l-4 border-blue-400 p-4 rounded">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 What we're doing:</h4>
+                                    <p class="text-gray-700">Adding inspirational text with perfect styling for maximum impact.</p>
+                                </div>
+
+                                <div class="bg-white border border-gray-200 rounded-lg p-4 space-y-4">
+                                    <div>
+                                        <label class="block text-sm font-semibold text-gray-700 mb-2">Text Content</label>
+                                        <textarea class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-gray-50" rows="3" readonly>SUCCESS IS NOT FINAL
+FAILURE IS NOT FATAL
+IT IS THE COURAGE TO CONTINUE</textarea>
+                                    </div>
+
+                                    <div class="grid grid-cols-2 gap-4">
+                                        <div>
+                                            <label class="block text-sm font-semibold text-gray-700 mb-2">Font Size</label>
+                                            <select class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-gray-50" disabled>
+                                                <option>Extra Large (48px)</option>
+                                            </select>
+                                        </div>
+                                        <div>
+                                            <label class="block text-sm font-semibold text-gray-700 mb-2">Color</label>
+                                            <select class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-gray-50" disabled>
+                                                <option>White</option>
+                                            </select>
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <div class="flex items-center space-x-2 text-sm text-gray-600">
+                                    <i class="fas fa-magic text-purple-500"></i>
+                                    <span>Watch the text appear on your image in real-time!</span>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-4 flex items-center justify-center">
+                                <div class="text-center">
+                                    <div class="bg-gradient-to-br from-blue-400 to-purple-600 rounded-lg w-80 h-60 mb-4 flex items-center justify-center text-white font-bold text-sm relative">
+                                        <div class="absolute inset-0 bg-black bg-opacity-20 rounded-lg"></div>
+                                        <div class="relative text-center">
+                                            SUCCESS IS NOT FINAL<br>
+                                            FAILURE IS NOT FATAL<br>
+                                            IT IS THE COURAGE TO CONTINUE
+                                        </div>
+                                    </div>
+                                    <p class="text-gray-500">Live preview with your text</p>
+                                </div>
+                            </div>
+                        </div>
+                    `,
+                    action: () => {
+                        // Simulate text input and styling
+                        textArea.value = 'SUCCESS IS NOT FINAL\nFAILURE IS NOT FATAL\nIT IS THE COURAGE TO CONTINUE\nTHAT COUNTS';
+                        fontSize.value = '48';
+                        textColor.value = 'white';
+                        fontFamily.value = 'Impact';
+                    }
+                },
+                {
+                    title: "🎯 Step 3: Position & Create",
+                    description: "Fine-tune the text position and generate your image",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-6">
+                            <div class="space-y-4">
+                                <div class="bg-green-50 border-l-4 border-green-400 p-4 rounded">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 What we're doing:</h4>
+                                    <p class="text-gray-700">Positioning the text perfectly and creating the final image.</p>
+                                </div>
+
+                                <div class="bg-white border border-gray-200 rounded-lg p-4 space-y-4">
+                                    <div>
+                                        <label class="block text-sm font-semibold text-gray-700 mb-2">Text Position</label>
+                                        <div class="grid grid-cols-2 gap-4">
+                                            <div>
+                                                <label class="block text-xs text-gray-600 mb-1">Horizontal</label>
+                                                <input type="range" min="0" max="100" value="50" class="w-full accent-green-600" disabled>
+                                                <div class="text-xs text-gray-400 mt-1">50% (Center)</div>
+                                            </div>
+                                            <div>
+                                                <label class="block text-xs text-gray-600 mb-1">Vertical</label>
+                                                <input type="range" min="0" max="100" value="50" class="w-full accent-green-600" disabled>
+                                                <div class="text-xs text-gray-400 mt-1">50% (Middle)</div>
+                                            </div>
+                                        </div>
+                                    </div>
+
+                                    <div class="pt-4 border-t">
+                                        <button class="w-full bg-gradient-to-r from-green-600 to-green-700 text-white py-3 rounded-lg font-semibold shadow-lg">
+                                            <i class="fas fa-magic mr-2"></i>
+                                            Create Your Image
+                                        </button>
+                                    </div>
+                                </div>
+
+                                <div class="bg-yellow-50 border border-yellow-200 rounded-lg p-4">
+                                    <div class="flex items-center space-x-2 mb-2">
+                                        <i class="fas fa-lightbulb text-yellow-500"></i>
+                                        <span class="font-semibold text-gray-800">Pro Tips:</span>
+                                    </div>
+                                    <ul class="text-sm text-gray-700 space-y-1">
+                                        <li>• Click and drag on the preview to move text</li>
+                                        <li>• Use sliders for precise positioning</li>
+                                        <li>• Text outline ensures readability</li>
+                                    </ul>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-4 flex items-center justify-center">
+                                <div class="text-center">
+                                    <div class="bg-gradient-to-br from-blue-400 to-purple-600 rounded-lg w-80 h-60 mb-4 flex items-center justify-center text-white font-bold text-lg relative overflow-hidden">
+                                        <div class="absolute inset-0 bg-black bg-opacity-20 rounded-lg"></div>
+                                        <div class="relative text-center leading-tight">
+                                            SUCCESS IS NOT FINAL<br>
+                                            FAILURE IS NOT FATAL<br>
+                                            <span class="text-yellow-300">IT IS THE COURAGE TO CONTINUE</span>
+                                        </div>
+                                        <div class="absolute top-2 right-2 bg-green-500 text-white px-2 py-1 rounded-full text-xs">
+                                            <i class="fas fa-check mr-1"></i>Ready!
+                                        </div>
+                                    </div>
+                                    <p class="text-gray-500">Perfect positioning achieved!</p>
+                                </div>
+                            </div>
+                        </div>
+                    `,
+                    action: () => {
+                        // Simulate positioning
+                        positionX.value = '50';
+                        positionY.value = '50';
+                        textX = 50;
+                        textY = 50;
+                        // Trigger preview update if image is loaded
+                        if (currentImage) {
+                            renderPreview();
+                        }
+                    }
+                }
+            ];
+
+            // Toggle input types
+            function toggleInputs() {
+                if (urlRadio.checked) {
+                    urlInput.style.display = 'block';
+                    fileInput.style.display = 'none';
+                } else if (fileRadio.checked) {
+                    urlInput.style.display = 'none';
+                    fileInput.style.display = 'block';
+                }
+            }
+
+            // Hide info panels completely
+            // Hide info panels with animation
+            function hideInfoPanels() {
+                infoPanels.forEach(panel => {
+                    panel.classList.add('fade-out');
+                });
+
+                // Hide completely after animation
+                setTimeout(() => {
+                    infoPanels.forEach(panel => {
+                        panel.classList.add('hidden');
+                    });
+                }, 600);
+            }
+
+            // Show info panels with animation
+            function showInfoPanels() {
+                infoPanels.forEach(panel => {
+                    panel.classList.remove('hidden');
+                    // Force reflow
+                    panel.offsetHeight;
+                    panel.classList.remove('fade-out');
+                });
+            }
+
+            // Show preview panel with animation
+            function showPreview() {
+                previewPanel.style.display = 'block';
+                // Force reflow
+                previewPanel.offsetHeight;
+                previewPanel.classList.add('show');
+            }
+
+            // Hide preview panel with animation
+            function hidePreview() {
+                previewPanel.classList.remove('show');
+                setTimeout(() => {
+                    previewPanel.style.display = 'none';
+                    currentImage = null;
+                }, 600);
+            }
+
+            // Load image and create preview
+            function loadImage(src) {
+                console.log('loadImage called with:', src);
+                if (!previewCanvas) return;
+
+                previewLoading.style.display = 'flex';
+                ctx = previewCanvas.getContext('2d');
+
+                // Use proxy for external URLs to avoid CORS
+                let imageUrl = src;
+                if (src.startsWith('http://') || src.startsWith('https://')) {
+                    // Preview canvas is at most 500x400, no need for the full original
+                    const dpr = Math.min(window.devicePixelRatio || 1, 2);
+                    imageUrl = `/proxy-image?url=${encodeURIComponent(src)}&w=${Math.round(500 * dpr)}&h=${Math.round(400 * dpr)}`;
+                    console.log('Using proxy URL:', imageUrl);
+                }
+
+                const img = new Image();
+                img.crossOrigin = 'anonymous';
+
+                img.onload = function() {
+                    console.log('Image loaded successfully, dimensions:', img.width, 'x', img.height);
+                    // Set canvas size
+                    const maxWidth = 500;
+                    const maxHeight = 400;
+
+                    let width = img.width;
+                    let height = img.height;
+
+                    // Scale to fit
+                    const aspectRatio = width / height;
+
+                    if (width > maxWidth) {
+                        width = maxWidth;
+                        height = width / aspectRatio;
+                    }
+
+                    if (height > maxHeight) {
+                        height = maxHeight;
+                        width = height * aspectRatio;
+                    }
+
+                    previewCanvas.width = width;
+                    previewCanvas.height = height;
+
+                    currentImage = img;
+
+                    // Initial render
+                    renderPreview();
+
+                    previewLoading.style.display = 'none';
+
+                    // Add real-time text input listeners
+                    addTextUpdateListeners();
+                };
+
+                img.onerror = function() {
+                    console.log('Image failed to load:', src);
+                    previewLoading.style.display = 'none';
+                    // Show error message
+                    ctx.fillStyle = '#ef4444';
+                    ctx.font = '16px Arial';
+                    ctx.fillText('Failed to load image', 20, 50);
+                };
+
+                img.src = imageUrl;
+            }
+
+            // Render preview with current settings
+            function renderPreview() {
+                if (!currentImage || !ctx || !previewCanvas) return;
+
+                // Clear canvas
+                ctx.clearRect(0, 0, previewCanvas.width, previewCanvas.height);
+
+                // Draw image
+                ctx.drawImage(currentImage, 0, 0, previewCanvas.width, previewCanvas.height);
+
+                // Draw text if any
+                const text = textArea.value.trim();
+                if (text) {
+                    drawText(text);
+                    scheduleServerPreview();
+                }
+            }
+
+            // Server preview - the canvas drawing above is instant but only
+            // approximates the final fonts/wrapping, so once edits settle the
+            // server's low-resolution render replaces it
+            let serverPreviewTimer = null;
+            let serverPreviewController = null;
+            let previewSource = null; // {file, key} of the last uploaded file
+
+            function scheduleServerPreview() {
+                clearTimeout(serverPreviewTimer);
+                serverPreviewTimer = setTimeout(requestServerPreview, 150);
+            }
+
+            async function requestServerPreview() {
+                if (!currentImage || !textArea.value.trim()) return;
+
+                // Only the newest preview matters, drop the one in flight
+                if (serverPreviewController) serverPreviewController.abort();
+                serverPreviewController = new AbortController();
+
+                const formData = new FormData(form);
+                formData.set('text_position_x', Math.round(textX));
+                formData.set('text_position_y', Math.round(textY));
+                formData.set('preview_width', previewCanvas.width);
+
+                // Reuse the server's cached copy of an upload instead of sending it again
+                const file = fileRadio.checked ? imageFileField.files[0] : null;
+                if (file && previewSource && previewSource.file === file) {
+                    formData.delete('image_file');
+                    formData.set('image_source', 'cached');
+                    formData.set('source_key', previewSource.key);
+                }
+
+                try {
+                    const response = await fetch('/preview', {
+                        method: 'POST',
+                        body: formData,
+                        signal: serverPreviewController.signal
+                    });
+                    if (response.status === 409) {
+                        // Server evicted the upload, send it again
+                        previewSource = null;
+                        return requestServerPreview();
+                    }
+                    if (response.status !== 200) return;
+
+                    if (file) previewSource = {file: file, key: response.headers.get('X-Preview-Source')};
+                    const bitmap = await createImageBitmap(await response.blob());
+                    ctx.drawImage(bitmap, 0, 0, previewCanvas.width, previewCanvas.height);
+                } catch (error) {
+                    if (error.name !== 'AbortError') {
+                        console.log('Server preview failed:', error);
+                    }
+                }
+            }
+
+            // Draw text on canvas
+            function drawText(text) {
+                if (!ctx) return;
+
+                // 'auto' is sized by the server, the server preview shows the real size
+                const fontSizeVal = parseInt(fontSize ? fontSize.value : '30') || 30;
+                const fontFamilyVal = fontFamily ? fontFamily.value : 'Impact';
+                // 'auto' is picked by the server too, sketch it in white meanwhile
+                const colorVal = textColor && textColor.value !== 'auto' ? textColor.value : 'white';
+
+                // Set text properties
+                ctx.font = `${fontSizeVal}px ${fontFamilyVal}`;
+                ctx.fillStyle = colorVal;
+                ctx.strokeStyle = 'black';
+                ctx.lineWidth = 2;
+                ctx.textAlign = 'center';
+                ctx.textBaseline = 'middle';
+
+                // Calculate position
+                const x = (textX / 100) * previewCanvas.width;
+                const y = (textY / 100) * previewCanvas.height;
+
+                // Handle multi-line text
+                const lines = text.split('\n');
+                const lineHeight = fontSizeVal * 1.2;
+                const startY = y - ((lines.length - 1) * lineHeight) / 2;
+
+                lines.forEach((line, index) => {
+                    const lineY = startY + (index * lineHeight);
+                    // Draw stroke (outline)
+                    ctx.strokeText(line, x, lineY);
+                    // Draw fill
+                    ctx.fillText(line, x, lineY);
+                });
+            }
+
+            // Add real-time text update listeners
+            function addTextUpdateListeners() {
+                // Remove existing listeners to avoid duplicates
+                const elements = [textArea, textColor, fontSize, fontFamily, positionX, positionY];
+                elements.forEach(el => {
+                    if (el) {
+                        el.removeEventListener('input', renderPreview);
+                        el.removeEventListener('change', renderPreview);
+                    }
+                });
+
+                // Add new listeners
+                if (textArea) {
+                    textArea.addEventListener('input', renderPreview);
+                    textArea.addEventListener('keyup', renderPreview);
+                }
+                if (textColor) textColor.addEventListener('change', renderPreview);
+                if (fontSize) fontSize.addEventListener('change', renderPreview);
+                if (fontFamily) fontFamily.addEventListener('change', renderPreview);
+                if (positionX) {
+                    positionX.addEventListener('input', () => {
+                        textX = parseInt(positionX.value);
+                        renderPreview();
+                    });
+                }
+                if (positionY) {
+                    positionY.addEventListener('input', () => {
+                        textY = parseInt(positionY.value);
+                        renderPreview();
+                    });
+                }
+            }
+
+            // Get mouse position relative to canvas
+            function getMousePos(e) {
+                const rect = previewCanvas.getBoundingClientRect();
+                const scaleX = previewCanvas.width / rect.width;
+                const scaleY = previewCanvas.height / rect.height;
+
+                return {
+                    x: (e.clientX - rect.left) * scaleX,
+                    y: (e.clientY - rect.top) * scaleY
+                };
+            }
+
+            // Check if we should show preview
+            function checkForImage() {
+                const hasUrl = imageUrlField.value.trim().length > 0 && 
+                             (imageUrlField.value.startsWith('http://') || imageUrlField.value.startsWith('https://'));
+                const hasFile = imageFileField.files && imageFileField.files.length > 0;
+
+                if (hasUrl || hasFile) {
+                    hideInfoPanels();
+                    showPreview();
+
+                    // Hide result panel when loading new image
+                    const resultPanel = document.getElementById('result-panel');
+                    if (resultPanel) {
+                        resultPanel.style.display = 'none';
+                    }
+
+                    if (hasUrl) {
+                        // Only load if it's a different URL
+                        if (imageUrlField.value !== currentImageUrl) {
+                            currentImageUrl = imageUrlField.value;
+                            loadImage(imageUrlField.value);
+                        } else if (currentImage) {
+                            // Image already loaded, just render preview
+                            renderPreview();
+                        }
+                    } else if (hasFile) {
+                        const reader = new FileReader();
+                        reader.onload = function(e) {
+                            currentImageUrl = e.target.result;
+                            loadImage(e.target.result);
+                        };
+                        reader.readAsDataURL(imageFileField.files[0]);
+                    }
+                } else {
+                    showInfoPanels();
+                    hidePreview();
+
+                    // Hide result panel when no image
+                    const resultPanel = document.getElementById('result-panel');
+                    if (resultPanel) {
+                        resultPanel.style.display = 'none';
+                    }
+                }
+            }
+
+            // Update slider values display
+            function updateSliderDisplay() {
+                const xValue = document.getElementById('x-value');
+                const yValue = document.getElementById('y-value');
+                if (xValue) xValue.textContent = Math.round(textX) + '%';
+                if (yValue) yValue.textContent = Math.round(textY) + '%';
+            }
+
+            // Mouse events for dragging
+            previewCanvas.addEventListener('mousedown', function(e) {
+                if (!currentImage) return;
+                isDragging = true;
+                previewCanvas.style.cursor = 'grabbing';
+
+                const pos = getMousePos(e);
+                textX = (pos.x / previewCanvas.width) * 100;
+                textY = (pos.y / previewCanvas.height) * 100;
+
+                // Keep within bounds
+                textX = Math.max(5, Math.min(95, textX));
+                textY = Math.max(10, Math.min(90, textY));
+
+                // Update sliders to match drag position
+                positionX.value = Math.round(textX);
+                positionY.value = Math.round(textY);
+                updateSliderDisplay();
+
+                renderPreview();
+            });
+
+            previewCanvas.addEventListener('mousemove', function(e) {
+                if (!isDragging || !currentImage) return;
+
+                const pos = getMousePos(e);
+                textX = (pos.x / previewCanvas.width) * 100;
+                textY = (pos.y / previewCanvas.height) * 100;
+
+                // Keep within bounds
+                textX = Math.max(5, Math.min(95, textX));
+                textY = Math.max(10, Math.min(90, textY));
+
+                // Update sliders to match drag position
+                positionX.value = Math.round(textX);
+                positionY.value = Math.round(textY);
+                updateSliderDisplay();
+
+                renderPreview();
+            });
+
+            previewCanvas.addEventListener('mouseup', function() {
+                isDragging = false;
+                previewCanvas.style.cursor = 'crosshair';
+            });
+
+            previewCanvas.addEventListener('mouseleave', function() {
+                isDragging = false;
+                previewCanvas.style.cursor = 'crosshair';
+            });
+
+            // Event listeners
+            urlRadio.addEventListener('change', toggleInputs);
+            fileRadio.addEventListener('change', toggleInputs);
+
+            // Demo Functions - removed due to missing HTML elements
+            // function showDemoModal() - removed
+            // function hideDemoModal() - removed
+
+            function showDemoStep(stepIndex) {
+                currentDemoStep = stepIndex;
+                const step = demoSteps[stepIndex];
+
+                // Update content
+                demoContent.innerHTML = `
+                    <div class="mb-6">
+                        <h4 class="text-xl font-bold text-gray-800 mb-2">${step.title}</h4>
+                        <p class="text-gray-600">${step.description}</p>
+                    </div>
+                    ${step.content}
+                `;
+
+                // Update progress
+                demoProgress.textContent = `Step ${stepIndex + 1} of ${demoSteps.length}`;
+
+                // Update step indicators
+                stepIndicators.forEach((indicator, index) => {
+                    if (index <= stepIndex) {
+                        indicator.classList.remove('bg-gray-300');
+                        indicator.classList.add('bg-indigo-500');
+                    } else {
+                        indicator.classList.remove('bg-indigo-500');
+                        indicator.classList.add('bg-gray-300');
+                    }
+                });
+
+                // Update button states
+                demoPrevBtn.disabled = stepIndex === 0;
+                demoNextBtn.textContent = stepIndex === demoSteps.length - 1 ? 
+                    'Try It Yourself!' : 
+                    'Next';
+                demoNextBtn.innerHTML = stepIndex === demoSteps.length - 1 ? 
+                    'Try It Yourself!<i class="fas fa-rocket ml-2"></i>' : 
+                    'Next<i class="fas fa-chevron-right ml-2"></i>';
+
+                // Execute step action after a delay for better UX
+                setTimeout(() => {
+                    if (step.action) {
+                        step.action();
+                    }
+                }, 500);
+            }
+
+            function nextDemoStep() {
+                if (currentDemoStep < demoSteps.length - 1) {
+                    showDemoStep(currentDemoStep + 1);
+                } else {
+                    // Final step - close demo
+                    hideDemoModal();
+                }
+            }
+
+            function prevDemoStep() {
+                if (currentDemoStep > 0) {
+                    showDemoStep(currentDemoStep - 1);
+                }
+            }
+
+            function startAutoPlay() {
+                if (isAutoPlaying) {
+                    stopAutoPlay();
+                    return;
+                }
+
+                isAutoPlaying = true;
+                demoAutoBtn.innerHTML = '<i class="fas fa-pause mr-2"></i>Pause';
+                demoAutoBtn.classList.remove('bg-green-600', 'hover:bg-green-700');
+                demoAutoBtn.classList.add('bg-orange-600', 'hover:bg-orange-700');
+
+                autoPlayInterval = setInterval(() => {
+                    if (currentDemoStep < demoSteps.length - 1) {
+                        nextDemoStep();
+                    } else {
+                        stopAutoPlay();
+                    }
+                }, 4000); // 4 seconds per step
+            }
+
+            function stopAutoPlay() {
+                isAutoPlaying = false;
+                if (autoPlayInterval) {
+                    clearInterval(autoPlayInterval);
+                    autoPlayInterval = null;
+                }
+                demoAutoBtn.innerHTML = '<i class="fas fa-play mr-2"></i>Auto Play';
+                demoAutoBtn.classList.remove('bg-orange-600', 'hover:bg-orange-700');
+                demoAutoBtn.classList.add('bg-green-600', 'hover:bg-green-700');
+            }
+
+            // Try Sample button functionality removed - element doesn't exist
+
+            // Setup event listeners for form inputs
+            imageUrlField.addEventListener('input', checkForImage);
+            imageUrlField.addEventListener('paste', () => setTimeout(checkForImage, 100));
+            imageFileField.addEventListener('change', checkForImage);
+
+            // Load Image button
+            document.getElementById('loadImageBtn').addEventListener('click', function() {
+                const url = imageUrlField.value.trim();
+                console.log('Load button clicked, URL:', url);
+                if (url) {
+                    checkForImage();
+                } else {
+                    // Show error notification
+                    showToast('Please enter an image URL first', 'error');
+                }
+            });
+
+            // Text changes - use renderPreview instead of updateCanvas
+            textArea.addEventListener('input', renderPreview);
+            textColor.addEventListener('change', renderPreview);
+            fontSize.addEventListener('change', renderPreview);
+            fontFamily.addEventListener('change', renderPreview);
+            const autoPlace = document.querySelector('input[name="auto_place"]');
+            if (autoPlace) autoPlace.addEventListener('change', renderPreview);
+
+            // Slider changes
+            positionX.addEventListener('input', () => {
+                textX = parseInt(positionX.value);
+                renderPreview();
+                updateSliderDisplay();
+            });
+
+            positionY.addEventListener('input', () => {
+                textY = parseInt(positionY.value);
+                renderPreview();
+                updateSliderDisplay();
+            });
+
+            // Simple toast notification function
+            function showToast(message, type = 'info') {
+                const colors = {
+                    error: 'bg-red-500',
+                    success: 'bg-green-500',
+                    info: 'bg-blue-500'
+                };
+
+                const toast = document.createElement('div');
+                toast.className = `fixed top-4 right-4 ${colors[type]} text-white px-6 py-3 rounded-lg shadow-lg z-50 transform translate-x-full transition-transform duration-300`;
+                toast.textContent = message;
+                document.body.appendChild(toast);
+
+                setTimeout(() => toast.style.transform = 'translateX(0)', 10);
+                setTimeout(() => {
+                    toast.style.transform = 'translateX(100%)';
+                    setTimeout(() => toast.remove(), 300);
+                }, 3000);
+            }
+
+            // Reset button
+            document.querySelector('button[type="button"]').addEventListener('click', () => {
+                setTimeout(() => {
+                    showInfoPanels();
+                    hidePreview();
+                    textX = 50;
+                    textY = 50;
+                    updateSliderDisplay();
+
+                    // Clear result panel
+                    const resultPanel = document.getElementById('result-panel');
+                    if (resultPanel) {
+                        resultPanel.style.display = 'none';
+                    }
+
+                    // Reset image state
+                    currentImageUrl = '';
+                    currentImage = null;
+                }, 100);
+            });
+
+            // Initialize
+            toggleInputs();
+            updateSliderDisplay();
+
+            // Check if coming from Try Now page with a sample selection
+            const selectedSample = sessionStorage.getItem('selectedSample');
+            if (selectedSample) {
+                // Clear the session storage
+                sessionStorage.removeItem('selectedSample');
+
+                // Sample data
+                const samples = {
+                    motivational: {
+                        image: 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop',
+                        text: 'SUCCESS IS NOT FINAL\nFAILURE IS NOT FATAL\nIT IS THE COURAGE TO CONTINUE\nTHAT COUNTS',
+                        color: 'white',
+                        size: '48',
+                        family: 'Impact'
+                    },
+                    funny: {
+                        image: 'https://images.unsplash.com/photo-1415604934674-561df9abf539?w=800&h=600&fit=crop',
+                        text: 'WHEN YOU FINALLY FIX\nTHE BUG THAT\'S BEEN\nBUGGING YOU ALL DAY',
+                        color: 'white',
+                        size: '36',
+                        family: 'Arial'
+                    },
+                    announcement: {
+                        image: 'https://images.unsplash.com/photo-1540575467063-178a50c2df87?w=800&h=600&fit=crop',
+                        text: 'IMPORTANT ANNOUNCEMENT\n\nEvent: Team Meeting\nDate: Tomorrow\nTime: 3:00 PM',
+                        color: 'white',
+                        size: '32',
+                        family: 'Arial'
+                    }
+                };
+
+                const sample = samples[selectedSample];
+                if (sample) {
+                    // Auto-fill the form with sample data
+                    setTimeout(() => {
+                        imageUrlField.value = sample.image;
+                        textArea.value = sample.text;
+                        textColor.value = sample.color;
+                        fontSize.value = sample.size;
+                        fontFamily.value = sample.family;
+
+                        // Trigger image loading
+                        checkForImage();
+
+                        // Show success message
+                        const successMsg = document.createElement('div');
+                        successMsg.className = 'fixed top-4 right-4 bg-green-500 text-white px-6 py-3 rounded-lg shadow-lg z-50 transform translate-x-full transition-transform duration-300';
+                        successMsg.textContent = `✅ ${selectedSample.charAt(0).toUpperCase() + selectedSample.slice(1)} sample loaded!`;
+                        document.body.appendChild(successMsg);
+
+                        // Animate in
+                        setTimeout(() => {
+                            successMsg.style.transform = 'translateX(0)';
+                        }, 10);
+
+                        // Animate out and remove
+                        setTimeout(() => {
+                            successMsg.style.transform = 'translateX(100%)';
+                            setTimeout(() => {
+                                if (successMsg.parentNode) {
+                                    successMsg.parentNode.removeChild(successMsg);
+                                }
+                            }, 300);
+                        }, 3000);
+                    }, 300);
+                }
+            }
+
+            // AJAX Form Submission
+            const form = document.getElementById('image-form');
+            form.addEventListener('submit', async function(e) {
+                e.preventDefault();
+
+                // Update form fields with current position values
+                positionX.value = Math.round(textX);
+                positionY.value = Math.round(textY);
+
+                // Show loading state
+                const submitBtn = form.querySelector('button[type="submit"]');
+                const originalText = submitBtn.innerHTML;
+                submitBtn.innerHTML = '<i class="fas fa-spinner fa-spin mr-2"></i>Creating...';
+                submitBtn.disabled = true;
+
+                try {
+                    const formData = new FormData(form);
+
+                    const response = await fetch(form.action, {
+                        method: 'POST',
+                        body: formData,
+                        headers: {
+                            'X-Requested-With': 'XMLHttpRequest'
+                        }
+                    });
+
+                    if (response.ok) {
+                        const result = await response.json();
+                        if (result.success) {
+                            showResultPanel(result.image_path);
+                            showToast('Image created successfully!', 'success');
+                        } else {
+                            showToast(result.message || 'Error creating image', 'error');
+                        }
+                    } else {
+                        const errorResult = await response.json().catch(() => ({}));
+                        showToast(errorResult.message || 'Server error occurred', 'error');
+                    }
+
+                } catch (error) {
+                    console.error('Error:', error);
+                    showToast('Network error occurred', 'error');
+                } finally {
+                    // Restore button
+                    submitBtn.innerHTML = originalText;
+                    submitBtn.disabled = false;
+                }
+            });
+
+            function showResultPanel(imagePath) {
+                // Hide info panels
+                document.querySelectorAll('.info-panel').forEach(panel => {
+                    panel.style.display = 'none';
+                });
+
+                // Create or show result panel
+                let resultPanel = document.getElementById('result-panel');
+                if (!resultPanel) {
+                    resultPanel = document.createElement('div');
+                    resultPanel.id = 'result-panel';
+                    resultPanel.className = 'bg-white rounded-2xl professional-shadow border border-gray-200 p-6';
+                    document.getElementById('info-panels').appendChild(resultPanel);
+                }
+
+                resultPanel.innerHTML = `
+                    <h3 class="text-lg font-bold text-gray-800 mb-4 flex items-center">
+                        <i class="fas fa-check-circle text-green-500 mr-2"></i>
+                        Your Image is Ready!
+                    </h3>
+
+                    <div class="space-y-4">
+                        <div class="text-center">
+                            <img src="${imagePath}" alt="Generated Image" class="max-w-full h-auto rounded-lg shadow-lg border border-gray-200">
+                        </div>
+
+                        <div class="border-t pt-4">
+                            <h4 class="font-semibold text-gray-700 mb-3 flex items-center">
+                                <i class="fas fa-download text-blue-500 mr-2"></i>
+                                Download Options
+                            </h4>
+                            <div class="grid grid-cols-2 gap-3">
+                                <a href="/download/${imagePath.startsWith('/static/') ? imagePath.substring(8) : imagePath}?format=original" 
+                                   class="flex items-center justify-center px-4 py-2 bg-gray-600 hover:bg-gray-700 text-white rounded-lg transition-colors">
+                                    <i class="fas fa-file-image mr-2"></i>
+                                    Original
+                                </a>
+                                <a href="/download/${imagePath.startsWith('/static/') ? imagePath.substring(8) : imagePath}?format=png" 
+                                   class="flex items-center justify-center px-4 py-2 bg-blue-600 hover:bg-blue-700 text-white rounded-lg transition-colors">
+                                    <i class="fas fa-file-image mr-2"></i>
+                                    PNG
+                                </a>
+                                <a href="/download/${imagePath.startsWith('/static/') ? imagePath.substring(8) : imagePath}?format=webp" 
+                                   class="flex items-center justify-center px-4 py-2 bg-green-600 hover:bg-green-700 text-white rounded-lg transition-colors">
+                                    <i class="fas fa-file-image mr-2"></i>
+                                    WebP
+                                </a>
+                                <a href="/download/${imagePath.startsWith('/static/') ? imagePath.substring(8) : imagePath}?format=pdf" 
+                                   class="flex items-center justify-center px-4 py-2 bg-red-600 hover:bg-red-700 text-white rounded-lg transition-colors">
+                                    <i class="fas fa-file-pdf mr-2"></i>
+                                    PDF
+                                </a>
+                            </div>
+                        </div>
+
+                        <div class="border-t pt-4 flex justify-center">
+                            <button onclick="resetAndCreate()" class="px-6 py-2 bg-gray-100 hover:bg-gray-200 text-gray-700 rounded-lg transition-colors">
+                                <i class="fas fa-plus mr-2"></i>
+                                Create Another Image
+                            </button>
+                        </div>
+                    </div>
+                `;
+
+                resultPanel.style.display = 'block';
+
+                // Scroll to result
+                resultPanel.scrollIntoView({ behavior: 'smooth', block: 'center' });
+            }
+
+            function resetAndCreate() {
+                // Show info panels
+                document.querySelectorAll('.info-panel').forEach(panel => {
+                    panel.style.display = 'block';
+                });
+
+                // Hide result panel
+                const resultPanel = document.getElementById('result-panel');
+                if (resultPanel) {
+                    resultPanel.style.display = 'none';
+                }
+            }
+        });
@@ -0,0 +1,390 @@
+        document.addEventListener('DOMContentLoaded', function() {
+            // Elements
+            const startDemoBtn = document.getElementById('start-demo');
+            const trySamplesBtn = document.getElementById('try-samples');
+            const demoModal = document.getElementById('demo-modal');
+            const closeDemoBtn = document.getElementById('close-demo');
+            const demoContent = document.getElementById('demo-content');
+            const demoProgress = document.getElementById('demo-progress');
+            const demoPrevBtn = document.getElementById('demo-prev');
+            const demoNextBtn = document.getElementById('demo-next');
+            const demoAutoBtn = document.getElementById('demo-auto');
+            const stepIndicators = [
+                document.getElementById('step-1'),
+                document.getElementById('step-2'),
+                document.getElementById('step-3')
+            ];
+            const sampleOptions = document.querySelectorAll('.sample-option');
+
+            // Demo state
+            let currentDemoStep = 0;
+            let isAutoPlaying = false;
+            let autoPlayInterval = null;
+
+            // Sample templates
+            const samples = {
+                motivational: {
+                    image: 'https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop',
+                    text: 'SUCCESS IS NOT FINAL\nFAILURE IS NOT FATAL\nIT IS THE COURAGE TO CONTINUE\nTHAT COUNTS',
+                    color: 'white',
+                    size: '48',
+                    family: 'Impact',
+                    x: '50',
+                    y: '50'
+                },
+                funny: {
+                    image: 'https://images.unsplash.com/photo-1415604934674-561df9abf539?w=800&h=600&fit=crop',
+                    text: 'WHEN YOU FINALLY FIX\nTHE BUG THAT\'S BEEN\nBUGGING YOU ALL DAY',
+                    color: 'white',
+                    size: '36',
+                    family: 'Arial',
+                    x: '50',
+                    y: '20'
+                },
+                announcement: {
+                    image: 'https://images.unsplash.com/photo-1540575467063-178a50c2df87?w=800&h=600&fit=crop',
+                    text: 'IMPORTANT ANNOUNCEMENT\n\nEvent: Team Meeting\nDate: Tomorrow\nTime: 3:00 PM',
+                    color: 'white',
+                    size: '32',
+                    family: 'Arial',
+                    x: '50',
+                    y: '40'
+                }
+            };
+
+            // Demo steps
+            const demoSteps = [
+                {
+                    title: "📸 Step 1: Choose Your Image",
+                    description: "Start by selecting an image URL or uploading a file",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-8">
+                            <div class="space-y-6">
+                                <div class="bg-yellow-50 border-l-4 border-yellow-400 p-4 rounded-lg">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 What we're doing:</h4>
+                                    <p class="text-gray-700">Loading a beautiful mountain landscape that will serve as our background image.</p>
+                                </div>
+
+                                <div class="bg-white border-2 border-yellow-300 rounded-lg p-4">
+                                    <label class="block text-sm font-semibold text-gray-700 mb-3">Image URL</label>
+                                    <div class="relative">
+                                        <input type="url" value="https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=800&h=600&fit=crop" class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-yellow-50 font-mono text-sm" readonly>
+                                        <div class="absolute right-3 top-3 text-green-500">
+                                            <i class="fas fa-check-circle"></i>
+                                        </div>
+                                    </div>
+                                    <p class="text-sm text-gray-500 mt-2">✅ High-quality Unsplash image selected</p>
+                                </div>
+
+                                <div class="bg-blue-50 border border-blue-200 rounded-lg p-4">
+                                    <div class="flex items-center space-x-2 mb-2">
+                                        <i class="fas fa-lightbulb text-blue-500"></i>
+                                        <span class="font-semibold text-gray-800">Pro Tip:</span>
+                                    </div>
+                                    <p class="text-sm text-gray-700">Use high-resolution images (800x600 or larger) for the best results!</p>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-6 flex items-center justify-center">
+                                <div class="text-center">
+                                    <img src="https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400&h=300&fit=crop" 
+                                         class="rounded-lg shadow-lg mb-4 max-w-full h-auto" alt="Mountain landscape">
+                                    <p class="text-gray-600 font-medium">Beautiful mountain landscape loaded!</p>
+                                </div>
+                            </div>
+                        </div>
+                    `
+                },
+                {
+                    title: "✏️ Step 2: Add Your Text",
+                    description: "Enter your message and customize the styling",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-8">
+                            <div class="space-y-6">
+                                <div class="bg-blue-50 border-l-4 border-blue-400 p-4 rounded-lg">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 What we're doing:</h4>
+                                    <p class="text-gray-700">Adding inspirational text with perfect styling for maximum impact.</p>
+                                </div>
+
+                                <div class="bg-white border-2 border-blue-300 rounded-lg p-4 space-y-4">
+                                    <div>
+                                        <label class="block text-sm font-semibold text-gray-700 mb-2">Text Content</label>
+                                        <textarea class="w-full px-4 py-3 border border-gray-300 rounded-lg bg-blue-50 font-mono" rows="4" readonly>SUCCESS IS NOT FINAL
+FAILURE IS NOT FATAL
+IT IS THE COURAGE TO CONTINUE
+THAT COUNTS</textarea>
+                                    </div>
+
+                                    <div class="grid grid-cols-3 gap-4">
+                                        <div>
+                                            <label class="block text-sm font-semibold text-gray-700 mb-2">Font</label>
+                                            <select class="w-full px-3 py-2 border border-gray-300 rounded-lg bg-blue-50" disabled>
+                                                <option>Impact</option>
+                                            </select>
+                                        </div>
+                                        <div>
+                                            <label class="block text-sm font-semibold text-gray-700 mb-2">Size</label>
+                                            <select class="w-full px-3 py-2 border border-gray-300 rounded-lg bg-blue-50" disabled>
+                                                <option>48px (Large)</option>
+                                            </select>
+                                        </div>
+                                        <div>
+                                            <label class="block text-sm font-semibold text-gray-700 mb-2">Color</label>
+                                            <select class="w-full px-3 py-2 border border-gray-300 rounded-lg bg-blue-50" disabled>
+                                                <option>White</option>
+                                            </select>
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <div class="bg-green-50 border border-green-200 rounded-lg p-4">
+                                    <div class="flex items-center space-x-2 mb-2">
+                                        <i class="fas fa-magic text-green-500"></i>
+                                        <span class="font-semibold text-gray-800">Live Preview:</span>
+                                    </div>
+                                    <p class="text-sm text-gray-700">Watch the text appear on your image in real-time!</p>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-6 flex items-center justify-center">
+                                <div class="text-center">
+                                    <div class="relative inline-block">
+                                        <img src="https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400&h=300&fit=crop" 
+                                             class="rounded-lg shadow-lg" alt="Mountain with text">
+                                        <div class="absolute inset-0 flex items-center justify-center">
+                                            <div class="text-white text-center font-bold text-lg leading-tight" style="text-shadow: 2px 2px 4px rgba(0,0,0,0.8);">
+                                                SUCCESS IS NOT FINAL<br>
+                                                FAILURE IS NOT FATAL<br>
+                                                IT IS THE COURAGE TO CONTINUE<br>
+                                                THAT COUNTS
+                                            </div>
+                                        </div>
+                                    </div>
+                                    <p class="text-gray-600 font-medium mt-4">Live preview with your styled text!</p>
+                                </div>
+                            </div>
+                        </div>
+                    `
+                },
+                {
+                    title: "🎯 Step 3: Position & Create",
+                    description: "Fine-tune the text position and generate your image",
+                    content: `
+                        <div class="grid grid-cols-1 lg:grid-cols-2 gap-8">
+                            <div class="space-y-6">
+                                <div class="bg-green-50 border-l-4 border-green-400 p-4 rounded-lg">
+                                    <h4 class="font-semibold text-gray-800 mb-2">🎯 Final Step:</h4>
+                                    <p class="text-gray-700">Perfect positioning and create your masterpiece!</p>
+                                </div>
+
+                                <div class="bg-white border-2 border-green-300 rounded-lg p-4 space-y-4">
+                                    <div>
+                                        <label class="block text-sm font-semibold text-gray-700 mb-3">Text Position Controls</label>
+                                        <div class="grid grid-cols-2 gap-4">
+                                            <div>
+                                                <label class="block text-xs text-gray-600 mb-2">Horizontal (50%)</label>
+                                                <input type="range" min="0" max="100" value="50" class="w-full accent-green-600" disabled>
+                                            </div>
+                                            <div>
+                                                <label class="block text-xs text-gray-600 mb-2">Vertical (50%)</label>
+                                                <input type="range" min="0" max="100" value="50" class="w-full accent-green-600" disabled>
+                                            </div>
+                                        </div>
+                                    </div>
+
+                                    <div class="pt-4 border-t border-gray-200">
+                                        <button class="w-full bg-gradient-to-r from-green-600 to-green-700 text-white py-3 rounded-lg font-bold text-lg shadow-lg">
+                                            <i class="fas fa-magic mr-2"></i>
+                                            Create Your Image!
+                                        </button>
+                                    </div>
+                                </div>
+
+                                <div class="bg-purple-50 border border-purple-200 rounded-lg p-4">
+                                    <div class="flex items-center space-x-2 mb-3">
+                                        <i class="fas fa-star text-purple-500"></i>
+                                        <span class="font-semibold text-gray-800">Congratulations! 🎉</span>
+                                    </div>
+                                    <p class="text-sm text-gray-700 mb-3">You've learned the complete process!</p>
+                                    <div class="text-sm text-gray-600 space-y-1">
+                                        <p>• ✅ Image selection</p>
+                                        <p>• ✅ Text styling</p>
+                                        <p>• ✅ Perfect positioning</p>
+                                    </div>
+                                </div>
+                            </div>
+
+                            <div class="bg-gray-50 rounded-lg p-6 flex items-center justify-center">
+                                <div class="text-center">
+                                    <div class="relative inline-block">
+                                        <img src="https://images.unsplash.com/photo-1506905925346-21bda4d32df4?w=400&h=300&fit=crop" 
+                                             class="rounded-lg shadow-xl border-4 border-green-400" alt="Final result">
+                                        <div class="absolute inset-0 flex items-center justify-center">
+                                            <div class="text-white text-center font-bold text-lg leading-tight" style="text-shadow: 3px 3px 6px rgba(0,0,0,0.9);">
+                                                SUCCESS IS NOT FINAL<br>
+                                                FAILURE IS NOT FATAL<br>
+                                                <span class="text-yellow-300">IT IS THE COURAGE TO CONTINUE</span><br>
+                                                <span class="text-yellow-300">THAT COUNTS</span>
+                                            </div>
+                                        </div>
+                                        <div class="absolute -top-2 -right-2 bg-green-500 text-white px-3 py-1 rounded-full text-sm font-bold">
+                                            <i class="fas fa-check mr-1"></i>Perfect!
+                                        </div>
+                                    </div>
+                                    <p class="text-green-600 font-bold mt-4">🎉 Your masterpiece is ready!</p>
+                                </div>
+                            </div>
+                        </div>
+                    `
+                }
+            ];
+
+            // Demo functions
+            function showDemoModal() {
+                demoModal.classList.remove('hidden');
+                currentDemoStep = 0;
+                showDemoStep(0);
+                document.body.style.overflow = 'hidden';
+            }
+
+            function hideDemoModal() {
+                demoModal.classList.add('hidden');
+                document.body.style.overflow = 'auto';
+                stopAutoPlay();
+            }
+
+            function showDemoStep(stepIndex) {
+                currentDemoStep = stepIndex;
+                const step = demoSteps[stepIndex];
+
+                demoContent.innerHTML = `
+                    <div class="mb-6">
+                        <h4 class="text-2xl font-bold text-gray-800 mb-2">${step.title}</h4>
+                        <p class="text-gray-600 text-lg">${step.description}</p>
+                    </div>
+                    ${step.content}
+                `;
+
+                demoProgress.textContent = `Step ${stepIndex + 1} of ${demoSteps.length}`;
+
+                stepIndicators.forEach((indicator, index) => {
+                    if (index <= stepIndex) {
+                        indicator.classList.remove('bg-gray-300');
+                        indicator.classList.add('bg-gray-600');
+                    } else {
+                        indicator.classList.remove('bg-gray-600');
+                        indicator.classList.add('bg-gray-300');
+                    }
+                });
+
+                demoPrevBtn.disabled = stepIndex === 0;
+                demoNextBtn.innerHTML = stepIndex === demoSteps.length - 1 ? 
+                    'Start Creating!<i class="fas fa-rocket ml-2"></i>' : 
+                    'Next<i class="fas fa-chevron-right ml-2"></i>';
+            }
+
+            function nextDemoStep() {
+                if (currentDemoStep < demoSteps.length - 1) {
+                    showDemoStep(currentDemoStep + 1);
+                } else {
+                    // Final step - redirect to editor
+                    window.location.href = '/create';
+                }
+            }
+
+            function prevDemoStep() {
+                if (currentDemoStep > 0) {
+                    showDemoStep(currentDemoStep - 1);
+                }
+            }
+
+            function startAutoPlay() {
+                if (isAutoPlaying) {
+                    stopAutoPlay();
+                    return;
+                }
+
+                isAutoPlaying = true;
+                demoAutoBtn.innerHTML = '<i class="fas fa-pause mr-2"></i>Pause';
+                demoAutoBtn.classList.remove('shiny-black-gradient');
+                demoAutoBtn.classList.add('bg-red-600', 'hover:bg-red-700');
+
+                autoPlayInterval = setInterval(() => {
+                    if (currentDemoStep < demoSteps.length - 1) {
+                        nextDemoStep();
+                    } else {
+                        stopAutoPlay();
+                    }
+                }, 5000); // 5 seconds per step
+            }
+
+            function stopAutoPlay() {
+                isAutoPlaying = false;
+                if (autoPlayInterval) {
+                    clearInterval(autoPlayInterval);
+                    autoPlayInterval = null;
+                }
+                demoAutoBtn.innerHTML = '<i class="fas fa-play mr-2"></i>Auto Play';
+                demoAutoBtn.classList.remove('bg-red-600', 'hover:bg-red-700');
+                demoAutoBtn.classList.add('shiny-black-gradient');
+            }
+
+            // Event Listeners
+            startDemoBtn.addEventListener('click', showDemoModal);
+            closeDemoBtn.addEventListener('click', hideDemoModal);
+            demoNextBtn.addEventListener('click', nextDemoStep);
+            demoPrevBtn.addEventListener('click', prevDemoStep);
+            demoAutoBtn.addEventListener('click', startAutoPlay);
+
+            // Try samples functionality
+            trySamplesBtn.addEventListener('click', function() {
+                // Redirect to Quick Editor with sample mode
+                window.location.href = '/create#samples';
+            });
+
+            // Sample option clicks
+            sampleOptions.forEach(option => {
+                option.addEventListener('click', function() {
+                    const sampleType = this.dataset.sample;
+                    const sample = samples[sampleType];
+
+                    // Visual feedback
+                    sampleOptions.forEach(opt => opt.classList.remove('border-purple-500', 'ring-2', 'ring-purple-200'));
+                    this.classList.add('border-purple-500', 'ring-2', 'ring-purple-200');
+
+                    // Store sample choice and redirect
+                    sessionStorage.setItem('selectedSample', sampleType);
+                    setTimeout(() => {
+                        window.location.href = '/create';
+                    }, 500);
+                });
+            });
+
+            // Close modal on outside click
+            demoModal.addEventListener('click', function(e) {
+                if (e.target === demoModal) {
+                    hideDemoModal();
+                }
+            });
+
+            // Keyboard shortcuts
+            document.addEventListener('keydown', function(e) {
+                if (!demoModal.classList.contains('hidden')) {
+                    switch(e.key) {
+                        case 'Escape':
+                            hideDemoModal();
+                            break;
+                        case 'ArrowRight':
+                            nextDemoStep();
+                            break;
+                        case 'ArrowLeft':
+                            prevDemoStep();
+                            break;
+                        case ' ':
+                            e.preventDefault();
+                            startAutoPlay();
+                            break;
+                    }
+                }
+            });
+        });
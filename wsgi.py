@@ -0,0 +1,67 @@
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# gunicorn.conf.py preloads this module in the master process, so the work
+# done here happens once and the workers forked afterwards share the
+# resulting pages copy-on-write instead of each building its own copy.
+import gc
+import os
+import string
+import time
+
+from PIL import Image
+
+from app import app, overlay, library, random_pool
+from ImageProcessor.Fonts import load_font
+from ImageProcessor.ImageEncoder import encode_image
+from ImageProcessor.TextMeasure import font_metrics
+
+# Font families and sizes the editors offer
+WARM_FONT_FAMILIES = ('Impact', 'Arial', 'Georgia', 'Times New Roman', 'Trebuchet MS',
+                      'Courier New', 'Comic Sans MS', 'Helvetica', 'Verdana')
+WARM_FONT_SIZES = (20, 30, 40, 50, 60)
+
+
+def warm_up() -> dict:
+    """Load what the first requests of every worker would otherwise pay for.
+
+    Fonts (and their glyph advance tables) for the editors' families and sizes,
+    every Pillow codec plugin, one full render and encode of a library image
+    so the decoders, resamplers and encoders are initialised, and the random
+    pool. Quotes and images are already indexed when app is imported.
+    """
+    start = time.perf_counter()
+    Image.init()
+
+    fonts = 0
+    for family in WARM_FONT_FAMILIES:
+        for size in WARM_FONT_SIZES:
+            font_metrics(load_font(family, size)).width(string.printable)
+            fonts += 1
+
+    quotes, imgs = library.snapshot.quotes, library.snapshot.images
+    rendered = 0
+    if imgs:
+        quote = quotes[0] if quotes else None
+        img = overlay.render_meme(imgs[0], quote.body if quote else 'TextOverlay',
+                                  quote.author if quote else '')
+        for output_format in ('jpeg', 'png', 'webp'):
+            encode_image(img, output_format)
+        rendered = 1
+
+    # Filled here, on this thread: workers inherit the entries and start their
+    # own producers, a thread running during the fork would be lost
+    random_pool.fill()
+
+    return {'fonts': fonts, 'quotes': len(quotes), 'images': len(imgs),
+            'renders': rendered, 'random_pool': len(random_pool),
+            'seconds': round(time.perf_counter() - start, 2)}
+
+
+if os.environ.get('WARM_UP', '1') != '0':
+    stats = warm_up()
+    print('Warm-up: ' + ', '.join(f'{key}={value}' for key, value in stats.items()))
+
+# Move everything allocated so far out of the collector's reach. A collection
+# in a worker would otherwise write to the header of every preloaded object
+# and un-share the pages it lives on.
+gc.freeze()